@@ -2,14 +2,32 @@
 # ABOUTME: Features navbar, tabbed form, KPI grid, donut gauge, risk indicators, and recommendation panel.
 
 import os
-import joblib
+
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
 import streamlit as st
 
-from src.predict import make_prediction
-
-MODEL_PATH = os.path.join("models", "credit_risk_model_v2.pkl")
+from src.audit import AuditLog
+from src.explain import explain, explain_one
+from src.monitor import monitor_for
+from src.portfolio import approval_rates, read_portfolio, risk_histogram, score_portfolio
+from src.predict import decision_threshold
+from src.prediction_cache import PredictionCache
+from src.registry import REGISTRY_DIR, ModelHandle
+from src.rules import indicator_rows
+from src.shadow import CHALLENGER_ENV, challenger_path, load_shadow
+from src.whatif import what_if
+
+MODEL_PATH = os.path.join("models", "credit_risk_model_v2")
+PREDICTION_CACHE_SIZE = 1024
+PREDICTION_CACHE_TTL = 900.0
+
+# What-if grid: the same ranges as the form inputs; the surface covers their full cross-product
+WHAT_IF_RANGES = {
+    "Credit amount": np.linspace(100, 20000, 60).round(),
+    "Duration": np.arange(1, 73),
+}
 
 # ── Page Config ────────────────────────────────────────────────────────────────
 st.set_page_config(
@@ -178,6 +196,17 @@ html, body, [class*="css"] {
 .ri-hint { color: #2e2e50; font-size: 10px; margin-top: 1px; }
 .ri-score { font-family: 'DM Mono', monospace; font-size: 12px; font-weight: 500; }
 
+/* ─────────────────── MODEL DRIVERS ─────────────────── */
+.drv {
+    display: grid; grid-template-columns: 130px 1fr 52px; align-items: center;
+    gap: 10px; padding: 7px 0;
+}
+.drv-name { color: #c0c0e0; font-size: 12px; font-weight: 600; }
+.drv-val { color: #2e2e50; font-size: 10px; margin-top: 1px; }
+.drv-track { height: 6px; border-radius: 3px; background: #0d0d20; position: relative; }
+.drv-bar { position: absolute; top: 0; height: 100%; border-radius: 3px; }
+.drv-num { font-family: 'DM Mono', monospace; font-size: 11px; text-align: right; }
+
 /* ─────────────────── PROBABILITY SCALE ─────────────────── */
 .prob-hdr { display: flex; justify-content: space-between; margin-bottom: 12px; }
 .prob-label { color: white; font-size: 13px; font-weight: 700; }
@@ -294,16 +323,61 @@ html, body, [class*="css"] {
 
 
 # ── Model ──────────────────────────────────────────────────────────────────────
+# The handle loads the promoted registry version (or the bundled artifact) on a
+# background thread, so the page renders straight away and only the first
+# analysis waits for it. Newly promoted versions are swapped in without a restart.
+@st.cache_resource
+def model_handle():
+    return ModelHandle(REGISTRY_DIR, fallback=MODEL_PATH)
+
+
+# Shared across sessions; entries are keyed by model version, so a promotion
+# invalidates them automatically.
 @st.cache_resource
-def load_model():
-    return joblib.load(MODEL_PATH)
+def prediction_cache():
+    return PredictionCache(max_entries=PREDICTION_CACHE_SIZE, ttl=PREDICTION_CACHE_TTL)
 
 
-try:
-    model = load_model()
-except FileNotFoundError:
-    st.error(f"Model not found at '{MODEL_PATH}'. Run `python3 run_training.py` first.")
-    st.stop()
+# Every dashboard decision is queued for the Parquet audit log (written by a background thread)
+@st.cache_resource
+def audit_log():
+    return AuditLog()
+
+
+# One live drift monitor for all sessions, restarted whenever a new model version is served
+@st.cache_resource
+def drift_monitors():
+    return {}
+
+
+# The challenger named by $CREDIT_RISK_CHALLENGER re-scores dashboard and portfolio
+# traffic on its own thread; it is loaded once per process, on first use.
+@st.cache_resource
+def shadow_scorer():
+    path = challenger_path()
+    if path is None:
+        return None
+    if not os.path.exists(path):
+        print(f"{CHALLENGER_ENV}={path} does not exist; shadow scoring is off")
+        return None
+    return load_shadow(path, audit=audit_log())
+
+
+def live_monitor(model):
+    slot = drift_monitors()
+    slot["live"] = monitor_for(model, slot.get("live"))
+    return slot["live"]
+
+
+def get_model():
+    try:
+        return model_handle().model
+    except FileNotFoundError:
+        st.error(f"Model not found at '{MODEL_PATH}'. Run `python3 run_training.py` first.")
+        st.stop()
+
+
+model_handle()
 
 
 # ── Helpers ────────────────────────────────────────────────────────────────────
@@ -364,25 +438,107 @@ def create_donut_gauge(default_prob_pct: float) -> go.Figure:
     return fig
 
 
-def savings_signal(val: str):
-    good = val in {"quite rich", "rich", "moderate"}
-    desc = "Strong savings buffer" if good else "Insufficient savings"
-    return good, desc
+def aggregate_bar(x, y, color: str, x_title: str, y_title: str, hover: str) -> go.Figure:
+    """One bar trace over pre-aggregated values, styled for the dark panels."""
+    fig = go.Figure(go.Bar(x=x, y=y, marker=dict(color=color), hovertemplate=hover + "<extra></extra>"))
+    fig.update_layout(
+        paper_bgcolor="rgba(0,0,0,0)",
+        plot_bgcolor="rgba(0,0,0,0)",
+        height=260,
+        margin=dict(l=0, r=0, t=10, b=0),
+        font=dict(color="#6060a0", family="DM Mono", size=10),
+        xaxis=dict(title=x_title, gridcolor="#181830"),
+        yaxis=dict(title=y_title, gridcolor="#181830"),
+        bargap=0.08,
+    )
+    return fig
 
 
-def checking_signal(val: str):
-    good = val in {"rich", "moderate"}
-    desc = "Adequate liquidity" if good else "Low account balance"
-    return good, desc
+def driver_html(feature: str, value, contribution: float, max_abs: float) -> str:
+    # Bars grow left (towards Low Risk) or right (towards High Risk) from the centre line
+    width = 50 * abs(contribution) / max_abs if max_abs else 0
+    color = "#ef4444" if contribution > 0 else "#22c55e"
+    side = "left:50%" if contribution > 0 else f"left:{50 - width:.1f}%"
+    shown = value.title() if isinstance(value, str) else value
+    return f"""
+    <div class="drv">
+        <div>
+            <div class="drv-name">{feature}</div>
+            <div class="drv-val">{shown}</div>
+        </div>
+        <div class="drv-track"><div class="drv-bar" style="{side};width:{width:.1f}%;background:{color}"></div></div>
+        <div class="drv-num" style="color:{color}">{contribution:+.2f}</div>
+    </div>"""
 
 
-def duration_signal(months: int):
-    if months <= 12:
-        return True, "Short-term loan", f"{months} mo"
-    elif months <= 24:
-        return True, "Medium-term loan", f"{months} mo"
-    else:
-        return False, "Long-term exposure", f"{months} mo"
+def create_sensitivity_chart(curve: pd.DataFrame, current: float, x_title: str, color: str) -> go.Figure:
+    """Default probability along one feature, with the applicant's current value marked."""
+    current_prob = np.interp(current, curve["value"], curve["default_probability"])
+    fig = go.Figure(
+        [
+            go.Scatter(
+                x=curve["value"], y=curve["default_probability"], mode="lines",
+                line=dict(color=color, width=2, shape="hv"), hovertemplate="%{x}: %{y:.1f}%<extra></extra>",
+            ),
+            go.Scatter(
+                x=[current], y=[current_prob], mode="markers",
+                marker=dict(color="white", size=8, line=dict(color=color, width=2)), hoverinfo="skip",
+            ),
+        ]
+    )
+    fig.update_layout(
+        paper_bgcolor="rgba(0,0,0,0)",
+        plot_bgcolor="rgba(0,0,0,0)",
+        height=200,
+        margin=dict(l=0, r=0, t=10, b=0),
+        showlegend=False,
+        font=dict(color="#6060a0", family="DM Mono", size=10),
+        xaxis=dict(title=x_title, gridcolor="#181830"),
+        yaxis=dict(title="Default (%)", range=[0, 100], gridcolor="#181830"),
+    )
+    return fig
+
+
+def create_surface_chart(surface: pd.DataFrame, current: tuple) -> go.Figure:
+    """Heatmap of default probability over a 2-D what-if grid, with the applicant marked."""
+    fig = go.Figure(
+        [
+            go.Heatmap(
+                z=surface.to_numpy(), x=surface.columns, y=surface.index, zmin=0, zmax=100,
+                colorscale=[[0, "#22c55e"], [0.5, "#f59e0b"], [1, "#ef4444"]],
+                colorbar=dict(title="%", thickness=8),
+                hovertemplate=f"{surface.columns.name} %{{x}} · {surface.index.name} %{{y}}: %{{z:.1f}}%<extra></extra>",
+            ),
+            go.Scatter(
+                x=[current[0]], y=[current[1]], mode="markers",
+                marker=dict(color="white", size=9, symbol="x"), hoverinfo="skip",
+            ),
+        ]
+    )
+    fig.update_layout(
+        paper_bgcolor="rgba(0,0,0,0)",
+        plot_bgcolor="rgba(0,0,0,0)",
+        height=280,
+        margin=dict(l=0, r=0, t=10, b=0),
+        showlegend=False,
+        font=dict(color="#6060a0", family="DM Mono", size=10),
+        xaxis=dict(title=surface.columns.name),
+        yaxis=dict(title=surface.index.name),
+    )
+    return fig
+
+
+def create_drift_chart(report: dict) -> go.Figure:
+    """PSI per monitored feature, coloured by drift status."""
+    colors = {"stable": "#22c55e", "warn": "#f59e0b", "alert": "#ef4444", "insufficient": "#3a3a60"}
+    names = list(report["features"])
+    fig = aggregate_bar(
+        names, [report["features"][n]["psi"] for n in names], "#2563eb", "", "PSI", "%{x}: PSI %{y:.3f}",
+    )
+    fig.update_traces(marker=dict(color=[colors[report["features"][n]["status"]] for n in names]))
+    fig.add_hline(y=0.25, line=dict(color="#ef4444", dash="dot", width=1))
+    fig.add_hline(y=0.1, line=dict(color="#f59e0b", dash="dot", width=1))
+    return fig
 
 
 def ri_html(label: str, value: str, desc: str, good: bool) -> str:
@@ -510,9 +666,25 @@ with col_left:
                 "Purpose": [purpose],
             }
         )
-        result = make_prediction(model, input_df)
+        model = get_model()
+        result = prediction_cache().predict(model, input_df)
+        audit_log().record(input_df.iloc[0].to_dict(), result, model.version, source="dashboard")
+        shadow = shadow_scorer()
+        if shadow is not None:
+            shadow.submit(input_df, np.array([result["default_probability"] / 100]), np.array([result["prediction"]]))
+        monitor = live_monitor(model)
+        if monitor is not None:
+            monitor.observe_batch(input_df, [result["default_probability"] / 100])
         st.session_state["result"] = {
             **result,
+            "model_version": model.version,
+            "decision_threshold": round(decision_threshold(model) * 100, 1),
+            "calibration": getattr(model.calibrator, "method", None),
+            "indicators": indicator_rows(input_df),
+            "drivers": explain_one(model, input_df, top=5),
+            "what_if": what_if(
+                model, input_df.iloc[0].to_dict(), WHAT_IF_RANGES, surface=("Credit amount", "Duration")
+            ),
             "age": age,
             "sex": sex,
             "job": job,
@@ -616,12 +788,13 @@ with col_right:
         g_col, p_col = st.columns([1, 1], gap="small")
 
         with g_col:
+            prob_kind = f"{d['calibration'].title()}-calibrated" if d["calibration"] else "Uncalibrated"
             st.markdown(
-                """<div class="panel" style="padding-bottom:6px">
+                f"""<div class="panel" style="padding-bottom:6px">
                 <div class="panel-hdr" style="margin-bottom:4px">
                     <div>
                         <div class="p-title">Risk Score</div>
-                        <div class="p-sub">Default Probability</div>
+                        <div class="p-sub">Default Probability · {prob_kind}</div>
                     </div>
                 </div>""",
                 unsafe_allow_html=True,
@@ -668,10 +841,46 @@ with col_right:
                 unsafe_allow_html=True,
             )
 
+        # ── What-If Sensitivity ────────────────────────────────────────────────
+        st.markdown(
+            f"""<div class="panel" style="padding-bottom:6px">
+            <div class="panel-hdr" style="margin-bottom:4px">
+                <div>
+                    <div class="p-title">What-If Sensitivity</div>
+                    <div class="p-sub">Default probability as one input varies · {d['what_if']['n_points']:,} scenarios</div>
+                </div>
+            </div>""",
+            unsafe_allow_html=True,
+        )
+        wa_col, wd_col = st.columns([1, 1], gap="small")
+        with wa_col:
+            st.plotly_chart(
+                create_sensitivity_chart(
+                    d["what_if"]["curves"]["Credit amount"], d["credit_amount"], "Credit amount (DM)", "#2563eb"
+                ),
+                use_container_width=True,
+                config={"displayModeBar": False},
+            )
+        with wd_col:
+            st.plotly_chart(
+                create_sensitivity_chart(
+                    d["what_if"]["curves"]["Duration"], d["duration"], "Duration (months)", "#8b5cf6"
+                ),
+                use_container_width=True,
+                config={"displayModeBar": False},
+            )
+        with st.expander("Credit amount × Duration surface"):
+            st.plotly_chart(
+                create_surface_chart(d["what_if"]["surface"], (d["credit_amount"], d["duration"])),
+                use_container_width=True,
+                config={"displayModeBar": False},
+            )
+        st.markdown("</div>", unsafe_allow_html=True)
+
         # ── Risk Analysis Indicators ───────────────────────────────────────────
-        sav_good, sav_desc = savings_signal(d["saving_accounts"])
-        chk_good, chk_desc = checking_signal(d["checking_account"])
-        dur_good, dur_desc, dur_val = duration_signal(d["duration"])
+        indicators_html = "".join(
+            ri_html(ind["label"], ind["value"], ind["desc"], ind["good"]) for ind in d["indicators"]
+        )
 
         st.markdown(
             f"""
@@ -682,9 +891,27 @@ with col_right:
                     <div class="p-sub">Key Indicators</div>
                 </div>
             </div>
-            {ri_html("Savings Account", d['saving_accounts'].title(), sav_desc, sav_good)}
-            {ri_html("Checking Account", d['checking_account'].title(), chk_desc, chk_good)}
-            {ri_html("Loan Duration", dur_val, dur_desc, dur_good)}
+            {indicators_html}
+        </div>""",
+            unsafe_allow_html=True,
+        )
+
+        # ── Model Drivers ──────────────────────────────────────────────────────
+        max_abs = max(abs(drv["contribution"]) for drv in d["drivers"])
+        drivers_html = "".join(
+            driver_html(drv["feature"], drv["value"], drv["contribution"], max_abs) for drv in d["drivers"]
+        )
+
+        st.markdown(
+            f"""
+        <div class="panel">
+            <div class="panel-hdr">
+                <div>
+                    <div class="p-title">Model Drivers</div>
+                    <div class="p-sub">TreeSHAP contributions to default log-odds · red raises risk</div>
+                </div>
+            </div>
+            {drivers_html}
         </div>""",
             unsafe_allow_html=True,
         )
@@ -748,7 +975,162 @@ with col_right:
         st.markdown(
             f"<div style='text-align:center;color:#1e1e38;font-size:10px;"
             f"font-family:DM Mono,monospace;margin-top:16px'>"
-            f"Analysis by CreditRisk AI v2.0 · German Credit Dataset · "
+            f"Analysis by CreditRisk AI v2.0 · Model {d['model_version']} · "
+            f"Decline above {d['decision_threshold']}% · German Credit Dataset · "
             f"{d['purpose'].title()} Loan Assessment</div>",
             unsafe_allow_html=True,
         )
+
+# ════════════════════════════════════════
+# PORTFOLIO — Batch Scoring
+# ════════════════════════════════════════
+st.markdown(
+    """
+<div class="sec-head" style="margin-top:28px">
+    <div class="sec-ico">🗂</div>
+    <div>
+        <div class="sec-title">Portfolio Scoring</div>
+        <div class="sec-sub">Upload a CSV or Parquet file of applicants to score them in one pass</div>
+    </div>
+</div>""",
+    unsafe_allow_html=True,
+)
+
+upload = st.file_uploader("Applicant file", type=["csv", "parquet"], label_visibility="collapsed")
+
+if upload is not None:
+    model = get_model()
+    # Scoring runs once per file and model version; reruns from paging reuse the scored frame
+    cache_key = (upload.file_id, model.version)
+    if st.session_state.get("portfolio_key") != cache_key:
+        try:
+            with st.spinner("Scoring portfolio..."):
+                portfolio = score_portfolio(model, read_portfolio(upload, upload.name), shadow=shadow_scorer())
+        except ValueError as exc:
+            st.error(f"Could not score {upload.name}: {exc}")
+            st.stop()
+        audit_log().record_batch(portfolio["predictions"], portfolio["predictions"], model.version, source="portfolio")
+        st.session_state["portfolio"] = portfolio
+        st.session_state["portfolio_key"] = cache_key
+
+    portfolio = st.session_state["portfolio"]
+    for column, found in portfolio.get("unknown_categories", {}).items():
+        values = ", ".join(f"'{value}' ({count:,})" for value, count in found.items())
+        st.warning(f"{column}: values outside the schema were scored as missing: {values}")
+    scored = portfolio["predictions"]
+    n_rows = portfolio["n_rows"]
+    approval = (scored["prediction"] == 0).mean() * 100 if n_rows else 0.0
+    mean_prob = scored["default_probability"].mean() if n_rows else 0.0
+
+    st.markdown(
+        f"""
+    <div class="kpi-row">
+        <div class="kpi c-blue">
+            <div class="kpi-lbl">Applicants</div>
+            <div class="kpi-val">{n_rows:,}</div>
+            <div class="kpi-tag" style="color:#2563eb">scored in {portfolio['elapsed_s']:.2f}s</div>
+        </div>
+        <div class="kpi c-green">
+            <div class="kpi-lbl">Approval Rate</div>
+            <div class="kpi-val">{approval:.1f}%</div>
+            <div class="kpi-tag" style="color:#22c55e">predicted good</div>
+        </div>
+        <div class="kpi c-amber">
+            <div class="kpi-lbl">Mean Default Prob.</div>
+            <div class="kpi-val">{mean_prob:.1f}%</div>
+            <div class="kpi-tag" style="color:#f59e0b">portfolio average</div>
+        </div>
+        <div class="kpi c-violet">
+            <div class="kpi-lbl">Model</div>
+            <div class="kpi-val" style="font-size:15px">{model.version}</div>
+            <div class="kpi-tag" style="color:#8b5cf6">{portfolio['rows_per_sec']:,.0f} rows/sec</div>
+        </div>
+    </div>""",
+        unsafe_allow_html=True,
+    )
+
+    hist = risk_histogram(scored["default_probability"])
+    by_purpose = approval_rates(scored, "Purpose")
+    by_housing = approval_rates(scored, "Housing")
+
+    h_col, pu_col, ho_col = st.columns([2, 2, 1], gap="small")
+    with h_col:
+        st.caption("Risk distribution")
+        st.plotly_chart(
+            aggregate_bar(
+                (hist["bin_start"] + hist["bin_end"]) / 2, hist["count"], "#2563eb",
+                "Default probability (%)", "Applicants", "%{x:.0f}%: %{y:,} applicants",
+            ),
+            use_container_width=True,
+            config={"displayModeBar": False},
+        )
+    with pu_col:
+        st.caption("Approval rate by purpose")
+        st.plotly_chart(
+            aggregate_bar(
+                by_purpose["Purpose"], by_purpose["approval_rate"], "#22c55e",
+                "", "Approved (%)", "%{x}: %{y:.1f}%",
+            ),
+            use_container_width=True,
+            config={"displayModeBar": False},
+        )
+    with ho_col:
+        st.caption("Approval rate by housing")
+        st.plotly_chart(
+            aggregate_bar(
+                by_housing["Housing"], by_housing["approval_rate"], "#8b5cf6",
+                "", "Approved (%)", "%{x}: %{y:.1f}%",
+            ),
+            use_container_width=True,
+            config={"displayModeBar": False},
+        )
+
+    if portfolio["drift"] is not None:
+        drift = portfolio["drift"]
+        alerts = ", ".join(drift["alerts"]) or "none"
+        st.caption(f"Drift vs training profile ({drift['reference_rows']:,} rows) · alerts: {alerts}")
+        st.plotly_chart(create_drift_chart(drift), use_container_width=True, config={"displayModeBar": False})
+
+    if st.checkbox("Explain drivers (TreeSHAP per applicant)"):
+        if st.session_state.get("portfolio_explain_key") != cache_key:
+            with st.spinner("Computing attributions..."):
+                st.session_state["portfolio_explain"] = explain(model, scored).drop(columns="bias")
+            st.session_state["portfolio_explain_key"] = cache_key
+        attributions = st.session_state["portfolio_explain"]
+        importance = attributions.abs().mean().sort_values()
+        st.caption("Mean |contribution| by feature")
+        st.plotly_chart(
+            aggregate_bar(
+                importance.values, importance.index, "#f59e0b",
+                "Mean |log-odds contribution|", "", "%{y}: %{x:.3f}",
+            ).update_traces(orientation="h"),
+            use_container_width=True,
+            config={"displayModeBar": False},
+        )
+        scored = scored.join(attributions.add_prefix("contrib: "))
+
+    # Only the visible page is sent to the browser
+    page_size = 50
+    n_pages = max(1, -(-n_rows // page_size))
+    page = st.number_input(f"Page (of {n_pages:,})", min_value=1, max_value=n_pages, value=1)
+    start = (page - 1) * page_size
+    st.dataframe(scored.iloc[start:start + page_size], use_container_width=True)
+
+# ── Live Traffic Drift ─────────────────────────────────────────────────────────
+monitor = drift_monitors().get("live")
+if monitor is not None and monitor.n:
+    with st.expander(f"Live traffic drift · {monitor.n:,} dashboard assessments since model {monitor.version} loaded"):
+        st.plotly_chart(create_drift_chart(monitor.report()), use_container_width=True, config={"displayModeBar": False})
+
+# ── Shadow Challenger ──────────────────────────────────────────────────────────
+shadow = shadow_scorer() if "result" in st.session_state or "portfolio" in st.session_state else None
+if shadow is not None and shadow.batches:
+    stats = shadow.stats()
+    with st.expander(f"Shadow challenger · {stats['challenger']} · {stats['rows']:,} rows re-scored"):
+        cols = st.columns(4)
+        cols[0].metric("Decision disagreement", f"{stats['disagreement_rate']:.1%}")
+        cols[1].metric("Mean Δ P(bad)", f"{stats['mean_delta'] * 100:+.1f} pts")
+        cols[2].metric("95th pct |Δ|", f"{stats['p95_abs_delta'] * 100:.1f} pts")
+        cols[3].metric("Challenger latency (p50)", f"{stats['latency_p50_ms']:.0f} ms")
+        if stats["dropped_batches"] or stats["errors"]:
+            st.caption(f"{stats['dropped_batches']:,} batches dropped under load · {stats['errors']:,} challenger errors")
@@ -0,0 +1,57 @@
+# ABOUTME: Cold-start benchmark for model loading and the dashboard's first render.
+# ABOUTME: Run `python -m benchmarks.bench_cold_start`; every measurement uses a fresh interpreter.
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+PICKLE_PATH = os.path.join('models', 'credit_risk_model_v2.pkl')
+ARTIFACT_PATH = os.path.join('models', 'credit_risk_model_v2')
+
+# Each snippet prints the seconds from interpreter start-up to the measured point
+SNIPPETS = {
+    'unpickle pipeline': f"""
+import time; t = time.perf_counter()
+import warnings; warnings.filterwarnings('ignore')
+import joblib; joblib.load({PICKLE_PATH!r})
+print(time.perf_counter() - t)
+""",
+    'load artifact': f"""
+import time; t = time.perf_counter()
+from src.artifact import load_artifact; load_artifact({ARTIFACT_PATH!r})
+print(time.perf_counter() - t)
+""",
+    'app first render': """
+import time; t = time.perf_counter()
+import logging; logging.disable(logging.WARNING)
+from streamlit.testing.v1 import AppTest
+AppTest.from_file({app!r}, default_timeout=120).run()
+print(time.perf_counter() - t)
+""",
+}
+
+
+def measure(code: str, repeat: int) -> list:
+    timings = []
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+        timings.append(float(out.stdout.strip().splitlines()[-1]))
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure model load and dashboard first-render times.')
+    parser.add_argument('--app', default='app.py', help='dashboard script to render')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'stage':<20} {'median s':>9} {'min s':>7}")
+    for name, code in SNIPPETS.items():
+        timings = measure(code.format(app=os.path.abspath(args.app)) if '{app' in code else code, args.repeat)
+        print(f"{name:<20} {statistics.median(timings):>9.3f} {min(timings):>7.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+# ABOUTME: Parity check and per-row latency microbenchmark for the compiled fast path in src/fastpath.py.
+# ABOUTME: Run `python -m benchmarks.bench_fastpath`; exits non-zero if compiled scores diverge from the pipeline.
+
+import argparse
+import os
+import sys
+import time
+
+import joblib
+import numpy as np
+
+from src.data import load_data
+from src.fastpath import compile_pipeline
+from src.predict import make_prediction
+
+DATA_PATH = os.path.join('data', 'german_credit_data.csv')
+MODEL_PATH = os.path.join('models', 'credit_risk_model_v2.pkl')
+TOLERANCE = 1e-6
+
+
+def per_row_us(fn, rows: list, repeat: int) -> float:
+    """Median per-call latency in microseconds over `repeat` passes of `rows`."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for row in rows:
+            fn(row)
+        timings.append((time.perf_counter() - start) / len(rows))
+    return float(np.median(timings)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare the compiled fast path against the sklearn pipeline.')
+    parser.add_argument('--model', default=MODEL_PATH)
+    parser.add_argument('--data', default=DATA_PATH)
+    parser.add_argument('--rows', type=int, default=200)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    pipeline = joblib.load(args.model)
+    compiled = compile_pipeline(pipeline)
+    X = load_data(args.data).drop(columns='Risk')
+
+    # Parity: full frame, list of dicts and single dicts must all match the pipeline
+    expected = pipeline.predict_proba(X)[:, 1]
+    records = X.to_dict('records')
+    diffs = {
+        'DataFrame': np.abs(compiled.predict_proba(X)[:, 1] - expected).max(),
+        'list of dicts': np.abs(compiled.predict_proba(records)[:, 1] - expected).max(),
+        'single dict': max(abs(compiled.predict_proba(r)[0, 1] - e) for r, e in zip(records, expected)),
+    }
+    for name, diff in diffs.items():
+        print(f"  parity {name:<14} max |Δp| = {diff:.2e}")
+    if max(diffs.values()) > TOLERANCE:
+        print(f"Parity check FAILED (tolerance {TOLERANCE})")
+        sys.exit(1)
+
+    rows = [X.iloc[[i]] for i in range(min(args.rows, len(X)))]
+    dict_rows = records[:len(rows)]
+    pipeline_us = per_row_us(lambda row: make_prediction(pipeline, row), rows, args.repeat)
+    compiled_df_us = per_row_us(lambda row: make_prediction(compiled, row), rows, args.repeat)
+    compiled_dict_us = per_row_us(lambda row: make_prediction(compiled, row), dict_rows, args.repeat)
+
+    print(f"\nPer-row make_prediction latency ({len(rows)} rows × {args.repeat} passes, median)")
+    print(f"  pipeline, 1-row DataFrame : {pipeline_us:>8.1f} µs")
+    print(f"  compiled, 1-row DataFrame : {compiled_df_us:>8.1f} µs")
+    print(f"  compiled, dict            : {compiled_dict_us:>8.1f} µs  ({pipeline_us / compiled_dict_us:.1f}× faster)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+# ABOUTME: Load-time and peak-RSS benchmark for src/data.py on synthetic multi-million-row extracts.
+# ABOUTME: Run `python -m benchmarks.bench_load --rows 2000000`; each loader runs in a fresh subprocess.
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.common import peak_rss_mb
+
+DATA_PATH = os.path.join('data', 'german_credit_data.csv')
+
+
+def legacy_load(path: str) -> pd.DataFrame:
+    """The untyped loader this benchmark compares against: default dtypes plus two clean-up passes."""
+    df = pd.read_csv(path)
+    if 'Unnamed: 0' in df.columns:
+        df.drop('Unnamed: 0', axis=1, inplace=True)
+    df['Saving accounts'] = df['Saving accounts'].replace('NA', 'unknown').fillna('unknown')
+    df['Checking account'] = df['Checking account'].replace('NA', 'unknown').fillna('unknown')
+    df['Risk'] = df['Risk'].map({'bad': 1, 'good': 0})
+    return df
+
+
+def run_child(mode: str, path: str) -> dict:
+    from src.data import iter_data_chunks, load_data
+
+    baseline = peak_rss_mb()
+    start = time.perf_counter()
+    if mode == 'legacy':
+        df = legacy_load(path)
+        n_rows, frame_mb = len(df), df.memory_usage(deep=True).sum() / 2**20
+    elif mode == 'typed':
+        df = load_data(path)
+        n_rows, frame_mb = len(df), df.memory_usage(deep=True).sum() / 2**20
+    elif mode == 'chunked':
+        n_rows, frame_mb = 0, 0.0
+        for chunk in iter_data_chunks(path, chunksize=100_000):
+            n_rows += len(chunk)
+            frame_mb = max(frame_mb, chunk.memory_usage(deep=True).sum() / 2**20)
+    else:
+        raise ValueError(f"Unknown mode {mode!r}")
+    return {
+        'mode': mode,
+        'rows': n_rows,
+        'load_s': round(time.perf_counter() - start, 3),
+        'frame_mb': round(frame_mb, 1),
+        'peak_rss_mb': round(peak_rss_mb(), 1),
+        'import_rss_mb': round(baseline, 1),
+    }
+
+
+def make_extract(n_rows: int, directory: str, seed: int = 0) -> list:
+    """Resample the German credit rows into a raw CSV (and Parquet, if pyarrow is installed)."""
+    source = pd.read_csv(DATA_PATH)
+    rng = np.random.default_rng(seed)
+    extract = source.iloc[rng.integers(0, len(source), n_rows)].reset_index(drop=True)
+    extract['Unnamed: 0'] = np.arange(n_rows)
+
+    paths = [os.path.join(directory, 'extract.csv')]
+    extract.to_csv(paths[0], index=False)
+    try:
+        extract.to_parquet(os.path.join(directory, 'extract.parquet'), index=False)
+        paths.append(os.path.join(directory, 'extract.parquet'))
+    except ImportError:
+        pass
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark load_data memory and time.')
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--child', nargs=2, metavar=('MODE', 'PATH'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_child(*args.child)))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"Writing synthetic extract with {args.rows:,} rows...")
+        paths = make_extract(args.rows, tmp)
+        print(f"  CSV size: {os.path.getsize(paths[0]) / 2**20:.1f} MB\n")
+
+        print(f"{'input':<8} {'mode':<8} {'load s':>8} {'frame MB':>9} {'peak RSS MB':>12} {'after import':>13}")
+        for path in paths:
+            modes = ['legacy', 'typed', 'chunked'] if path.endswith('.csv') else ['typed', 'chunked']
+            for mode in modes:
+                out = subprocess.run(
+                    [sys.executable, '-m', 'benchmarks.bench_load', '--child', mode, path],
+                    capture_output=True, text=True, check=True,
+                )
+                r = json.loads(out.stdout.strip().splitlines()[-1])
+                kind = os.path.splitext(path)[1].lstrip('.')
+                print(f"{kind:<8} {r['mode']:<8} {r['load_s']:>8.2f} {r['frame_mb']:>9.1f} {r['peak_rss_mb']:>12.1f} {r['import_rss_mb']:>13.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+# ABOUTME: Peak-memory benchmark of out-of-core training versus in-memory training as data grows 100×.
+# ABOUTME: Run `python -m benchmarks.bench_out_of_core --sizes 10000 100000 1000000`.
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.common import peak_rss_mb
+from benchmarks.synth import write_synthetic_csv
+
+FIT_PARAMS = {'n_estimators': 100, 'max_depth': 6, 'learning_rate': 0.1}
+
+
+def run_child(mode: str, path: str, chunksize: int) -> dict:
+    start = time.perf_counter()
+    if mode == 'in-memory':
+        from src.data import load_data
+        from src.preprocess import split_data
+        from src.train import build_pipeline, evaluate_model
+
+        X_train, X_test, y_train, y_test = split_data(load_data(path))
+        model = build_pipeline(**FIT_PARAMS).fit(X_train, y_train)
+        roc_auc = evaluate_model(model, X_test, y_test)['roc_auc']
+    else:
+        from src.out_of_core import train_out_of_core
+
+        roc_auc = train_out_of_core(path, chunksize=chunksize, params=FIT_PARAMS)['metrics']['roc_auc']
+    return {'seconds': round(time.perf_counter() - start, 2), 'peak_rss_mb': round(peak_rss_mb(), 1),
+            'roc_auc': round(float(roc_auc), 4)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare peak memory of in-memory and out-of-core training.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--chunksize', type=int, default=50_000)
+    parser.add_argument('--child', nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_child(args.child[0], args.child[1], args.chunksize)))
+        return
+
+    print(f"{'rows':>11} {'mode':<12} {'seconds':>8} {'peak RSS MB':>12} {'ROC-AUC':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_rows in args.sizes:
+            path = write_synthetic_csv(os.path.join(tmp, f'synthetic_{n_rows}.csv'), n_rows)
+            for mode in ('in-memory', 'out-of-core'):
+                out = subprocess.run(
+                    [sys.executable, '-m', 'benchmarks.bench_out_of_core', '--child', mode, path,
+                     '--chunksize', str(args.chunksize)],
+                    capture_output=True, text=True, check=True,
+                )
+                r = json.loads(out.stdout.strip().splitlines()[-1])
+                print(f"{n_rows:>11,} {mode:<12} {r['seconds']:>8.2f} {r['peak_rss_mb']:>12.1f} {r['roc_auc']:>8.4f}")
+            os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,173 @@
+# ABOUTME: End-to-end pipeline benchmark on synthetic datasets of increasing size (1k / 100k / 10M rows).
+# ABOUTME: Run `python -m benchmarks.bench_pipeline`; writes JSON results and can compare against a baseline.
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+from datetime import datetime, timezone
+
+import numpy as np
+
+from benchmarks.common import Stopwatch
+from benchmarks.synth import write_synthetic_csv
+
+RESULTS_DIR = os.path.join('benchmarks', 'results')
+DEFAULT_SIZES = [1_000, 100_000, 10_000_000]
+
+# A fixed candidate so "fit" measures one pipeline fit, not a search
+FIT_PARAMS = {'n_estimators': 200, 'max_depth': 6, 'learning_rate': 0.1}
+
+
+def _versions() -> dict:
+    import pandas
+    import sklearn
+    import xgboost
+
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'],
+                                capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pandas.__version__,
+        'sklearn': sklearn.__version__,
+        'xgboost': xgboost.__version__,
+        'cpu_count': os.cpu_count(),
+        'platform': platform.platform(),
+        'commit': commit,
+    }
+
+
+def bench_size(path: str, n_rows: int, single_rows: int, with_search: bool) -> dict:
+    """Time every pipeline stage on one synthetic file; returns {stage: {seconds, peak_rss_mb, ...}}."""
+    from src.data import load_data
+    from src.predict import make_prediction, make_prediction_batch
+    from src.preprocess import build_preprocessor, split_data
+    from src.train import build_pipeline, evaluate_model, train_model
+
+    stages = {}
+
+    def record(name, watch, **extra):
+        stages[name] = {'seconds': round(watch.seconds, 4), 'peak_rss_mb': round(watch.peak_rss_mb, 1), **extra}
+        print(f"  {name:<15} {watch.seconds:>10.3f}s  peak RSS {watch.peak_rss_mb:>8.1f} MB")
+
+    with Stopwatch() as w:
+        df = load_data(path)
+    record('load', w, rows=len(df))
+
+    with Stopwatch() as w:
+        X_train, X_test, y_train, y_test = split_data(df)
+    record('split', w)
+    del df
+
+    with Stopwatch() as w:
+        build_preprocessor().fit_transform(X_train)
+    record('preprocess', w)
+
+    if with_search:
+        with Stopwatch() as w:
+            train_model(X_train, y_train)
+        record('search', w)
+
+    with Stopwatch() as w:
+        model = build_pipeline(**FIT_PARAMS).fit(X_train, y_train)
+    record('fit', w)
+
+    with Stopwatch() as w:
+        metrics = evaluate_model(model, X_test, y_test)
+    record('evaluate', w, roc_auc=round(float(metrics['roc_auc']), 4))
+
+    rows = [X_test.iloc[[i]] for i in range(min(single_rows, len(X_test)))]
+    with Stopwatch() as w:
+        for row in rows:
+            make_prediction(model, row)
+    record('predict_single', w, per_row_ms=round(w.seconds / len(rows) * 1000, 3))
+
+    with Stopwatch() as w:
+        result = make_prediction_batch(model, X_test)
+    record('predict_batch', w, rows_per_sec=round(result['rows_per_sec'], 1))
+
+    return stages
+
+
+def run_child(path: str, n_rows: int, single_rows: int, with_search: bool):
+    print(json.dumps(bench_size(path, n_rows, single_rows, with_search)))
+
+
+def compare(current: dict, baseline_path: str, tolerance: float, min_seconds: float):
+    """Print per-stage time ratios against a previous results file; return the regressed stages."""
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    regressions = []
+    print(f"\nComparison with {baseline_path} (ratio = current / baseline)")
+    for size, stages in current['results'].items():
+        for stage, values in stages.items():
+            before = baseline['results'].get(size, {}).get(stage)
+            if not before or not before['seconds']:
+                continue
+            ratio = values['seconds'] / before['seconds']
+            # Stages faster than min_seconds are too noisy to flag
+            regressed = ratio > 1 + tolerance and values['seconds'] >= min_seconds
+            flag = '  REGRESSION' if regressed else ''
+            print(f"  {size:>10} {stage:<15} {ratio:>6.2f}×{flag}")
+            if flag:
+                regressions.append(f'{size}/{stage}')
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark every pipeline stage on synthetic data.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    parser.add_argument('--single-rows', type=int, default=100, help='rows scored one at a time')
+    parser.add_argument('--with-search', action='store_true', help='also time the full hyperparameter search')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='results JSON path (default: benchmarks/results/<timestamp>.json)')
+    parser.add_argument('--compare', help='previous results JSON to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='allowed slowdown before flagging')
+    parser.add_argument('--min-seconds', type=float, default=0.05, help='ignore stages faster than this')
+    parser.add_argument('--child', nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child[0], int(args.child[1]), args.single_rows, args.with_search)
+        return
+
+    report = {
+        'created_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'seed': args.seed,
+        'environment': _versions(),
+        'results': {},
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_rows in args.sizes:
+            path = os.path.join(tmp, f'synthetic_{n_rows}.csv')
+            print(f"\n=== {n_rows:,} rows ===")
+            write_synthetic_csv(path, n_rows, seed=args.seed)
+
+            # A fresh interpreter per size keeps peak-RSS figures independent
+            cmd = [sys.executable, '-m', 'benchmarks.bench_pipeline', '--child', path, str(n_rows),
+                   '--single-rows', str(args.single_rows)] + (['--with-search'] if args.with_search else [])
+            out = subprocess.run(cmd, stdout=subprocess.PIPE, text=True, check=True)
+            lines = out.stdout.rstrip().splitlines()
+            print('\n'.join(lines[:-1]))
+            report['results'][str(n_rows)] = json.loads(lines[-1])
+            os.remove(path)
+
+    output = args.output or os.path.join(RESULTS_DIR, f"pipeline-{report['created_at'].replace(':', '')}.json")
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written → {output}")
+
+    if args.compare and compare(report, args.compare, args.tolerance, args.min_seconds):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
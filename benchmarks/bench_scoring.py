@@ -0,0 +1,37 @@
+# ABOUTME: Throughput benchmark of run_scoring's process pool as the worker count grows, on a synthetic file.
+# ABOUTME: Run `python -m benchmarks.bench_scoring --rows 10000000 --workers 1 2 4 8`.
+
+import argparse
+import os
+import tempfile
+
+from benchmarks.synth import write_synthetic_csv
+from src.scoring import score_file
+
+ARTIFACT_PATH = os.path.join('models', 'credit_risk_model_v2')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure batch-scoring throughput against the number of workers.')
+    parser.add_argument('--rows', type=int, default=2_000_000)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, os.cpu_count()])
+    parser.add_argument('--chunksize', type=int, default=250_000)
+    parser.add_argument('--model', default=ARTIFACT_PATH)
+    args = parser.parse_args()
+
+    print(f"{'workers':>8} {'seconds':>8} {'rows/sec':>12} {'speedup':>8} {'efficiency':>11}")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = write_synthetic_csv(os.path.join(tmp, f'synthetic_{args.rows}.csv'), args.rows)
+        output = os.path.join(tmp, 'scores.parquet')
+        baseline = None
+        for workers in sorted(set(args.workers)):
+            r = score_file(path, output, args.model, chunksize=args.chunksize, workers=workers, progress=False)
+            baseline = baseline or r['rows_per_sec']
+            speedup = r['rows_per_sec'] / baseline
+            print(f"{workers:>8} {r['elapsed_s']:>8.2f} {r['rows_per_sec']:>12,.0f} {speedup:>7.2f}× "
+                  f"{speedup / workers:>10.0%}")
+            os.remove(output)
+
+
+if __name__ == '__main__':
+    main()
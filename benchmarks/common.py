@@ -0,0 +1,44 @@
+# ABOUTME: Shared helpers for the benchmark scripts: peak-RSS measurement and stage timing.
+# ABOUTME: Provides peak_rss_mb(), reset_peak_rss() and the Stopwatch context manager.
+
+import resource
+import sys
+import time
+
+
+def peak_rss_mb() -> float:
+    """High-water-mark resident set size of this process in MB."""
+    # VmHWM resets on exec; ru_maxrss can carry over the parent's peak on Linux
+    try:
+        with open('/proc/self/status') as status:
+            for line in status:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def reset_peak_rss() -> bool:
+    """Reset VmHWM to the current RSS where the kernel allows it (Linux ≥ 4.0)."""
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+
+class Stopwatch:
+    """Context manager recording wall-clock seconds and peak RSS of the enclosed block."""
+
+    def __enter__(self):
+        self.resettable = reset_peak_rss()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.seconds = time.perf_counter() - self.start
+        self.peak_rss_mb = peak_rss_mb()
+        return False
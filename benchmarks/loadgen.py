@@ -0,0 +1,79 @@
+# ABOUTME: Local load generator for the micro-batching scoring service in src/serve.py.
+# ABOUTME: Run `python -m benchmarks.loadgen` to compare one-at-a-time scoring against micro-batching.
+
+import argparse
+import json
+import os
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import joblib
+
+from src.data import load_data
+from src.serve import INPUT_FEATURES, MODEL_PATH, make_server
+
+DATA_PATH = os.path.join('data', 'german_credit_data.csv')
+
+
+def _post(url: str, record: dict) -> dict:
+    request = urllib.request.Request(
+        url, data=json.dumps(record).encode(), headers={'Content-Type': 'application/json'},
+    )
+    with urllib.request.urlopen(request) as response:
+        return json.loads(response.read())
+
+
+def run_load(url: str, records: list, concurrency: int) -> float:
+    """Fire every record at `url` from `concurrency` client threads; return requests/sec."""
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(lambda r: _post(url, r), records))
+    return len(records) / (time.perf_counter() - start)
+
+
+def bench(model, records: list, concurrency: int, window_ms: float, max_batch: int) -> dict:
+    server = make_server(model, port=0, window_ms=window_ms, max_batch=max_batch)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    host, port = server.server_address
+    try:
+        throughput = run_load(f'http://{host}:{port}/predict', records, concurrency)
+        stats = server.RequestHandlerClass.batcher.stats()
+    finally:
+        server.shutdown()
+        server.server_close()
+        server.RequestHandlerClass.batcher.close()
+    return {'throughput_rps': round(throughput, 1), **stats}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load-test the micro-batching scoring service.')
+    parser.add_argument('--model', default=MODEL_PATH)
+    parser.add_argument('--data', default=DATA_PATH)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--window-ms', type=float, default=5.0)
+    parser.add_argument('--max-batch', type=int, default=256)
+    args = parser.parse_args()
+
+    model = joblib.load(args.model)
+    df = load_data(args.data)[INPUT_FEATURES]
+    pool = df.to_dict('records')
+    records = [{k: (v.item() if hasattr(v, 'item') else v) for k, v in pool[i % len(pool)].items()}
+               for i in range(args.requests)]
+
+    print(f"{args.requests} requests, {args.concurrency} concurrent clients\n")
+    for name, window_ms, max_batch in [
+        ('one-at-a-time', 0.0, 1),
+        ('micro-batched', args.window_ms, args.max_batch),
+    ]:
+        result = bench(model, records, args.concurrency, window_ms, max_batch)
+        print(f"{name:>14}: {result['throughput_rps']:>8.1f} req/s  "
+              f"p50={result['latency_p50_ms']:.2f}ms  p99={result['latency_p99_ms']:.2f}ms  "
+              f"mean batch={result['mean_batch_size']:.1f}")
+
+
+if __name__ == '__main__':
+    main()
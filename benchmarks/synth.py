@@ -0,0 +1,70 @@
+# ABOUTME: Synthesizes German-credit-shaped applicant files of any size for benchmarks.
+# ABOUTME: Provides fit_profile(), synthesize() and write_synthetic_csv(); rows are drawn per Risk class.
+
+import os
+
+import numpy as np
+import pandas as pd
+
+DATA_PATH = os.path.join('data', 'german_credit_data.csv')
+CATEGORICAL_COLUMNS = ['Sex', 'Job', 'Housing', 'Saving accounts', 'Checking account', 'Purpose']
+NUMERIC_COLUMNS = ['Age', 'Credit amount', 'Duration']
+
+
+def fit_profile(path: str = DATA_PATH) -> dict:
+    """
+    Summarise the source file as P(Risk) plus, per Risk class, the category
+    frequencies and the empirical values of each numeric column.
+    """
+    df = pd.read_csv(path, keep_default_na=False, na_values=[''])
+    risk = df['Risk'].value_counts(normalize=True)
+    profile = {'risk': (risk.index.to_numpy(), risk.to_numpy()), 'classes': {}}
+    for label, group in df.groupby('Risk'):
+        profile['classes'][label] = {
+            'categorical': {
+                c: (counts.index.to_numpy(), counts.to_numpy())
+                for c in CATEGORICAL_COLUMNS
+                for counts in [group[c].value_counts(normalize=True)]
+            },
+            'numeric': {c: group[c].to_numpy() for c in NUMERIC_COLUMNS},
+        }
+    return profile
+
+
+def synthesize(n_rows: int, seed: int = 0, profile: dict = None) -> pd.DataFrame:
+    """Return `n_rows` raw rows (same columns and NA strings as the source CSV)."""
+    profile = profile or fit_profile()
+    rng = np.random.default_rng(seed)
+    labels, p = profile['risk']
+    risk = rng.choice(labels, size=n_rows, p=p)
+
+    columns = {c: np.empty(n_rows, dtype=object) for c in CATEGORICAL_COLUMNS}
+    columns.update({c: np.empty(n_rows, dtype=np.int64) for c in NUMERIC_COLUMNS})
+    for label, dist in profile['classes'].items():
+        rows = np.flatnonzero(risk == label)
+        for c, (values, freq) in dist['categorical'].items():
+            columns[c][rows] = rng.choice(values, size=len(rows), p=freq)
+        for c, values in dist['numeric'].items():
+            columns[c][rows] = rng.choice(values, size=len(rows))
+
+    # Jitter amounts so large files are not just repeats of 1,000 values
+    jitter = rng.normal(1.0, 0.05, n_rows)
+    columns['Credit amount'] = np.maximum(1, np.round(columns['Credit amount'] * jitter)).astype(np.int64)
+
+    df = pd.DataFrame(columns)[['Age', 'Sex', 'Job', 'Housing', 'Saving accounts', 'Checking account',
+                                'Credit amount', 'Duration', 'Purpose']]
+    df['Job'] = df['Job'].astype(np.int64)
+    df['Risk'] = risk
+    return df
+
+
+def write_synthetic_csv(path: str, n_rows: int, seed: int = 0, chunk_rows: int = 1_000_000) -> str:
+    """Write a synthetic CSV in chunks so 10M-row files never sit in memory at once."""
+    profile = fit_profile()
+    written = 0
+    for i, start in enumerate(range(0, n_rows, chunk_rows)):
+        chunk = synthesize(min(chunk_rows, n_rows - start), seed=seed + i, profile=profile)
+        chunk.index = pd.RangeIndex(start, start + len(chunk))
+        chunk.to_csv(path, mode='w' if i == 0 else 'a', header=i == 0, index=True)
+        written += len(chunk)
+    return path
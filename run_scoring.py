@@ -0,0 +1,42 @@
+# ABOUTME: Scores an applicant CSV/Parquet file with a pool of worker processes and writes results in input order.
+# ABOUTME: Run `python run_scoring.py applicants.csv --output scores.parquet [--workers 8]`; re-run to resume.
+
+import argparse
+import os
+
+from src.scoring import score_file
+
+ARTIFACT_PATH = os.path.join('models', 'credit_risk_model_v2')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Batch-score an applicant file with the credit risk model.')
+    parser.add_argument('input', help='CSV or Parquet file of applicants')
+    parser.add_argument('--output', default='scores.parquet', help='.parquet or .csv; rows keep the input order')
+    parser.add_argument('--model', default=ARTIFACT_PATH, help='native artifact directory or pickled pipeline')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='worker processes (default: all cores)')
+    parser.add_argument('--chunksize', type=int, default=250_000, help='rows per chunk and per checkpoint')
+    parser.add_argument('--parts-dir', help='checkpoint directory (default: <output>.parts)')
+    parser.add_argument('--indicators', action='store_true', help="add the dashboard's risk-indicator columns")
+    parser.add_argument('--keep-parts', action='store_true', help='keep the per-chunk files after merging')
+    args = parser.parse_args()
+
+    print("=== Credit Risk Batch Scoring ===\n")
+    print(f"Scoring {args.input} with {args.model} on {args.workers} workers...")
+    try:
+        result = score_file(
+            args.input, args.output, args.model, chunksize=args.chunksize, workers=args.workers,
+            parts_dir=args.parts_dir, indicators=args.indicators, keep_parts=args.keep_parts,
+        )
+    except KeyboardInterrupt:
+        print(f"\nInterrupted; finished chunks are kept in {args.parts_dir or args.output + '.parts'}. "
+              "Run the same command again to resume.")
+        raise SystemExit(130)
+
+    resumed = f", {result['resumed_chunks']} resumed" if result['resumed_chunks'] else ''
+    print(f"\nScored {result['rows']:,} rows in {result['elapsed_s']:.1f}s "
+          f"({result['rows_per_sec']:,.0f} rows/sec, {result['chunks']} chunks{resumed}) → {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,40 +1,242 @@
 # ABOUTME: Orchestrates the full training pipeline: load → preprocess → train → evaluate → save.
-# ABOUTME: Run this script to retrain the model: `python run_training.py`
+# ABOUTME: Run `python run_training.py [--cost-fn 5] [--score-table]`, or `--incremental delta.csv` for a warm start.
 
-import joblib
+import argparse
 import os
+import tempfile
+
+import joblib
+import pandas as pd
 
+from src import instrument
+from src.artifact import load_manifest, save_artifact
+from src.calibration import CALIBRATION_METHODS
+from src.cache import FeatureCache, cached_folds, cached_split
 from src.data import load_data
-from src.preprocess import split_data
+from src.decision import COST_FN, COST_FP, choose_threshold
+from src.incremental import incremental_update
+from src.lookup import accuracy_violations, build_score_table, grid_from_model, table_accuracy
+from src.monitor import build_profile
+from src.predict import DEFAULT_THRESHOLD, calibrate, predict_default_proba
+from src.registry import REGISTRY_DIR, current_version, promote, register
 from src.train import evaluate_model, train_model
 
 DATA_PATH = os.path.join('data', 'german_credit_data.csv')
 MODEL_OUTPUT_PATH = os.path.join('models', 'credit_risk_model_v2.pkl')
+ARTIFACT_OUTPUT_PATH = os.path.join('models', 'credit_risk_model_v2')
 
 
-def main():
-    print("=== Credit Risk Model Training Pipeline ===\n")
+def save_model(model, metrics: dict):
+    """Write the pickle and native artifact, then register and promote a new version."""
+    os.makedirs('models', exist_ok=True)
+    with instrument.stage('save_model', path=MODEL_OUTPUT_PATH):
+        joblib.dump(model, MODEL_OUTPUT_PATH)
+    print(f"Model saved → {MODEL_OUTPUT_PATH}")
+
+    with instrument.stage('save_artifact', path=ARTIFACT_OUTPUT_PATH):
+        save_artifact(model, ARTIFACT_OUTPUT_PATH, version='v2', metadata={
+            'accuracy': metrics.get('accuracy'),
+            'roc_auc': metrics.get('roc_auc'),
+            'recall': metrics.get('recall'),
+            'brier': metrics.get('brier'),
+            'ece': metrics.get('ece'),
+        })
+    print(f"Artifact saved → {ARTIFACT_OUTPUT_PATH}")
+
+    with instrument.stage('register_model'):
+        version = register(model, metrics)
+        promote(version)
+    print(f"Registered and promoted model version {version}")
+
+
+def print_intervals(title: str, intervals: dict):
+    print(f"  {title}")
+    for name in ('accuracy', 'roc_auc', 'recall'):
+        ci = intervals[name]
+        print(f"    {name:<9}: {ci['mean']:.4f}  [{ci['ci_low']:.4f}, {ci['ci_high']:.4f}]")
+
+
+def attach_score_table(model, X_fit, X_eval, categories: list = None):
+    """
+    Precompute the model's scores over its split-point grid and check them against held-out X_eval.
+
+    Categories (unless given) and the cell-probe combinations come from the
+    rows the model was fitted on. The table is attached only when it passes
+    the src.lookup accuracy and coverage gate.
+    """
+    model.score_table = None
+    with instrument.stage('build_score_table'):
+        seen, edges, probe_combos = grid_from_model(model, X_fit)
+        table = build_score_table(model, categories or seen, edges, probe_combos)
+        table.accuracy = table_accuracy(table, model, X_eval)
+    acc = table.accuracy
+    print(f"  Score table: {table.values.size:,} cells ({table.nbytes / 1e6:.1f} MB), "
+          f"{acc['hit_rate']:.1%} of held-out rows ({acc['hits']} of {acc['rows']}) answered from the table")
+    if acc['mae'] is not None:
+        print(f"  Table vs model: MAE {acc['mae']:.4f} · p99 {acc['p99_abs_error']:.4f} · "
+              f"decision agreement {acc['decision_agreement']:.2%}")
+    reasons = accuracy_violations(acc)
+    if reasons:
+        print(f"  Score table not attached: {'; '.join(reasons)}")
+        return
+    model.score_table = table
+
+
+def print_threshold_change(model, X_test, y_test, metrics: dict):
+    """Show what moving off the default cutoff did to the test metrics."""
+    default_pred = predict_default_proba(model, X_test) > DEFAULT_THRESHOLD
+    y = y_test.to_numpy().astype(bool)
+    accuracy = float((default_pred == y).mean())
+    recall = float(default_pred[y].mean()) if y.any() else 0.0
+    print(f"  Threshold {DEFAULT_THRESHOLD:.3f} → {model.decision_threshold:.3f}: "
+          f"accuracy {accuracy:.4f} → {metrics['accuracy']:.4f} · recall {recall:.4f} → {metrics['recall']:.4f}")
+
 
-    print("[1/4] Loading and cleaning data...")
-    df = load_data(DATA_PATH)
-    print(f"  Dataset shape: {df.shape}")
+def train_full(ci: bool = False, calibration: str = None, score_table: bool = False, cost: tuple = None,
+               min_recall: float = None, data_path: str = DATA_PATH):
+    """
+    Run the search, evaluate on the test split and save the model.
 
-    print("\n[2/4] Splitting into train/test sets...")
-    X_train, X_test, y_train, y_test = split_data(df)
+    Labels use the default 0.5 cutoff unless `cost` (cost_fn, cost_fp) or
+    `min_recall` is given; then src.decision picks the cutoff from the
+    out-of-fold predictions.
+    """
+    cache = FeatureCache()
+
+    print("[1/4] Loading, cleaning and splitting data...")
+    key, X_train, X_test, y_train, y_test = cached_split(cache, data_path)
     print(f"  Train: {X_train.shape}  |  Test: {X_test.shape}")
 
-    print("\n[3/4] Training model with SMOTE + GridSearchCV...")
-    model = train_model(X_train, y_train)
+    print("\n[2/4] Preprocessing cross-validation folds...")
+    folds = cached_folds(cache, key, X_train, y_train)
+    print(f"  Feature cache: {cache.hits} hits, {cache.misses} misses ({os.path.join(cache.root, key)})")
+
+    print("\n[3/4] Training model with cached-fold hyperparameter search...")
+    model = train_model(X_train, y_train, folds=folds, calibration=calibration)
+    # Kept with the model so incremental updates re-pick the cutoff and full retrains repeat these choices
+    model.training_settings = {'calibration': calibration, 'cost': list(cost) if cost else None,
+                               'min_recall': min_recall, 'score_table': score_table}
+    if cost is not None or min_recall is not None:
+        cost_fn, cost_fp = cost or (COST_FN, COST_FP)
+        decision = choose_threshold(y_train, calibrate(model, model.oof_proba_), cost_fn, cost_fp, min_recall)
+        model.decision_threshold = decision['threshold']
+        rule = f"recall ≥ {min_recall:g}" if min_recall is not None else f"min cost at FN:FP = {cost_fn:g}:{cost_fp:g}"
+        print(f"  Decision threshold {decision['threshold']:.3f} "
+              f"({rule}; out-of-fold cost {decision['cost']:.3f}/applicant)")
+    model.profile = build_profile(X_train, calibrate(model, model.oof_proba_))
 
     print("\n[4/4] Evaluating model...")
-    metrics = evaluate_model(model, X_test, y_test)
+    if ci:
+        metrics = evaluate_model(model, X_test, y_test, n_bootstrap=2000, cv_data=(X_train, y_train))
+    else:
+        metrics = evaluate_model(model, X_test, y_test)
     print(f"  Accuracy : {metrics['accuracy']:.4f}")
     print(f"  ROC-AUC  : {metrics['roc_auc']:.4f}")
+    print(f"  Recall   : {metrics['recall']:.4f}")
+    print(f"  Brier    : {metrics['brier']:.4f}  ·  ECE {metrics['ece']:.4f}")
+    if getattr(model, 'decision_threshold', DEFAULT_THRESHOLD) != DEFAULT_THRESHOLD:
+        print_threshold_change(model, X_test, y_test, metrics)
+    if 'reliability_uncalibrated' in metrics:
+        raw = metrics['reliability_uncalibrated']
+        print(f"  Uncalibrated Brier {raw['brier']:.4f}  ·  ECE {raw['ece']:.4f}")
+    if ci:
+        print_intervals(f"Bootstrap 95% CI ({metrics['bootstrap']['n_resamples']} resamples of the test set)",
+                        metrics['bootstrap'])
+        print_intervals(f"Repeated stratified CV ({metrics['cv']['n_fits']} fits, {metrics['cv']['elapsed_s']:.1f}s)",
+                        metrics['cv'])
     print(f"\n{metrics['report']}")
+    if score_table:
+        attach_score_table(model, X_train, X_test)
 
-    os.makedirs('models', exist_ok=True)
-    joblib.dump(model, MODEL_OUTPUT_PATH)
-    print(f"Model saved → {MODEL_OUTPUT_PATH}")
+    save_model(model, metrics)
+
+
+def train_incremental(delta_path: str, n_rounds: int):
+    """Warm-start the saved model on a delta file; fall back to train_full() when drift is too large."""
+    print("[1/3] Loading saved model and new rows...")
+    model = joblib.load(MODEL_OUTPUT_PATH)
+    delta = load_data(delta_path)
+    X_new, y_new = delta.drop('Risk', axis=1), delta['Risk']
+    _, _, X_ref, _, y_ref = cached_split(FeatureCache(), DATA_PATH)
+    print(f"  Delta: {X_new.shape}  |  Reference (original test split): {X_ref.shape}")
+
+    version = current_version()
+    baseline_auc = None
+    if version is not None:
+        baseline_auc = load_manifest(os.path.join(REGISTRY_DIR, version))['metadata']['metrics'].get('roc_auc')
+
+    print(f"\n[2/3] Checking drift and boosting {n_rounds} more rounds...")
+    result = incremental_update(model, X_new, y_new, n_rounds=n_rounds, baseline_auc=baseline_auc,
+                                X_ref=X_ref, y_ref=y_ref)
+    for reason in result['drift']['reasons']:
+        print(f"  Drift: {reason}")
+    if result['holdout_auc_after'] is not None:
+        print(f"  Holdout ROC-AUC: {result['holdout_auc_before']:.4f} → {result['holdout_auc_after']:.4f}")
+    print(f"  Decision: {result['action']}")
+
+    if result['action'] == 'full_retrain':
+        settings = getattr(model, 'training_settings', {})
+        calibration = settings.get('calibration', getattr(getattr(model, 'calibrator', None), 'method', None))
+        cost = settings.get('cost')
+        print(f"\nDrift limits exceeded; running the full search on {DATA_PATH} plus the {len(delta)} delta rows.\n")
+        with tempfile.TemporaryDirectory() as tmp:
+            combined = os.path.join(tmp, 'combined.parquet')
+            pd.concat([load_data(DATA_PATH), delta], ignore_index=True).to_parquet(combined, index=False)
+            train_full(calibration=calibration, score_table=settings.get('score_table', False),
+                       cost=tuple(cost) if cost else None, min_recall=settings.get('min_recall'),
+                       data_path=combined)
+        return
+    if result['action'] == 'rejected':
+        print("\nUpdated model scored worse on the holdout; keeping the current version.")
+        return
+
+    for change in result['refitted']:
+        print(f"  Refit: {change}")
+    table = getattr(result['model'], 'score_table', None)
+    if table is not None:
+        # The copied table still holds the old model's scores; rebuild it on the updated trees' splits
+        X_eval = pd.concat([X_ref, result['X_holdout']], ignore_index=True)
+        attach_score_table(result['model'], X_new, X_eval, table.categories)
+
+    print("\n[3/3] Saving updated model...")
+    save_model(result['model'], {'roc_auc': result['holdout_auc_after'], 'delta_rows': len(delta)})
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Train, evaluate and save the credit risk model.')
+    parser.add_argument('--instrument', nargs='?', const='-', metavar='PATH',
+                        help=f'write JSON timing events to PATH (stderr if omitted); also ${instrument.ENV_VAR}')
+    parser.add_argument('--incremental', metavar='DELTA_CSV',
+                        help='warm-start the saved model on new labelled rows instead of a full search')
+    parser.add_argument('--rounds', type=int, default=20, help='boosting rounds added by --incremental')
+    parser.add_argument('--calibrate', choices=CALIBRATION_METHODS,
+                        help='calibrate probabilities on the out-of-fold predictions of the search')
+    parser.add_argument('--ci', action='store_true',
+                        help='add bootstrap and repeated-CV confidence intervals to the evaluation')
+    parser.add_argument('--cost-fn', type=float,
+                        help='cost of approving a bad loan; giving either cost picks the min-cost cutoff instead of 0.5 '
+                             f'(the other defaults to FN:FP = {COST_FN:g}:{COST_FP:g})')
+    parser.add_argument('--cost-fp', type=float,
+                        help='cost of declining a good loan')
+    parser.add_argument('--min-recall', type=float,
+                        help='use the highest cutoff whose out-of-fold recall on bad loans reaches this')
+    parser.add_argument('--score-table', action='store_true',
+                        help='precompute scores over the categorical cross-product and binned numerics for O(1) lookups')
+    args = parser.parse_args()
+    if args.instrument:
+        instrument.enable(args.instrument)
+
+    if args.incremental:
+        print("=== Credit Risk Model Incremental Update ===\n")
+        train_incremental(args.incremental, args.rounds)
+    else:
+        print("=== Credit Risk Model Training Pipeline ===\n")
+        cost = None
+        if args.cost_fn is not None or args.cost_fp is not None:
+            cost = (args.cost_fn if args.cost_fn is not None else COST_FN,
+                    args.cost_fp if args.cost_fp is not None else COST_FP)
+        train_full(ci=args.ci, calibration=args.calibrate, score_table=args.score_table, cost=cost,
+                   min_recall=args.min_recall)
 
 
 if __name__ == '__main__':
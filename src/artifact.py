@@ -0,0 +1,130 @@
+# ABOUTME: Versioned on-disk model artifact: XGBoost native booster plus a JSON preprocessor spec.
+# ABOUTME: Provides save_artifact() and load_artifact(); loading needs no unpickling, sklearn or imblearn.
+
+import argparse
+import json
+import os
+from datetime import datetime, timezone
+
+from src.calibration import Calibrator
+from src.fastpath import CompiledModel
+from src.lookup import ScoreTable
+from src.predict import DEFAULT_THRESHOLD
+
+FORMAT_NAME = 'credit-risk-model'
+FORMAT_VERSION = 1
+MANIFEST_FILE = 'manifest.json'
+PREPROCESSOR_FILE = 'preprocessor.json'
+BOOSTER_FILE = 'booster.ubj'
+PROFILE_FILE = 'profile.json'
+SCORE_TABLE_FILE = 'score_table.npz'
+
+
+def save_artifact(model, directory: str, version: str = None, metadata: dict = None) -> str:
+    """
+    Write a fitted pipeline (or CompiledModel) to `directory` and return its path.
+
+    The directory holds manifest.json, preprocessor.json (scaler arrays and
+    one-hot lookups), booster.ubj (XGBoost's native binary format) and, when
+    the model carries them, profile.json (the drift-monitoring reference) and
+    score_table.npz (the src.lookup precomputed scores).
+    """
+    if not isinstance(model, CompiledModel):
+        from src.fastpath import compile_pipeline
+
+        model = compile_pipeline(model)
+
+    os.makedirs(directory, exist_ok=True)
+    model.booster.save_model(os.path.join(directory, BOOSTER_FILE))
+
+    preprocessor = {
+        'numeric_features': model.numeric_features,
+        'mean': model.mean.tolist(),
+        'scale': model.scale.tolist(),
+        'categorical_features': model.categorical_features,
+        'categories': [list(lut) for lut in model.category_index],
+        'columns': [list(lut.values()) for lut in model.category_index],
+        'n_columns': model.n_columns,
+    }
+    with open(os.path.join(directory, PREPROCESSOR_FILE), 'w') as f:
+        json.dump(preprocessor, f, indent=2)
+    if model.profile is not None:
+        with open(os.path.join(directory, PROFILE_FILE), 'w') as f:
+            json.dump(model.profile, f)
+    if model.score_table is not None:
+        model.score_table.save(os.path.join(directory, SCORE_TABLE_FILE))
+
+    manifest = {
+        'format': FORMAT_NAME,
+        'format_version': FORMAT_VERSION,
+        'model_version': version or model.version or os.path.basename(os.path.normpath(directory)),
+        'created_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'booster': BOOSTER_FILE,
+        'preprocessor': PREPROCESSOR_FILE,
+        'profile': PROFILE_FILE if model.profile is not None else None,
+        'score_table': SCORE_TABLE_FILE if model.score_table is not None else None,
+        'iteration_range': list(model.iteration_range),
+        'decision_threshold': model.decision_threshold,
+        'calibration': model.calibrator.to_dict() if model.calibrator is not None else None,
+        'metadata': metadata or {},
+    }
+    # Manifest last: a directory without one is an incomplete export
+    with open(os.path.join(directory, MANIFEST_FILE), 'w') as f:
+        json.dump(manifest, f, indent=2)
+    return directory
+
+
+def load_manifest(directory: str) -> dict:
+    with open(os.path.join(directory, MANIFEST_FILE)) as f:
+        manifest = json.load(f)
+    if manifest.get('format') != FORMAT_NAME:
+        raise ValueError(f"{directory} is not a {FORMAT_NAME} artifact")
+    if manifest['format_version'] > FORMAT_VERSION:
+        raise ValueError(
+            f"Artifact format v{manifest['format_version']} is newer than supported v{FORMAT_VERSION}"
+        )
+    return manifest
+
+
+def load_artifact(directory: str) -> CompiledModel:
+    """Load a saved artifact as a CompiledModel; raises FileNotFoundError if it is missing."""
+    manifest = load_manifest(directory)
+    with open(os.path.join(directory, manifest['preprocessor'])) as f:
+        spec = json.load(f)
+    profile = None
+    if manifest.get('profile'):
+        with open(os.path.join(directory, manifest['profile'])) as f:
+            profile = json.load(f)
+
+    # xgboost is the only heavy import on the loading path
+    import xgboost as xgb
+
+    booster = xgb.Booster()
+    booster.load_model(os.path.join(directory, manifest['booster']))
+
+    return CompiledModel(
+        spec['numeric_features'], spec['mean'], spec['scale'], spec['categorical_features'],
+        [dict(zip(categories, columns)) for categories, columns in zip(spec['categories'], spec['columns'])],
+        spec['n_columns'], booster, manifest['iteration_range'], version=manifest['model_version'],
+        decision_threshold=manifest.get('decision_threshold', DEFAULT_THRESHOLD),
+        calibrator=Calibrator.from_dict(manifest['calibration']) if manifest.get('calibration') else None,
+        profile=profile,
+        score_table=ScoreTable.load(os.path.join(directory, manifest['score_table'])) if manifest.get('score_table') else None,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Export a pickled pipeline to the native artifact format.')
+    parser.add_argument('pickle_path')
+    parser.add_argument('output_dir')
+    parser.add_argument('--version')
+    args = parser.parse_args()
+
+    import joblib
+
+    save_artifact(joblib.load(args.pickle_path), args.output_dir, version=args.version)
+    print(f"Artifact saved → {args.output_dir}")
+
+
+if __name__ == '__main__':
+    main()
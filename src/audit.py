@@ -0,0 +1,254 @@
+# ABOUTME: Append-only prediction audit log written as zstd Parquet segments by a background thread.
+# ABOUTME: Provides AuditLog (record/record_batch), read_log() for time ranges and replay() against a candidate model.
+
+import argparse
+import atexit
+import os
+import queue
+import threading
+import time
+import uuid
+
+import numpy as np
+import pandas as pd
+
+from src.data import clean_data
+from src.features import INPUT_FEATURES
+from src.predict import make_prediction_batch
+
+AUDIT_DIR = os.path.join('logs', 'audit')
+RESULT_COLUMNS = ['prediction', 'risk_label', 'default_probability']
+
+_FLUSH = object()
+_STOP = object()
+
+
+class AuditLog:
+    """
+    Asynchronous sink for scored decisions.
+
+    record() and record_batch() only enqueue; a writer thread groups queued
+    decisions and writes one Parquet segment per `flush_rows` rows or every
+    `flush_interval` seconds, whichever comes first. Segments are written to a
+    temporary name and renamed, so readers never see a partial file. Anything
+    still queued is written by close(), which also runs at interpreter exit.
+    """
+
+    def __init__(self, directory: str = AUDIT_DIR, flush_rows: int = 10_000, flush_interval: float = 5.0,
+                 compression: str = 'zstd'):
+        import pyarrow  # noqa: F401 - fail at startup rather than in the writer thread
+
+        self.directory = directory
+        self.flush_rows = flush_rows
+        self.flush_interval = flush_interval
+        self.compression = compression
+        self.rows_written = 0
+        self.segments_written = 0
+        self.errors = 0
+        os.makedirs(directory, exist_ok=True)
+        self._queue = queue.Queue()
+        self._writer = threading.Thread(target=self._run, name='audit-writer', daemon=True)
+        self._writer.start()
+        # Decisions still queued at interpreter exit are written, not dropped
+        atexit.register(self.close)
+
+    def record(self, features: dict, result: dict, model_version, source: str = 'dashboard'):
+        """Queue one make_prediction result with its nine input features."""
+        self._queue.put((time.time(), source, str(model_version), features, result))
+
+    def record_batch(self, X: pd.DataFrame, predictions: pd.DataFrame, model_version, source: str = 'batch'):
+        """Queue a scored frame: X's input features and make_prediction_batch's predictions, row-aligned."""
+        frame = X[INPUT_FEATURES].reset_index(drop=True)
+        frame[RESULT_COLUMNS] = predictions[RESULT_COLUMNS].reset_index(drop=True)
+        self._queue.put((time.time(), source, str(model_version), frame, None))
+
+    def flush(self):
+        """Block until everything queued so far is on disk."""
+        done = threading.Event()
+        self._queue.put((_FLUSH, done))
+        done.wait()
+
+    def close(self):
+        if self._writer.is_alive():
+            self._queue.put(_STOP)
+            self._writer.join()
+
+    def stats(self) -> dict:
+        return {
+            'rows_written': self.rows_written,
+            'segments_written': self.segments_written,
+            'queue_depth': self._queue.qsize(),
+            'errors': self.errors,
+        }
+
+    def _run(self):
+        pending, n_pending = [], 0
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if item is not None and item is not _STOP and item[0] is not _FLUSH:
+                pending.append(item)
+                n_pending += len(item[3]) if item[4] is None else 1
+                deadline = deadline or time.monotonic() + self.flush_interval
+
+            flush_now = item is None or item is _STOP or item[0] is _FLUSH or n_pending >= self.flush_rows
+            if flush_now and pending:
+                self._write(pending)
+                pending, n_pending, deadline = [], 0, None
+            if item is _STOP:
+                return
+            if item is not None and item is not _STOP and item[0] is _FLUSH:
+                item[1].set()
+
+    def _write(self, pending: list):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        try:
+            frames, records = [], []
+            for ts, source, version, features, result in pending:
+                if result is None:
+                    frames.append(features.assign(ts=ts, source=source, model_version=version))
+                else:
+                    records.append({**{f: features[f] for f in INPUT_FEATURES},
+                                    **{c: result[c] for c in RESULT_COLUMNS},
+                                    'ts': ts, 'source': source, 'model_version': version})
+            if records:
+                frames.append(pd.DataFrame.from_records(records))
+            table = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+
+            table['ts'] = pd.to_datetime(table['ts'], unit='s', utc=True)
+            table['request_id'] = [uuid.uuid4().hex for _ in range(len(table))]
+            for feature in INPUT_FEATURES:
+                if isinstance(table[feature].dtype, pd.CategoricalDtype):
+                    table[feature] = table[feature].astype(object)
+            table['risk_label'] = table['risk_label'].astype(str)
+            # Batch scores are float32; store the same 1-decimal percentage make_prediction returns
+            table['default_probability'] = table['default_probability'].astype(np.float64).round(1)
+
+            name = f"{table['ts'].iloc[0].strftime('%Y%m%dT%H%M%S%f')}-{uuid.uuid4().hex[:8]}.parquet"
+            tmp = os.path.join(self.directory, f'.{name}.tmp')
+            pq.write_table(pa.Table.from_pandas(table, preserve_index=False), tmp, compression=self.compression)
+            os.replace(tmp, os.path.join(self.directory, name))
+            self.rows_written += len(table)
+            self.segments_written += 1
+        except Exception as exc:
+            # The writer must survive a bad batch; the failure is counted and reported
+            self.errors += 1
+            print(f"Audit log write failed: {exc}")
+
+
+def read_log(directory: str = AUDIT_DIR, start=None, end=None, source: str = None,
+             include_shadow: bool = False) -> pd.DataFrame:
+    """
+    Load logged decisions with start <= ts < end (anything pd.Timestamp accepts; naive means UTC).
+
+    Only served decisions are returned: challenger rows (source 'shadow') are
+    left out unless `include_shadow` or asked for by `source`.
+
+    Parquet row-group statistics let pyarrow skip segments outside the range.
+    """
+    import pyarrow.dataset as ds
+
+    dataset = ds.dataset(directory, format='parquet', exclude_invalid_files=True)
+    condition = None
+    for op, bound in (('ge', start), ('lt', end)):
+        if bound is None:
+            continue
+        bound = pd.Timestamp(bound)
+        bound = bound.tz_localize('UTC') if bound.tzinfo is None else bound.tz_convert('UTC')
+        term = ds.field('ts') >= bound if op == 'ge' else ds.field('ts') < bound
+        condition = term if condition is None else condition & term
+    if source is not None:
+        term = ds.field('source') == source
+        condition = term if condition is None else condition & term
+    elif not include_shadow:
+        term = ds.field('source') != 'shadow'
+        condition = term if condition is None else condition & term
+    return dataset.to_table(filter=condition).to_pandas().sort_values('ts', ignore_index=True)
+
+
+def replay(model, log: pd.DataFrame) -> dict:
+    """
+    Re-score logged decisions with `model` in one batch and compare them with what was served.
+
+    Returns a dict with:
+        - comparison: DataFrame of request_id, ts, model_version, logged/candidate probability and prediction
+        - summary: n, mean/max absolute probability change, flip rate, approval rates, per logged version
+    """
+    features = clean_data(log[INPUT_FEATURES].copy())
+    scored = make_prediction_batch(model, features)['predictions']
+
+    comparison = pd.DataFrame({
+        'request_id': log['request_id'],
+        'ts': log['ts'],
+        'model_version': log['model_version'],
+        'logged_probability': log['default_probability'].to_numpy(),
+        'candidate_probability': scored['default_probability'].to_numpy(),
+        'logged_prediction': log['prediction'].to_numpy(),
+        'candidate_prediction': scored['prediction'].to_numpy(),
+    })
+    delta = np.abs(comparison['candidate_probability'] - comparison['logged_probability'])
+    flipped = comparison['candidate_prediction'] != comparison['logged_prediction']
+    by_version = comparison.assign(delta=delta, flipped=flipped).groupby('model_version').agg(
+        n=('delta', 'size'), mean_abs_change=('delta', 'mean'), flip_rate=('flipped', 'mean'),
+    )
+    summary = {
+        'n': len(comparison),
+        'mean_abs_change': round(float(delta.mean()), 4) if len(delta) else 0.0,
+        'max_abs_change': round(float(delta.max()), 4) if len(delta) else 0.0,
+        'flip_rate': round(float(flipped.mean()), 4) if len(flipped) else 0.0,
+        'logged_approval_rate': round(float((comparison['logged_prediction'] == 0).mean()), 4) if len(flipped) else 0.0,
+        'candidate_approval_rate': round(float((comparison['candidate_prediction'] == 0).mean()), 4) if len(flipped) else 0.0,
+        'by_version': by_version.round(4).to_dict(orient='index'),
+    }
+    return {'comparison': comparison, 'summary': summary}
+
+
+def load_model(path: str):
+    """Load an artifact directory as a CompiledModel, or anything else with joblib."""
+    if os.path.isdir(path):
+        from src.artifact import load_artifact
+
+        return load_artifact(path)
+    import joblib
+
+    return joblib.load(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay logged decisions against a candidate model.')
+    parser.add_argument('model', help='candidate artifact directory or pickled pipeline')
+    parser.add_argument('--log-dir', default=AUDIT_DIR)
+    parser.add_argument('--start', help='inclusive lower bound on the decision time, e.g. 2026-10-01')
+    parser.add_argument('--end', help='exclusive upper bound on the decision time')
+    parser.add_argument('--source', help='only replay decisions from this source (dashboard, service, shadow, ...)')
+    parser.add_argument('--include-shadow', action='store_true',
+                        help='also replay the challenger rows shadow scoring logged (excluded by default)')
+    parser.add_argument('--output', help='write the per-decision comparison to this Parquet file')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    log = read_log(args.log_dir, args.start, args.end, args.source, args.include_shadow)
+    result = replay(load_model(args.model), log)
+    summary = result['summary']
+    print(f"Replayed {summary['n']:,} decisions in {time.perf_counter() - start:.2f}s")
+    print(f"  Mean |Δ default probability| : {summary['mean_abs_change']:.2f} pts "
+          f"(max {summary['max_abs_change']:.1f})")
+    print(f"  Decision flips               : {summary['flip_rate']:.2%}")
+    print(f"  Approval rate                : {summary['logged_approval_rate']:.1%} logged → "
+          f"{summary['candidate_approval_rate']:.1%} candidate")
+    for version, row in summary['by_version'].items():
+        print(f"    {version}: {row['n']:,} decisions, flip rate {row['flip_rate']:.2%}")
+    if args.output:
+        result['comparison'].to_parquet(args.output, index=False)
+        print(f"Comparison written → {args.output}")
+
+
+if __name__ == '__main__':
+    main()
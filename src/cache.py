@@ -0,0 +1,200 @@
+# ABOUTME: On-disk cache of cleaned data, train/test splits and preprocessed CV fold matrices.
+# ABOUTME: Provides FeatureCache plus cached_split() and cached_folds() used by run_training.py and notebooks.
+
+import hashlib
+import json
+import os
+import shutil
+import time
+import uuid
+
+import numpy as np
+import pandas as pd
+
+from src import instrument
+from src.data import SCHEMA, load_data
+from src.features import CATEGORICAL_FEATURES, NUMERIC_FEATURES
+from src.preprocess import build_preprocessor, split_data
+from src.search import build_fold_cache
+
+CACHE_DIR = os.path.join('.cache', 'features')
+DEFAULT_MAX_BYTES = 2 * 1024 ** 3
+FOLD_FIELDS = ['X_train', 'y_train', 'X_val', 'y_val', 'val_index']
+
+# Bump when the on-disk layout or the meaning of a cached artifact changes
+CACHE_VERSION = 1
+
+
+def _file_digest(path: str, block_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _dir_size(path: str) -> int:
+    return sum(os.path.getsize(os.path.join(d, f)) for d, _, files in os.walk(path) for f in files)
+
+
+class FeatureCache:
+    """
+    Content-addressed cache directory with one entry per dataset fingerprint.
+
+    Arrays are stored as .npy files and opened with mmap_mode='r', so a hit
+    costs a few page faults rather than a full read. Entries are evicted
+    least-recently-used first once the cache grows past `max_bytes`.
+    """
+
+    def __init__(self, root: str = CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def fingerprint(self, data_path: str, **params) -> str:
+        """Hash the input file, the feature lists, the preprocessor and any split parameters."""
+        spec = {
+            'version': CACHE_VERSION,
+            'data': _file_digest(data_path),
+            'numeric': NUMERIC_FEATURES,
+            'categorical': CATEGORICAL_FEATURES,
+            'schema': {column: str(dtype) for column, dtype in SCHEMA.items()},
+            'preprocessor': repr(build_preprocessor()),
+            'params': params,
+        }
+        return hashlib.sha256(json.dumps(spec, sort_keys=True, default=str).encode()).hexdigest()[:24]
+
+    def _path(self, key: str, name: str) -> str:
+        return os.path.join(self.root, key, name)
+
+    def _touch(self, key: str):
+        with open(os.path.join(self.root, key, 'last_used'), 'w') as f:
+            f.write(str(time.time()))
+
+    def get_arrays(self, key: str, name: str):
+        """Return {field: memory-mapped array} and the stored metadata, or None on a miss."""
+        path = self._path(key, name)
+        if not os.path.isdir(path):
+            self.misses += 1
+            instrument.emit('cache', key=key, name=name, hit=False)
+            return None
+        with open(os.path.join(path, 'meta.json')) as f:
+            meta = json.load(f)
+        arrays = {field: np.load(os.path.join(path, f'{i}.npy'), mmap_mode='r')
+                  for i, field in enumerate(meta['fields'])}
+        self.hits += 1
+        self._touch(key)
+        instrument.emit('cache', key=key, name=name, hit=True)
+        return arrays, meta.get('extra', {})
+
+    def put_arrays(self, key: str, name: str, arrays: dict, extra: dict = None):
+        """Write arrays into a temporary directory and rename it into place."""
+        tmp = os.path.join(self.root, key, f'.tmp-{name}-{uuid.uuid4().hex}')
+        os.makedirs(tmp)
+        for i, array in enumerate(arrays.values()):
+            np.save(os.path.join(tmp, f'{i}.npy'), np.ascontiguousarray(array))
+        with open(os.path.join(tmp, 'meta.json'), 'w') as f:
+            json.dump({'fields': list(arrays), 'extra': extra or {}}, f)
+        try:
+            os.rename(tmp, self._path(key, name))
+        except OSError:
+            # Another process stored the same entry first
+            shutil.rmtree(tmp, ignore_errors=True)
+        self._touch(key)
+        self.evict(keep=key)
+
+    def get_frame(self, key: str, name: str):
+        stored = self.get_arrays(key, name)
+        if stored is None:
+            return None
+        arrays, extra = stored
+        columns = {}
+        for column in extra['columns']:
+            values = arrays[column]
+            if column in extra['categories']:
+                values = pd.Categorical.from_codes(values, dtype=SCHEMA[column])
+            elif column in extra.get('nullable', []):
+                values = pd.arrays.IntegerArray(np.asarray(values), np.asarray(arrays[f'{column}__mask']))
+            columns[column] = values
+        return pd.DataFrame(columns, index=pd.Index(arrays['__index__']))
+
+    def put_frame(self, key: str, name: str, df: pd.DataFrame):
+        arrays = {'__index__': df.index.to_numpy()}
+        categories, nullable = [], []
+        for column in df.columns:
+            dtype = df[column].dtype
+            if isinstance(dtype, pd.CategoricalDtype):
+                arrays[column] = df[column].cat.codes.to_numpy()
+                categories.append(column)
+            elif pd.api.types.is_extension_array_dtype(dtype) and dtype.kind in 'iu':
+                # Nullable integers are stored as their values plus a missing-value mask
+                arrays[column] = df[column].to_numpy(dtype=dtype.numpy_dtype, na_value=0)
+                arrays[f'{column}__mask'] = df[column].isna().to_numpy()
+                nullable.append(column)
+            else:
+                arrays[column] = df[column].to_numpy()
+        self.put_arrays(key, name, arrays, {'columns': list(df.columns), 'categories': categories,
+                                            'nullable': nullable})
+
+    def evict(self, keep: str = None):
+        """Delete least-recently-used entries until the cache fits in max_bytes."""
+        if not os.path.isdir(self.root):
+            return
+        entries = []
+        for key in os.listdir(self.root):
+            path = os.path.join(self.root, key)
+            marker = os.path.join(path, 'last_used')
+            last_used = os.path.getmtime(marker) if os.path.exists(marker) else 0.0
+            entries.append((last_used, key, _dir_size(path)))
+
+        total = sum(size for _, _, size in entries)
+        for _, key, size in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            shutil.rmtree(os.path.join(self.root, key), ignore_errors=True)
+            total -= size
+
+
+def cached_split(cache: FeatureCache, data_path: str, test_size: float = 0.2, random_state: int = 42):
+    """
+    Return (key, X_train, X_test, y_train, y_test), reading the cleaned frame and
+    split positions from the cache when the file and parameters are unchanged.
+    """
+    key = cache.fingerprint(data_path, test_size=test_size, random_state=random_state)
+
+    df = cache.get_frame(key, 'clean')
+    split = cache.get_arrays(key, 'split')
+    if df is None or split is None:
+        df = load_data(data_path)
+        X_train, X_test, y_train, y_test = split_data(df, test_size=test_size, random_state=random_state)
+        cache.put_frame(key, 'clean', df)
+        cache.put_arrays(key, 'split', {
+            'train': df.index.get_indexer(X_train.index),
+            'test': df.index.get_indexer(X_test.index),
+        })
+        return key, X_train, X_test, y_train, y_test
+
+    positions, _ = split
+    y = df.pop('Risk')
+    train, test = np.asarray(positions['train']), np.asarray(positions['test'])
+    return key, df.iloc[train], df.iloc[test], y.iloc[train], y.iloc[test]
+
+
+def cached_folds(cache: FeatureCache, key: str, X_train: pd.DataFrame, y_train: pd.Series, cv: int = 5) -> list:
+    """Return build_fold_cache() output for this split, memory-mapped from disk on a hit."""
+    name = f'folds-cv{cv}'
+    stored = cache.get_arrays(key, name)
+    if stored is not None:
+        arrays, extra = stored
+        return [{field: arrays[f'{i}_{field}'] for field in FOLD_FIELDS} for i in range(extra['n_folds'])]
+
+    folds = build_fold_cache(X_train, y_train, cv=cv)
+    cache.put_arrays(
+        key, name,
+        {f'{i}_{field}': fold[field] for i, fold in enumerate(folds) for field in FOLD_FIELDS},
+        {'n_folds': len(folds)},
+    )
+    return folds
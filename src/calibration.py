@@ -0,0 +1,77 @@
+# ABOUTME: Probability calibration fitted on out-of-fold predictions and stored as a piecewise-linear lookup table.
+# ABOUTME: Provides Calibrator, fit_calibrator() (isotonic or Platt) and reliability() metrics for evaluate_model.
+
+import numpy as np
+
+CALIBRATION_METHODS = ('isotonic', 'platt')
+
+# Platt curves are tabulated on a grid that is uniform in log-odds, so it is dense near 0 and 1
+PLATT_GRID = np.r_[0.0, 1.0 / (1.0 + np.exp(-np.linspace(-10, 10, 201))), 1.0]
+
+
+def _logit(proba: np.ndarray) -> np.ndarray:
+    proba = np.clip(proba, 1e-7, 1 - 1e-7)
+    return np.log(proba / (1 - proba))
+
+
+class Calibrator:
+    """Maps raw P(bad) to calibrated P(bad) by linear interpolation over (x, y) knots."""
+
+    def __init__(self, x, y, method: str):
+        self.x = np.asarray(x, dtype=np.float64)
+        self.y = np.asarray(y, dtype=np.float64)
+        self.method = method
+
+    def __call__(self, proba) -> np.ndarray:
+        return np.interp(proba, self.x, self.y)
+
+    def to_dict(self) -> dict:
+        return {'method': self.method, 'x': self.x.tolist(), 'y': self.y.tolist()}
+
+    @classmethod
+    def from_dict(cls, spec: dict) -> 'Calibrator':
+        return cls(spec['x'], spec['y'], spec['method'])
+
+
+def fit_calibrator(y_true, proba, method: str = 'isotonic') -> Calibrator:
+    """Fit an isotonic or Platt (logistic on log-odds) calibration map from held-out probabilities."""
+    from sklearn.isotonic import IsotonicRegression
+    from sklearn.linear_model import LogisticRegression
+
+    y_true = np.asarray(y_true)
+    proba = np.asarray(proba, dtype=np.float64)
+    if method == 'isotonic':
+        iso = IsotonicRegression(y_min=0.0, y_max=1.0, out_of_bounds='clip').fit(proba, y_true)
+        return Calibrator(iso.X_thresholds_, iso.y_thresholds_, method)
+    if method == 'platt':
+        platt = LogisticRegression(C=1e6).fit(_logit(proba)[:, None], y_true)
+        return Calibrator(PLATT_GRID, platt.predict_proba(_logit(PLATT_GRID)[:, None])[:, 1], method)
+    raise ValueError(f"Unknown calibration method {method!r}; choose from {CALIBRATION_METHODS}")
+
+
+def reliability(y_true, proba, n_bins: int = 10) -> dict:
+    """
+    Calibration quality of P(bad) predictions.
+
+    Returns brier, log_loss, ece (expected calibration error over equal-width
+    bins) and bins: per-bin count, mean predicted and observed default rate.
+    """
+    y_true = np.asarray(y_true, dtype=np.float64)
+    proba = np.asarray(proba, dtype=np.float64)
+    bins = np.minimum((proba * n_bins).astype(int), n_bins - 1)
+    count = np.bincount(bins, minlength=n_bins)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        predicted = np.bincount(bins, weights=proba, minlength=n_bins) / count
+        observed = np.bincount(bins, weights=y_true, minlength=n_bins) / count
+    filled = count > 0
+    clipped = np.clip(proba, 1e-15, 1 - 1e-15)
+    return {
+        'brier': float(np.mean((proba - y_true) ** 2)),
+        'log_loss': float(-np.mean(y_true * np.log(clipped) + (1 - y_true) * np.log(1 - clipped))),
+        'ece': float(np.sum(count[filled] * np.abs(predicted[filled] - observed[filled])) / len(proba)),
+        'bins': {
+            'count': count.tolist(),
+            'predicted': np.where(filled, predicted, np.nan).round(4).tolist(),
+            'observed': np.where(filled, observed, np.nan).round(4).tolist(),
+        },
+    }
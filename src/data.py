@@ -1,21 +1,154 @@
-# ABOUTME: Handles loading and initial cleaning of the German credit dataset.
-# ABOUTME: Provides load_data() which returns a clean DataFrame ready for preprocessing.
+# ABOUTME: Handles loading and initial cleaning of the German credit dataset with an explicit column schema.
+# ABOUTME: Provides load_data() which returns a clean DataFrame, and iter_data_chunks() for streaming files.
 
+import os
+import warnings
+
+import numpy as np
 import pandas as pd
+from pandas.api.types import CategoricalDtype, is_numeric_dtype
 
+from src import instrument
+
+ACCOUNT_LEVELS = ['little', 'moderate', 'quite rich', 'rich', 'unknown']
+
+# Narrow nullable integer dtypes for the numeric columns (missing values stay
+# missing) and fixed categories for the text columns. Values outside a
+# category list become missing, which the one-hot encoder treats the same way
+# as any other unseen category; clean_data() reports them.
+SCHEMA = {
+    'Age': 'UInt8',
+    'Sex': CategoricalDtype(['female', 'male']),
+    'Job': 'Int8',
+    'Housing': CategoricalDtype(['free', 'own', 'rent']),
+    'Saving accounts': CategoricalDtype(ACCOUNT_LEVELS),
+    'Checking account': CategoricalDtype(ACCOUNT_LEVELS),
+    'Credit amount': 'Int32',
+    'Duration': 'Int16',
+    'Purpose': CategoricalDtype([
+        'business', 'car', 'domestic appliances', 'education',
+        'furniture/equipment', 'radio/TV', 'repairs', 'vacation/others',
+    ]),
+}
+
+# Parsing the label as a categorical makes its codes the encoded target: good=0, bad=1
+RISK_DTYPE = CategoricalDtype(['good', 'bad'])
+
+NA_VALUES = ['', 'NA', 'N/A', 'NaN', 'nan', 'null']
+
+NUMERIC_COLUMNS = [column for column, dtype in SCHEMA.items() if not isinstance(dtype, CategoricalDtype)]
+
+# Numerics are left for the parser to infer and text is read as plain
+# categoricals; clean_data() then range-checks and narrows the numerics and
+# reports values outside the schema. Parsing straight into UInt8 would
+# silently wrap 300 to 44.
+CSV_OPTIONS = {
+    'usecols': lambda column: column != 'Unnamed: 0',
+    'dtype': {
+        **{column: 'category' for column in SCHEMA if column not in NUMERIC_COLUMNS},
+        'Risk': RISK_DTYPE,
+    },
+    'na_values': NA_VALUES,
+    'keep_default_na': False,
+}
+
+
+def _is_parquet(path: str) -> bool:
+    return os.path.splitext(path)[1].lower() in ('.parquet', '.pq')
+
+
+def _narrow(values: pd.Series, dtype: str) -> pd.Series:
+    """Cast a numeric column to its nullable schema dtype, refusing values it cannot hold."""
+    try:
+        numbers = pd.to_numeric(values)
+    except (TypeError, ValueError) as exc:
+        raise ValueError(f"{values.name}: {exc}") from exc
+    limits = np.iinfo(pd.api.types.pandas_dtype(dtype).numpy_dtype)
+    bad = numbers.notna() & ((numbers < limits.min) | (numbers > limits.max) | (numbers % 1 != 0))
+    if bad.any():
+        raise ValueError(
+            f"{values.name}: {int(bad.sum()):,} value(s) are not whole numbers in "
+            f"[{limits.min}, {limits.max}], e.g. {numbers[bad].head(3).tolist()}"
+        )
+    return numbers.astype(dtype)
 
-def load_data(path: str) -> pd.DataFrame:
-    """Load the German credit CSV and apply basic cleaning."""
-    df = pd.read_csv(path)
 
+def _recode(values: pd.Series, dtype: CategoricalDtype) -> tuple:
+    """Return (column with the schema categories, {unknown value: count})."""
+    if not isinstance(values.dtype, CategoricalDtype):
+        values = values.astype('category')
+    counts = values.value_counts()
+    unknown = {
+        category: int(counts[category]) for category in values.cat.categories
+        if category not in dtype.categories and category not in NA_VALUES and counts[category]
+    }
+    return values.cat.set_categories(dtype.categories).astype(dtype), unknown
+
+
+def clean_data(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Apply the dataset schema and cleaning rules in place and return the frame.
+
+    Raises ValueError for numeric values the schema cannot hold. Category values
+    outside the schema become missing; they are counted per column in
+    `df.attrs['unknown_categories']` and reported with a warning.
+    """
     if 'Unnamed: 0' in df.columns:
         df.drop('Unnamed: 0', axis=1, inplace=True)
 
-    # Fill missing/NA-string values with 'unknown' for account columns
-    df['Saving accounts'] = df['Saving accounts'].replace('NA', 'unknown').fillna('unknown')
-    df['Checking account'] = df['Checking account'].replace('NA', 'unknown').fillna('unknown')
+    # No-op for columns already in the schema dtype (e.g. cached frames)
+    unknown = {}
+    for column, dtype in SCHEMA.items():
+        if column not in df.columns or df[column].dtype == dtype:
+            continue
+        if isinstance(dtype, CategoricalDtype):
+            df[column], found = _recode(df[column], dtype)
+            if found:
+                unknown[column] = found
+        else:
+            df[column] = _narrow(df[column], dtype)
+    if unknown:
+        df.attrs['unknown_categories'] = unknown
+        details = '; '.join(f"{column}: {', '.join(map(repr, found))}" for column, found in unknown.items())
+        warnings.warn(f"Values outside the schema were treated as missing ({details})", stacklevel=2)
+
+    # Missing account levels mean 'unknown'; on categoricals this only touches the codes
+    df['Saving accounts'] = df['Saving accounts'].fillna('unknown')
+    df['Checking account'] = df['Checking account'].fillna('unknown')
+
+    # Encode target: bad=1, good=0 (scoring files may not carry a label)
+    if 'Risk' in df.columns and not is_numeric_dtype(df['Risk']):
+        risk = df['Risk'].astype(RISK_DTYPE).cat.codes
+        df['Risk'] = risk if (risk >= 0).all() else risk.where(risk >= 0)
+
+    return df
 
-    # Encode target: bad=1, good=0
-    df['Risk'] = df['Risk'].map({'bad': 1, 'good': 0})
 
+def load_data(path: str) -> pd.DataFrame:
+    """Load the German credit CSV (or Parquet) file and apply basic cleaning."""
+    with instrument.stage('load_data', path=path) as s:
+        # Stream chunks so only one is ever held with wide or untyped columns
+        df = pd.concat(iter_data_chunks(path), ignore_index=True)
+        s.set(rows=len(df))
     return df
+
+
+def iter_data_chunks(path: str, chunksize: int = 100_000):
+    """
+    Yield cleaned DataFrames of at most `chunksize` rows from a CSV or Parquet file.
+
+    Parquet files are streamed by record batch and need pyarrow installed.
+    Either way the row index continues across chunks, as it would in one frame.
+    """
+    if _is_parquet(path):
+        import pyarrow.parquet as pq
+
+        offset = 0
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize):
+            chunk = batch.to_pandas()
+            chunk.index = pd.RangeIndex(offset, offset + len(chunk))
+            offset += len(chunk)
+            yield clean_data(chunk)
+    else:
+        for chunk in pd.read_csv(path, chunksize=chunksize, **CSV_OPTIONS):
+            yield clean_data(chunk)
@@ -0,0 +1,123 @@
+# ABOUTME: Uncertainty estimates for model metrics: vectorized bootstrap CIs and parallel repeated stratified CV.
+# ABOUTME: Provides bootstrap_ci() over one set of test predictions and repeated_cv() on a process pool.
+
+import time
+
+import numpy as np
+from joblib import Parallel, delayed
+from sklearn.base import clone
+from sklearn.metrics import accuracy_score, recall_score, roc_auc_score
+from sklearn.model_selection import RepeatedStratifiedKFold, StratifiedKFold, cross_val_predict
+
+from src import instrument
+from src.calibration import fit_calibrator
+from src.predict import DEFAULT_THRESHOLD
+
+CI_METRICS = ('accuracy', 'roc_auc', 'recall')
+
+
+def _summarize(samples: np.ndarray, alpha: float) -> dict:
+    low, high = np.nanpercentile(samples, [100 * alpha / 2, 100 * (1 - alpha / 2)])
+    return {
+        'mean': float(np.nanmean(samples)),
+        'std': float(np.nanstd(samples)),
+        'ci_low': float(low),
+        'ci_high': float(high),
+    }
+
+
+def _bootstrap_block(y_sorted, correct_sorted, hit_sorted, starts, counts) -> np.ndarray:
+    """Metrics for a (B, n) block of resample counts over score-sorted observations; returns (B, 3)."""
+    n = counts.shape[1]
+    accuracy = counts @ correct_sorted / n
+    with np.errstate(invalid='ignore', divide='ignore'):
+        recall = (counts @ hit_sorted) / (counts @ y_sorted)
+
+        # Mann-Whitney AUC on weighted tie groups: each positive beats the negatives
+        # in lower groups and half-beats the negatives sharing its score
+        pos = np.add.reduceat(counts * y_sorted, starts, axis=1)
+        neg = np.add.reduceat(counts * (1 - y_sorted), starts, axis=1)
+        below = np.cumsum(neg, axis=1) - neg
+        auc = (pos * (below + 0.5 * neg)).sum(axis=1) / (pos.sum(axis=1) * neg.sum(axis=1))
+    return np.column_stack([accuracy, auc, recall])
+
+
+def bootstrap_ci(y_true, y_prob, n_resamples: int = 2000, alpha: float = 0.05,
+                 threshold: float = DEFAULT_THRESHOLD, random_state: int = 42, block_size: int = 500) -> dict:
+    """
+    Bootstrap confidence intervals for accuracy, ROC-AUC and recall from one set of predictions.
+
+    Each resample is a row of multinomial counts over the test rows, so all
+    metrics are weighted sums over a single sorted copy of the predictions; the
+    model is never re-run. Resamples are processed `block_size` at a time to
+    bound memory on large test sets.
+
+    Returns {metric: {mean, std, ci_low, ci_high}} plus n_resamples and alpha.
+    """
+    y_true = np.asarray(y_true, dtype=np.float64)
+    y_prob = np.asarray(y_prob)
+    order = np.argsort(y_prob, kind='stable')
+    y_sorted, prob_sorted = y_true[order], y_prob[order]
+    predicted = (prob_sorted > threshold).astype(np.float64)
+    correct_sorted = (predicted == y_sorted).astype(np.float64)
+    hit_sorted = predicted * y_sorted
+    starts = np.flatnonzero(np.r_[True, np.diff(prob_sorted) != 0])
+
+    rng = np.random.default_rng(random_state)
+    n = len(y_true)
+    uniform = np.full(n, 1.0 / n)
+    blocks = []
+    for done in range(0, n_resamples, block_size):
+        counts = rng.multinomial(n, uniform, size=min(block_size, n_resamples - done)).astype(np.float64)
+        blocks.append(_bootstrap_block(y_sorted, correct_sorted, hit_sorted, starts, counts))
+    samples = np.vstack(blocks)
+
+    result = {name: _summarize(samples[:, i], alpha) for i, name in enumerate(CI_METRICS)}
+    result.update(n_resamples=n_resamples, alpha=alpha)
+    return result
+
+
+def _fit_fold(model, X, y, train_index, val_index, threshold: float, calibration: str = None,
+              inner_splits: int = 5) -> tuple:
+    X_train, y_train = X.iloc[train_index], y.iloc[train_index]
+    fitted = clone(model).fit(X_train, y_train)
+    y_val = y.iloc[val_index]
+    y_prob = fitted.predict_proba(X.iloc[val_index])[:, 1]
+    if calibration is not None:
+        # Calibrate as train_model does: on out-of-fold predictions of this fold's training rows
+        inner = StratifiedKFold(n_splits=inner_splits, shuffle=True, random_state=0)
+        oof = cross_val_predict(clone(model), X_train, y_train, cv=inner, method='predict_proba')[:, 1]
+        y_prob = fit_calibrator(y_train, oof, calibration)(y_prob)
+    y_pred = (y_prob > threshold).astype(int)
+    return accuracy_score(y_val, y_pred), roc_auc_score(y_val, y_prob), recall_score(y_val, y_pred)
+
+
+def repeated_cv(model, X, y, n_splits: int = 5, n_repeats: int = 3, alpha: float = 0.05,
+                n_jobs: int = -1, threshold: float = DEFAULT_THRESHOLD, random_state: int = 42,
+                calibration: str = None) -> dict:
+    """
+    Refit an unfitted clone of `model` on repeated stratified K-fold splits, one fold per worker process.
+
+    `threshold` applies to calibrated probabilities when `calibration` names a
+    src.calibration method: each fold then fits its own calibrator on inner
+    out-of-fold predictions of its training rows, as train_model does, so the
+    fold scores are on the same scale as the served ones.
+
+    Returns {metric: {mean, std, ci_low, ci_high}} over the n_splits * n_repeats
+    fold scores, plus n_fits and elapsed_s.
+    """
+    splitter = RepeatedStratifiedKFold(n_splits=n_splits, n_repeats=n_repeats, random_state=random_state)
+    # One booster thread per process so the pool does not oversubscribe the CPUs
+    model = clone(model).set_params(classifier__n_jobs=1)
+
+    start = time.perf_counter()
+    with instrument.stage('repeated_cv', splits=n_splits, repeats=n_repeats) as s:
+        scores = np.array(Parallel(n_jobs=n_jobs, prefer='processes')(
+            delayed(_fit_fold)(model, X, y, train_index, val_index, threshold, calibration)
+            for train_index, val_index in splitter.split(X, y)
+        ))
+        s.set(n_fits=len(scores))
+
+    result = {name: _summarize(scores[:, i], alpha) for i, name in enumerate(CI_METRICS)}
+    result.update(n_fits=len(scores), elapsed_s=time.perf_counter() - start)
+    return result
@@ -0,0 +1,174 @@
+# ABOUTME: Compiles a fitted preprocessor + XGBoost pipeline into NumPy lookup tables and a bare booster.
+# ABOUTME: Provides compile_pipeline() and CompiledModel, which scores dicts and records without pandas.
+
+import numpy as np
+
+from src.predict import DEFAULT_THRESHOLD, decision_threshold, predict_default_proba
+
+
+class CompiledModel:
+    """
+    Drop-in replacement for the fitted pipeline's predict_proba.
+
+    Numeric features are scaled with per-feature mean/scale arrays and each
+    categorical value is looked up in a dict that maps it to its one-hot
+    column. Categories dropped by `drop='first'` or unseen at fit time have
+    no entry and leave every column of that feature at zero, exactly as
+    OneHotEncoder(handle_unknown='ignore') does. `decision_threshold` is the
+    P(bad) cutoff applied by predict and make_prediction, and `calibrator` an
+    optional src.calibration.Calibrator applied on top of predict_proba.
+    `profile` is the src.monitor reference profile of the training data, if any.
+    With a src.lookup.ScoreTable as `score_table`, predict_proba answers from
+    the table and only runs the booster for the rows the table misses.
+    """
+
+    def __init__(self, numeric_features, mean, scale, categorical_features, category_index, n_columns, booster,
+                 iteration_range=(0, 0), version: str = None, decision_threshold: float = DEFAULT_THRESHOLD,
+                 calibrator=None, profile: dict = None, score_table=None):
+        self.numeric_features = list(numeric_features)
+        self.mean = np.asarray(mean, dtype=np.float64)
+        self.scale = np.asarray(scale, dtype=np.float64)
+        self.categorical_features = list(categorical_features)
+        self.category_index = [dict(lut) for lut in category_index]
+        self.n_columns = int(n_columns)
+        self.booster = booster
+        self.iteration_range = tuple(iteration_range)
+        self.version = version
+        self.decision_threshold = float(decision_threshold)
+        self.calibrator = calibrator
+        self.profile = profile
+        self.score_table = score_table
+
+    @property
+    def input_features(self) -> list:
+        return self.numeric_features + self.categorical_features
+
+    def transform(self, X) -> np.ndarray:
+        """Encode a dict, list of dicts, record array or DataFrame into the model's design matrix."""
+        if isinstance(X, dict) and not _is_columnar(X):
+            return self._transform_one(X)
+
+        columns = _as_columns(X, self.input_features)
+        n_rows = len(next(iter(columns.values())))
+        out = np.zeros((n_rows, self.n_columns), dtype=np.float32)
+
+        numeric = np.column_stack([np.asarray(columns[f], dtype=np.float64) for f in self.numeric_features])
+        out[:, :len(self.numeric_features)] = (numeric - self.mean) / self.scale
+
+        for feature, lut in zip(self.categorical_features, self.category_index):
+            values = np.asarray(columns[feature])
+            for category, col in lut.items():
+                out[values == category, col] = 1.0
+        return out
+
+    def _transform_one(self, record: dict) -> np.ndarray:
+        row = np.zeros((1, self.n_columns), dtype=np.float32)
+        k = len(self.numeric_features)
+        row[0, :k] = (np.array([record[f] for f in self.numeric_features], dtype=np.float64) - self.mean) / self.scale
+        for feature, lut in zip(self.categorical_features, self.category_index):
+            col = lut.get(record[feature])
+            if col is not None:
+                row[0, col] = 1.0
+        return row
+
+    def predict_proba(self, X) -> np.ndarray:
+        """Return an (n, 2) array of [P(good), P(bad)], matching XGBClassifier.predict_proba."""
+        if self.score_table is not None:
+            default_prob = self._lookup(X)
+        else:
+            default_prob = self.booster.inplace_predict(self.transform(X), iteration_range=self.iteration_range)
+        return np.column_stack([1.0 - default_prob, default_prob])
+
+    def _lookup(self, X) -> np.ndarray:
+        if isinstance(X, dict) and not _is_columnar(X):
+            return self._lookup_one(X)
+        columns = _as_columns(X, self.input_features)
+        if len(next(iter(columns.values()))) == 1:
+            return self._lookup_one({f: values[0] for f, values in columns.items()})
+        default_prob, hit = self.score_table.lookup(columns, self.decision_threshold, self.calibrator)
+        miss = np.flatnonzero(~hit)
+        if len(miss):
+            rest = {f: np.asarray(values)[miss] for f, values in columns.items()}
+            default_prob[miss] = self.booster.inplace_predict(self.transform(rest), iteration_range=self.iteration_range)
+        return default_prob
+
+    def _lookup_one(self, record: dict) -> np.ndarray:
+        default_prob = self.score_table.lookup_one(record, self.decision_threshold, self.calibrator)
+        if default_prob is None:
+            return self.booster.inplace_predict(self._transform_one(record), iteration_range=self.iteration_range)
+        return np.array([default_prob])
+
+    def predict(self, X) -> np.ndarray:
+        return (predict_default_proba(self, X) > self.decision_threshold).astype(np.int64)
+
+
+def _is_columnar(record: dict) -> bool:
+    return any(isinstance(v, (list, tuple, np.ndarray)) for v in record.values())
+
+
+def _as_columns(X, features: list) -> dict:
+    """Return {feature: array-like} for DataFrames, record arrays, dicts of lists or lists of dicts."""
+    if hasattr(X, 'columns'):
+        return {f: X[f].to_numpy() for f in features}
+    if isinstance(X, (list, tuple)):
+        return {f: [record[f] for record in X] for f in features}
+    return {f: X[f] for f in features}
+
+
+def _iteration_range(classifier) -> tuple:
+    # XGBClassifier only limits the trees used when early stopping recorded a best iteration
+    try:
+        return 0, classifier.best_iteration + 1
+    except AttributeError:
+        return 0, 0
+
+
+def compile_pipeline(pipeline) -> CompiledModel:
+    """Export a fitted ('preprocessor', 'classifier') pipeline into a CompiledModel."""
+    classifier = pipeline.named_steps['classifier']
+    compiled = compile_preprocessor(
+        pipeline.named_steps['preprocessor'], classifier.get_booster(), _iteration_range(classifier),
+    )
+    compiled.decision_threshold = decision_threshold(pipeline)
+    compiled.calibrator = getattr(pipeline, 'calibrator', None)
+    compiled.profile = getattr(pipeline, 'profile', None)
+    compiled.score_table = getattr(pipeline, 'score_table', None)
+    return compiled
+
+
+def compile_preprocessor(preprocessor, booster, iteration_range=(0, 0)) -> CompiledModel:
+    """Export a fitted ColumnTransformer plus a trained xgboost.Booster into a CompiledModel."""
+    # Imported here so that loading a saved CompiledModel never pulls in sklearn
+    from sklearn.preprocessing import OneHotEncoder, StandardScaler
+
+    numeric_features, mean, scale = [], [], []
+    categorical_features, category_index = [], []
+    offset = 0
+    for name, transformer, features in preprocessor.transformers_:
+        if name == 'remainder' and transformer == 'drop':
+            continue
+        if isinstance(transformer, StandardScaler):
+            if offset != len(numeric_features):
+                raise ValueError("StandardScaler columns must come before the one-hot columns")
+            numeric_features.extend(features)
+            mean.extend(transformer.mean_ if transformer.mean_ is not None else np.zeros(len(features)))
+            scale.extend(transformer.scale_ if transformer.scale_ is not None else np.ones(len(features)))
+            offset += len(features)
+        elif isinstance(transformer, OneHotEncoder):
+            drop_idx = transformer.drop_idx_ if transformer.drop_idx_ is not None else [None] * len(features)
+            for feature, categories, dropped in zip(features, transformer.categories_, drop_idx):
+                lut = {}
+                for i, category in enumerate(categories):
+                    if i == dropped:
+                        continue
+                    lut[category.item() if hasattr(category, 'item') else category] = offset
+                    offset += 1
+                categorical_features.append(feature)
+                category_index.append(lut)
+        else:
+            raise ValueError(f"Cannot compile transformer {name!r} of type {type(transformer).__name__}")
+
+    return CompiledModel(
+        numeric_features, mean, scale, categorical_features, category_index, offset,
+        booster, iteration_range,
+    )
@@ -0,0 +1,6 @@
+# ABOUTME: Names of the applicant input features, shared by training, inference and monitoring.
+# ABOUTME: Kept free of sklearn imports so light modules (prediction cache, service, app) load fast.
+
+NUMERIC_FEATURES = ['Age', 'Credit amount', 'Duration']
+CATEGORICAL_FEATURES = ['Sex', 'Job', 'Housing', 'Saving accounts', 'Checking account', 'Purpose']
+INPUT_FEATURES = NUMERIC_FEATURES + CATEGORICAL_FEATURES
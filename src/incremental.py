@@ -0,0 +1,188 @@
+# ABOUTME: Warm-start retraining on daily deltas of labelled loans without a hyperparameter search.
+# ABOUTME: Provides check_drift() and incremental_update(), which continue boosting the saved booster.
+
+import copy
+import json
+
+import numpy as np
+import pandas as pd
+from sklearn.metrics import roc_auc_score
+from sklearn.model_selection import train_test_split
+from xgboost import XGBClassifier
+
+from src import instrument
+from src.calibration import fit_calibrator
+from src.decision import COST_FN, COST_FP, choose_threshold
+from src.features import CATEGORICAL_FEATURES, NUMERIC_FEATURES
+from src.monitor import build_profile
+from src.predict import calibrate, predict_default_proba
+
+# Drift limits beyond which a delta triggers a full re-search instead of a warm start
+MAX_MEAN_SHIFT = 0.5        # |new mean - old mean| in units of the training std
+MAX_UNSEEN_RATE = 0.05      # share of delta rows with a category the encoder never saw
+MAX_AUC_DROP = 0.05         # holdout ROC-AUC below the stored baseline
+
+
+def check_drift(model, X_new: pd.DataFrame, y_new: pd.Series = None, baseline_auc: float = None) -> dict:
+    """
+    Compare a delta against the statistics the fitted pipeline was trained on.
+
+    Returns a dict with mean_shift (per numeric feature), unseen_rate (per
+    categorical feature), auc (of the current model on the delta, if labels
+    are given) and reasons, a list of limits that were exceeded.
+    """
+    preprocessor = model.named_steps['preprocessor']
+    scaler = preprocessor.named_transformers_['num']
+    encoder = preprocessor.named_transformers_['cat']
+
+    numeric = X_new[NUMERIC_FEATURES].to_numpy(dtype=np.float64)
+    mean_shift = dict(zip(NUMERIC_FEATURES, np.abs(numeric.mean(axis=0) - scaler.mean_) / scaler.scale_))
+    unseen_rate = {
+        feature: float((~X_new[feature].isin(categories)).mean())
+        for feature, categories in zip(CATEGORICAL_FEATURES, encoder.categories_)
+    }
+
+    reasons = [f'{f} mean shifted {v:.2f} std' for f, v in mean_shift.items() if v > MAX_MEAN_SHIFT]
+    reasons += [f'{f} has {v:.1%} unseen categories' for f, v in unseen_rate.items() if v > MAX_UNSEEN_RATE]
+
+    auc = None
+    if y_new is not None and y_new.nunique() == 2:
+        auc = float(roc_auc_score(y_new, model.predict_proba(X_new)[:, 1]))
+        if baseline_auc is not None and auc < baseline_auc - MAX_AUC_DROP:
+            reasons.append(f'ROC-AUC fell from {baseline_auc:.3f} to {auc:.3f}')
+
+    return {'mean_shift': mean_shift, 'unseen_rate': unseen_rate, 'auc': auc, 'reasons': reasons}
+
+
+def _remap_threshold(t: float, m0: float, s0: float, m1: float, s1: float) -> float:
+    """
+    Move one split threshold from the old scaling to the new one.
+
+    z_old < t  ⇔  x < m0 + t·s0  ⇔  z_new < (m0 + t·s0 − m1) / s1
+
+    XGBoost's cut points are usually the float32-scaled value of an observed
+    raw value v, and rows equal to v must stay on the right. In that case the
+    new threshold is computed from v the same way the transform computes it.
+    """
+    raw = m0 + t * s0
+    v = round(raw)
+    if np.float32((v - m0) / s0) == np.float32(t):
+        return float(np.float32((v - m1) / s1))
+    return float((raw - m1) / s1)
+
+
+def _remap_thresholds(booster, columns, old_mean, old_scale, new_mean, new_scale):
+    """Rewrite split thresholds on scaled numeric columns so existing trees keep their decisions."""
+    raw = json.loads(booster.save_raw('json'))
+    remap = {c: (old_mean[i], old_scale[i], new_mean[i], new_scale[i]) for i, c in enumerate(columns)}
+    for tree in raw['learner']['gradient_booster']['model']['trees']:
+        conditions = tree['split_conditions']
+        for node, (left, feature) in enumerate(zip(tree['left_children'], tree['split_indices'])):
+            if left != -1 and feature in remap:
+                conditions[node] = _remap_threshold(conditions[node], *remap[feature])
+
+    remapped = booster.copy()
+    remapped.load_model(bytearray(json.dumps(raw).encode()))
+    return remapped
+
+
+def incremental_update(model, X_new: pd.DataFrame, y_new: pd.Series, n_rounds: int = 20,
+                       baseline_auc: float = None, holdout: float = 0.2, random_state: int = 42,
+                       X_ref: pd.DataFrame = None, y_ref: pd.Series = None) -> dict:
+    """
+    Warm-start a fitted pipeline on new labelled rows.
+
+    The StandardScaler statistics are updated with partial_fit, the existing
+    trees' thresholds are remapped to the new scaling, and `n_rounds` more
+    trees are boosted on the delta with the previous best hyperparameters.
+    The one-hot encoder is kept as is, because the booster's input width is fixed.
+
+    State fitted to the old model's scores is refitted on the updated model's
+    scores over `X_ref`/`y_ref`, labelled rows neither model was fitted on
+    (e.g. the original test split); without them, over the delta's holdout
+    slice. The calibrator is refitted with the same method, the decision
+    threshold is re-picked with the model's `training_settings` (or kept if
+    it was set by hand), and the drift profile is rebuilt on `X_ref` plus the delta.
+
+    Returns a dict with:
+        - action: 'updated', 'rejected' (update scored worse on the holdout) or
+          'full_retrain' (drift limits exceeded; nothing was changed)
+        - model: the pipeline to serve (the original unless action == 'updated')
+        - drift: check_drift() output
+        - holdout_auc_before / holdout_auc_after
+        - X_holdout: delta rows the update did not train on (None for 'full_retrain')
+        - refitted: what was refitted or dropped on the updated pipeline
+    """
+    drift = check_drift(model, X_new, y_new, baseline_auc)
+    if drift['reasons']:
+        return {'action': 'full_retrain', 'model': model, 'drift': drift,
+                'holdout_auc_before': drift['auc'], 'holdout_auc_after': None, 'X_holdout': None, 'refitted': []}
+
+    stratify = y_new if y_new.value_counts().min() >= 2 else None
+    X_fit, X_hold, y_fit, y_hold = train_test_split(
+        X_new, y_new, test_size=holdout, random_state=random_state, stratify=stratify,
+    )
+
+    with instrument.stage('incremental_update', rows=len(X_fit), n_rounds=n_rounds):
+        updated = copy.deepcopy(model)
+        preprocessor = updated.named_steps['preprocessor']
+        scaler = preprocessor.named_transformers_['num']
+        old_mean, old_scale = scaler.mean_.copy(), scaler.scale_.copy()
+        scaler.partial_fit(X_fit[NUMERIC_FEATURES])
+
+        classifier = updated.named_steps['classifier']
+        booster = _remap_thresholds(
+            classifier.get_booster(), range(len(NUMERIC_FEATURES)),
+            old_mean, old_scale, scaler.mean_, scaler.scale_,
+        )
+        continued = XGBClassifier(**{**classifier.get_params(), 'n_estimators': n_rounds})
+        continued.fit(preprocessor.transform(X_fit), y_fit, xgb_model=booster)
+        updated.steps[-1] = ('classifier', continued)
+
+    auc_before = auc_after = None
+    if y_hold.nunique() == 2:
+        auc_before = float(roc_auc_score(y_hold, model.predict_proba(X_hold)[:, 1]))
+        auc_after = float(roc_auc_score(y_hold, updated.predict_proba(X_hold)[:, 1]))
+    if X_ref is None:
+        refitted = _refit_scored_state(updated, X_hold, y_hold, X_new)
+    else:
+        refitted = _refit_scored_state(updated, X_ref, y_ref, pd.concat([X_ref, X_new], ignore_index=True))
+
+    action = 'rejected' if auc_before is not None and auc_after < auc_before - MAX_AUC_DROP else 'updated'
+    return {
+        'action': action,
+        'model': updated if action == 'updated' else model,
+        'drift': drift,
+        'holdout_auc_before': auc_before,
+        'holdout_auc_after': auc_after,
+        'X_holdout': X_hold,
+        'refitted': refitted,
+    }
+
+
+def _refit_scored_state(updated, X_cal: pd.DataFrame, y_cal: pd.Series, X_profile: pd.DataFrame) -> list:
+    """Refit the calibrator, decision threshold and profile copied from the old model on the updated model's scores."""
+    refitted = []
+    both_classes = y_cal.nunique() == 2
+    calibrator = getattr(updated, 'calibrator', None)
+    if calibrator is not None:
+        if both_classes:
+            updated.calibrator = fit_calibrator(y_cal, updated.predict_proba(X_cal)[:, 1], calibrator.method)
+            refitted.append(f'{calibrator.method} calibration refitted on {len(y_cal)} rows')
+        else:
+            updated.calibrator = None
+            refitted.append('calibration dropped (calibration rows have one class)')
+
+    settings = getattr(updated, 'training_settings', {})
+    if getattr(updated, 'decision_threshold', None) is not None and both_classes and (
+            settings.get('cost') is not None or settings.get('min_recall') is not None):
+        cost_fn, cost_fp = settings.get('cost') or (COST_FN, COST_FP)
+        decision = choose_threshold(y_cal, predict_default_proba(updated, X_cal), cost_fn, cost_fp,
+                                    settings.get('min_recall'))
+        updated.decision_threshold = decision['threshold']
+        refitted.append(f"decision threshold re-picked on {len(y_cal)} rows: {decision['threshold']:.3f}")
+
+    if getattr(updated, 'profile', None) is not None:
+        updated.profile = build_profile(X_profile, calibrate(updated, updated.predict_proba(X_profile)[:, 1]))
+        refitted.append(f'drift profile rebuilt on {len(X_profile)} rows')
+    return refitted
@@ -0,0 +1,108 @@
+# ABOUTME: Opt-in structured instrumentation that writes pipeline timings and memory use as JSON lines.
+# ABOUTME: Enable with CREDIT_RISK_INSTRUMENT=<path|-> or enable(); disabled calls return immediately.
+
+import json
+import os
+import sys
+import threading
+import time
+
+ENV_VAR = 'CREDIT_RISK_INSTRUMENT'
+# Values that switch instrumentation off, or send it to stderr, instead of naming a file
+OFF_VALUES = ('', '0', 'false', 'no', 'off')
+STDERR_VALUES = ('-', '1', 'true', 'yes', 'on')
+
+_sink = None
+_lock = threading.Lock()
+_PAGE_MB = os.sysconf('SC_PAGE_SIZE') / 2**20 if hasattr(os, 'sysconf') else 0.0
+
+
+def enable(path: str = '-'):
+    """Start writing events to `path` (appending), to stderr for '-' or '1', or stay off for '0'/'false'/''."""
+    global _sink
+    disable()
+    value = path.strip().lower()
+    if value in OFF_VALUES:
+        return
+    _sink = sys.stderr if value in STDERR_VALUES else open(path, 'a', buffering=1)
+
+
+def disable():
+    global _sink
+    if _sink is not None and _sink is not sys.stderr:
+        _sink.close()
+    _sink = None
+
+
+def enabled() -> bool:
+    return _sink is not None
+
+
+def rss_mb() -> float:
+    """Current resident set size in MB (0.0 where /proc is unavailable)."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * _PAGE_MB
+    except (OSError, IndexError, ValueError):
+        return 0.0
+
+
+def emit(event: str, **fields):
+    """Write one JSON event; a no-op while instrumentation is disabled."""
+    if _sink is None:
+        return
+    line = json.dumps({'event': event, 'ts': round(time.time(), 6), **fields}, default=str)
+    with _lock:
+        _sink.write(line + '\n')
+
+
+class _Stage:
+    def __init__(self, name: str, fields: dict):
+        self.name = name
+        self.fields = fields
+
+    def set(self, **fields):
+        """Attach extra fields (row counts, shapes, ...) to the stage event."""
+        self.fields.update(fields)
+
+    def __enter__(self):
+        self.rss_start = rss_mb()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        seconds = time.perf_counter() - self.start
+        rss_end = rss_mb()
+        emit('stage', name=self.name, seconds=round(seconds, 6), rss_mb=round(rss_end, 1),
+             rss_delta_mb=round(rss_end - self.rss_start, 1), ok=exc_type is None, **self.fields)
+        return False
+
+
+class _NullStage:
+    def set(self, **fields):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+def stage(name: str, **fields):
+    """
+    Context manager that emits a 'stage' event with wall-clock seconds and RSS change.
+
+    Returns a shared no-op object while disabled, so instrumented code pays
+    one function call per stage.
+    """
+    if _sink is None:
+        return _NULL_STAGE
+    return _Stage(name, fields)
+
+
+if ENV_VAR in os.environ:
+    enable(os.environ[ENV_VAR])
@@ -0,0 +1,331 @@
+# ABOUTME: Precomputed score table over the categorical cross-product and the booster's split cells on the numerics.
+# ABOUTME: Provides grid_from_model(), build_score_table(), table_accuracy() and ScoreTable, which CompiledModel consults first.
+
+import json
+from bisect import bisect_right
+
+import numpy as np
+
+from src.predict import calibrate, decision_threshold
+
+# Bounds of the dashboard's input widgets; rows outside them are scored by the booster
+GRID_RANGES = {'Age': (18, 80), 'Credit amount': (100, 20000), 'Duration': (1, 72)}
+# Most cells per numeric axis; the split points that can move the score most become the cell edges
+GRID_CELLS = {'Age': 16, 'Credit amount': 64, 'Duration': 12}
+# Cells where the booster's served P(bad) strays further than this from the stored one are left to the booster
+MAX_ERROR = 0.05
+# Categorical combinations of the training data the cell probes are run on
+PROBE_COMBOS = 64
+# Table scores this close to the decision threshold are re-scored by the booster
+DECISION_MARGIN = 0.1
+# Attach-time gate on table_accuracy(); a table outside these is not shipped
+MAX_P99_ERROR = 0.05
+MIN_DECISION_AGREEMENT = 0.995
+# A table answering fewer held-out rows than this is not worth its size, and its error estimate is noise
+MIN_HIT_RATE = 0.05
+MIN_HITS = 20
+QUANT_SCALE = 255
+CHUNK_ROWS = 1_000_000
+
+
+class ScoreTable:
+    """
+    Raw (uncalibrated) P(bad) for every combination of categorical values and
+    every cell of a grid over the numeric inputs, stored as uint8.
+
+    The booster is a sum of trees, so for fixed categoricals it is constant
+    between consecutive split points of the numeric features. Cell edges are
+    the split points that can move the score most (see grid_from_model()),
+    and lookup() returns the stored score of the cell a row falls in: one dict
+    lookup per categorical and one binary search per numeric.
+
+    Splits left out of the grid can still change the score inside a cell, so
+    `trusted` marks the numeric cells where probing them stayed within the
+    build's `max_error` (see probe_cells()); rows in other cells miss. Rows with
+    an unseen category, a missing value or a numeric input outside the edges
+    miss too, as do rows whose (calibrated) score lands within `margin` of the
+    decision threshold, so the real model makes close calls. `accuracy` holds
+    the table_accuracy() report it was shipped with.
+    """
+
+    def __init__(self, categorical_features, categories, numeric_features, edges, values, trusted,
+                 margin: float = DECISION_MARGIN, max_error: float = MAX_ERROR, accuracy: dict = None):
+        self.categorical_features = list(categorical_features)
+        self.categories = [list(c) for c in categories]
+        self.numeric_features = list(numeric_features)
+        self.edges = [np.asarray(e, dtype=np.float64) for e in edges]
+        self.values = np.asarray(values, dtype=np.uint8)
+        self.trusted = np.asarray(trusted, dtype=bool)
+        self.margin = float(margin)
+        self.max_error = float(max_error)
+        self.accuracy = accuracy
+        self._index = [{c: i for i, c in enumerate(cats)} for cats in self.categories]
+        self._edge_lists = [e.tolist() for e in self.edges]
+
+    @property
+    def nbytes(self) -> int:
+        return self.values.nbytes + self.trusted.nbytes
+
+    def lookup(self, columns: dict, threshold: float = None, calibrator=None):
+        """
+        Return (default_prob, hit) for a dict of {feature: array-like} columns.
+
+        `default_prob` is raw P(bad) and only meaningful where `hit` is True.
+        Pass the model's decision threshold and calibrator to also miss on close calls.
+        """
+        n_rows = len(next(iter(columns.values())))
+        inside = np.ones(n_rows, dtype=bool)
+
+        cell = np.zeros(n_rows, dtype=np.int64)
+        for feature, index in zip(self.categorical_features, self._index):
+            codes = np.fromiter((index.get(v, -1) for v in columns[feature]), dtype=np.int64, count=n_rows)
+            inside &= codes >= 0
+            cell = cell * len(index) + codes
+
+        position = []
+        for feature, edges in zip(self.numeric_features, self.edges):
+            x = np.asarray(columns[feature], dtype=np.float64)
+            inside &= (x >= edges[0]) & (x <= edges[-1])
+            position.append(np.clip(np.searchsorted(edges, x, side='right') - 1, 0, len(edges) - 2))
+        inside &= self.trusted[tuple(position)]
+        default_prob = self.values[(np.where(inside, cell, 0),) + tuple(position)] / QUANT_SCALE
+
+        if threshold is not None:
+            calibrated = calibrator(default_prob) if calibrator is not None else default_prob
+            inside &= np.abs(calibrated - threshold) >= self.margin
+        return default_prob, inside
+
+    def lookup_one(self, record: dict, threshold: float = None, calibrator=None):
+        """lookup() for a single record without array overhead; returns raw P(bad), or None on a miss."""
+        cell = 0
+        for feature, index in zip(self.categorical_features, self._index):
+            code = index.get(record[feature])
+            if code is None:
+                return None
+            cell = cell * len(index) + code
+
+        position = []
+        for feature, edges in zip(self.numeric_features, self._edge_lists):
+            x = record[feature]
+            # NaN fails both comparisons, so missing values go to the booster
+            if x is None or not edges[0] <= x <= edges[-1]:
+                return None
+            position.append(min(bisect_right(edges, x) - 1, len(edges) - 2))
+        if not self.trusted[tuple(position)]:
+            return None
+        default_prob = int(self.values[(cell,) + tuple(position)]) / QUANT_SCALE
+
+        if threshold is not None:
+            calibrated = float(calibrator(default_prob)) if calibrator is not None else default_prob
+            if abs(calibrated - threshold) < self.margin:
+                return None
+        return default_prob
+
+    def save(self, path: str):
+        meta = {
+            'categorical_features': self.categorical_features,
+            'categories': self.categories,
+            'numeric_features': self.numeric_features,
+            'margin': self.margin,
+            'max_error': self.max_error,
+            'accuracy': self.accuracy,
+        }
+        # Uncompressed, so loading is a straight read of the uint8 block
+        np.savez(path, values=self.values, trusted=self.trusted, meta=np.array(json.dumps(meta)),
+                 **{f'edges_{i}': e for i, e in enumerate(self.edges)})
+
+    @classmethod
+    def load(cls, path: str) -> 'ScoreTable':
+        with np.load(path) as data:
+            meta = json.loads(str(data['meta']))
+            edges = [data[f'edges_{i}'] for i in range(len(meta['numeric_features']))]
+            return cls(meta['categorical_features'], meta['categories'], meta['numeric_features'], edges,
+                       data['values'], data['trusted'], meta['margin'], meta['max_error'], meta.get('accuracy'))
+
+
+def _compiled(model):
+    from src.fastpath import CompiledModel, compile_pipeline
+
+    return model if isinstance(model, CompiledModel) else compile_pipeline(model)
+
+
+def split_points(model) -> list:
+    """
+    Return one {raw split value: effect} dict per numeric feature, from the booster's trees.
+
+    A split sends x < value left. Its effect is the most that moving a row
+    across it can change the log-odds: the spread of the leaves below each
+    node using it, summed over those nodes. Values are mapped back from the
+    scaled inputs to raw units, snapped to the whole number the scaler turns
+    into the same float32 cut when there is one, so rows at the cut land on
+    the same side.
+    """
+    compiled = _compiled(model)
+    k = len(compiled.numeric_features)
+    effects = [{} for _ in range(k)]
+    trees = json.loads(compiled.booster.save_raw('json'))['learner']['gradient_booster']['model']['trees']
+    start, stop = compiled.iteration_range
+    for tree in trees[start:stop or None]:
+        left, right = tree['left_children'], tree['right_children']
+        conditions, features = tree['split_conditions'], tree['split_indices']
+        # Children are numbered after their parents, so one backwards pass finds each subtree's leaf range
+        low, high = list(conditions), list(conditions)
+        for node in range(len(left) - 1, -1, -1):
+            if left[node] == -1:
+                continue
+            low[node] = min(low[left[node]], low[right[node]])
+            high[node] = max(high[left[node]], high[right[node]])
+            feature = features[node]
+            if feature >= k:
+                continue
+            mean, scale = compiled.mean[feature], compiled.scale[feature]
+            value = mean + conditions[node] * scale
+            whole = round(value)
+            if np.float32((whole - mean) / scale) == np.float32(conditions[node]):
+                value = float(whole)
+            effects[feature][value] = effects[feature].get(value, 0.0) + high[node] - low[node]
+    return effects
+
+
+def grid_from_model(model, X, n_cells: dict = None, ranges: dict = None, n_combos: int = PROBE_COMBOS) -> tuple:
+    """
+    Return (categories, edges, probe_combos) for build_score_table() from the model and its training data X.
+
+    Categories are the values seen in X. Each numeric axis spans `ranges` and
+    is cut at the booster's split points on that feature inside the range,
+    keeping the `n_cells` - 1 with the largest effect when there are more.
+    The probe combinations are the most common categorical rows of X.
+    """
+    compiled = _compiled(model)
+    n_cells = {**GRID_CELLS, **(n_cells or {})}
+    ranges = {**GRID_RANGES, **(ranges or {})}
+    categories = [sorted(_native(v) for v in X[f].dropna().unique()) for f in compiled.categorical_features]
+    edges = []
+    for feature, effects in zip(compiled.numeric_features, split_points(compiled)):
+        lo, hi = ranges[feature]
+        inside = sorted(((e, v) for v, e in effects.items() if lo < v < hi), reverse=True)
+        cuts = [v for _, v in inside[:n_cells[feature] - 1]]
+        edges.append(np.unique(np.r_[lo, cuts, hi]).astype(np.float64))
+    common = X[compiled.categorical_features].dropna().value_counts().head(n_combos).index
+    probe_combos = [dict(zip(compiled.categorical_features, map(_native, combo))) for combo in common]
+    return categories, edges, probe_combos
+
+
+def _score_grid(compiled, combo: dict, axes: list) -> np.ndarray:
+    """Booster P(bad) for one categorical combination over the mesh of `axes` (raw numeric values)."""
+    mesh = np.meshgrid(*axes, indexing='ij')
+    columns = {**{f: np.repeat(v, mesh[0].size) for f, v in combo.items()},
+               **{f: m.ravel() for f, m in zip(compiled.numeric_features, mesh)}}
+    default_prob = compiled.booster.inplace_predict(compiled.transform(columns), iteration_range=compiled.iteration_range)
+    return default_prob.reshape(mesh[0].shape)
+
+
+def probe_cells(model, edges: list, combos: list, max_error: float = MAX_ERROR) -> np.ndarray:
+    """
+    Return the numeric cells whose served score stays within `max_error` of the stored one.
+
+    For each categorical combination in `combos` (dicts), the booster is scored
+    between every pair of its consecutive split points inside the grid, where
+    it is constant, and compared on the calibrated scale with the cell
+    midpoint build_score_table() stores. A cell failing for any combination is
+    untrusted for all of them.
+    """
+    compiled = _compiled(model)
+    mids = [(e[:-1] + e[1:]) / 2 for e in edges]
+    fine, cell = [], []
+    for e, effects in zip(edges, split_points(compiled)):
+        cuts = np.unique(np.r_[e, [v for v in effects if e[0] < v < e[-1]]])
+        fine.append((cuts[:-1] + cuts[1:]) / 2)
+        cell.append(np.searchsorted(e, fine[-1], side='right') - 1)
+    flat = np.ravel_multi_index(np.meshgrid(*cell, indexing='ij'), tuple(len(m) for m in mids)).ravel()
+    error = np.zeros(np.prod([len(m) for m in mids]))
+    for combo in combos:
+        stored = calibrate(model, np.round(_score_grid(compiled, combo, mids) * QUANT_SCALE) / QUANT_SCALE).ravel()
+        exact = calibrate(model, _score_grid(compiled, combo, fine)).ravel()
+        np.maximum.at(error, flat, np.abs(exact - stored[flat]))
+    return (error <= max_error).reshape(tuple(len(m) for m in mids))
+
+
+def build_score_table(model, categories: list, edges: list, probe_combos: list = None,
+                      margin: float = DECISION_MARGIN, max_error: float = MAX_ERROR) -> ScoreTable:
+    """
+    Score one point inside every grid cell with the model's booster and return the quantized table.
+
+    `probe_combos` are the categorical combinations (dicts) probe_cells() checks
+    the cells with; without them every cell is trusted.
+    """
+    compiled = _compiled(model)
+    k = len(compiled.numeric_features)
+    # Cell midpoints: inside the cell whichever side of an edge the model puts a boundary row
+    mesh = np.meshgrid(*[(e[:-1] + e[1:]) / 2 for e in edges], indexing='ij')
+    numeric = np.column_stack([m.ravel() for m in mesh])
+    numeric = ((numeric - compiled.mean) / compiled.scale).astype(np.float32)
+
+    # One design row per categorical combination, in the same row-major order lookup() uses
+    combos = np.stack(np.meshgrid(*[np.arange(len(c)) for c in categories], indexing='ij'), -1).reshape(-1, len(categories))
+    onehot = np.zeros((len(combos), compiled.n_columns), dtype=np.float32)
+    for j, (cats, lut) in enumerate(zip(categories, compiled.category_index)):
+        columns = np.array([lut.get(c, -1) for c in cats])[combos[:, j]]
+        rows = np.flatnonzero(columns >= 0)
+        onehot[rows, columns[rows]] = 1.0
+
+    values = np.empty((len(combos), len(numeric)), dtype=np.uint8)
+    step = max(1, CHUNK_ROWS // len(numeric))
+    for start in range(0, len(combos), step):
+        block = np.repeat(onehot[start:start + step], len(numeric), axis=0)
+        block[:, :k] = np.tile(numeric, (len(onehot[start:start + step]), 1))
+        default_prob = compiled.booster.inplace_predict(block, iteration_range=compiled.iteration_range)
+        values[start:start + step] = np.round(default_prob * QUANT_SCALE).reshape(-1, len(numeric))
+
+    shape = tuple(len(e) - 1 for e in edges)
+    trusted = probe_cells(model, edges, probe_combos, max_error) if probe_combos else np.ones(shape, dtype=bool)
+    return ScoreTable(compiled.categorical_features, categories, compiled.numeric_features, edges,
+                      values.reshape((len(combos),) + shape), trusted, margin, max_error)
+
+
+def table_accuracy(table: ScoreTable, model, X) -> dict:
+    """
+    Compare scoring through the table with the real model on X (ideally held-out rows).
+
+    `model` must not carry the table itself. `hits` and `hit_rate` count the rows
+    the table answers; the errors are on calibrated P(bad) over those rows, and
+    decision agreement covers every row, with misses scored exactly as served.
+    """
+    from src.fastpath import _as_columns
+
+    threshold = decision_threshold(model)
+    calibrator = getattr(model, 'calibrator', None)
+    exact = calibrate(model, np.asarray(model.predict_proba(X))[:, 1])
+    approx, hit = table.lookup(_as_columns(X, table.categorical_features + table.numeric_features),
+                               threshold, calibrator)
+    served = np.where(hit, calibrate(model, approx), exact)
+    error = np.abs(served - exact)[hit]
+    return {
+        'rows': int(len(exact)),
+        'hits': int(hit.sum()),
+        'hit_rate': round(float(hit.mean()), 4),
+        'mae': round(float(error.mean()), 5) if len(error) else None,
+        'p99_abs_error': round(float(np.quantile(error, 0.99)), 5) if len(error) else None,
+        'max_abs_error': round(float(error.max()), 5) if len(error) else None,
+        'decision_agreement': round(float(((served > threshold) == (exact > threshold)).mean()), 4),
+    }
+
+
+def accuracy_violations(accuracy: dict, max_p99_error: float = MAX_P99_ERROR,
+                        min_agreement: float = MIN_DECISION_AGREEMENT, min_hit_rate: float = MIN_HIT_RATE,
+                        min_hits: int = MIN_HITS) -> list:
+    """Return the reasons a table_accuracy() report fails the attach gate; empty when it passes."""
+    reasons = []
+    if accuracy['hit_rate'] < min_hit_rate:
+        reasons.append(f"hit rate {accuracy['hit_rate']:.1%} < {min_hit_rate:.1%}")
+    if accuracy['hits'] < min_hits:
+        reasons.append(f"only {accuracy['hits']} held-out rows answered from the table (< {min_hits})")
+    if accuracy['p99_abs_error'] is not None and accuracy['p99_abs_error'] > max_p99_error:
+        reasons.append(f"p99 error {accuracy['p99_abs_error']:.4f} > {max_p99_error:g}")
+    if accuracy['decision_agreement'] < min_agreement:
+        reasons.append(f"decision agreement {accuracy['decision_agreement']:.2%} < {min_agreement:.2%}")
+    return reasons
+
+
+def _native(value):
+    return value.item() if hasattr(value, 'item') else value
@@ -0,0 +1,164 @@
+# ABOUTME: Input and output drift monitoring with fixed-size streaming histograms and category counts.
+# ABOUTME: Provides build_profile() for the training-time reference and DriftMonitor, which reports PSI and KS.
+
+import threading
+from bisect import bisect_right
+
+import numpy as np
+import pandas as pd
+
+from src.features import CATEGORICAL_FEATURES, NUMERIC_FEATURES
+
+OUTPUT = 'default_probability'
+OUTPUT_EDGES = np.linspace(0.0, 1.0, 21)[1:-1].tolist()
+
+# Usual PSI reading: below 0.1 stable, 0.1-0.25 a moderate shift, above 0.25 a major one
+PSI_WARN = 0.1
+PSI_ALERT = 0.25
+# Fewer observed rows than this make PSI too noisy to raise alerts
+MIN_ROWS = 100
+_EPS = 1e-4
+
+
+def build_profile(X: pd.DataFrame, default_probability, n_bins: int = 20) -> dict:
+    """
+    Reference histograms of the training inputs and held-out P(bad), small enough for JSON.
+
+    Numeric features get quantile bin edges; categorical features get their
+    category counts plus a trailing bucket for anything unseen.
+    """
+    features = {}
+    for feature in NUMERIC_FEATURES:
+        values = X[feature].to_numpy(dtype=np.float64)
+        edges = np.unique(np.quantile(values, np.linspace(0, 1, n_bins + 1)[1:-1]))
+        features[feature] = {'kind': 'numeric', 'edges': edges.tolist(), 'counts': _bin(values, edges).tolist()}
+    for feature in CATEGORICAL_FEATURES:
+        column = X[feature]
+        categories = list(column.cat.categories) if isinstance(column.dtype, pd.CategoricalDtype) \
+            else sorted(column.dropna().unique().tolist())
+        categories = [c.item() if hasattr(c, 'item') else c for c in categories]
+        features[feature] = {
+            'kind': 'categorical', 'categories': categories, 'counts': _count(column, categories).tolist(),
+        }
+    features[OUTPUT] = {
+        'kind': 'numeric', 'edges': OUTPUT_EDGES,
+        'counts': _bin(np.asarray(default_probability, dtype=np.float64), OUTPUT_EDGES).tolist(),
+    }
+    return {'n_rows': len(X), 'features': features}
+
+
+def _bin(values: np.ndarray, edges) -> np.ndarray:
+    return np.bincount(np.searchsorted(edges, values, side='right'), minlength=len(edges) + 1)
+
+
+def _count(column, categories: list) -> np.ndarray:
+    codes = pd.Categorical(column, categories=categories).codes.astype(np.int64)
+    codes[codes < 0] = len(categories)
+    return np.bincount(codes, minlength=len(categories) + 1)
+
+
+def psi(expected, actual) -> float:
+    """Population stability index between two histograms over the same bins."""
+    e = np.maximum(np.asarray(expected, dtype=np.float64) / max(np.sum(expected), 1), _EPS)
+    a = np.maximum(np.asarray(actual, dtype=np.float64) / max(np.sum(actual), 1), _EPS)
+    return float(np.sum((a - e) * np.log(a / e)))
+
+
+def ks(expected, actual) -> float:
+    """Kolmogorov-Smirnov distance between the binned CDFs (exact at the bin edges)."""
+    e = np.cumsum(expected) / max(np.sum(expected), 1)
+    a = np.cumsum(actual) / max(np.sum(actual), 1)
+    return float(np.max(np.abs(e - a)))
+
+
+class DriftMonitor:
+    """
+    Streams scored traffic into histograms shaped like a reference profile.
+
+    Memory is fixed by the profile (a few hundred counters) no matter how many
+    rows are observed. observe() costs a few microseconds per applicant;
+    observe_batch() bins whole frames with NumPy. Safe to share between threads.
+    """
+
+    def __init__(self, profile: dict, version: str = None):
+        self.profile = profile
+        self.version = version
+        self._lock = threading.Lock()
+        self._numeric, self._categorical = [], []
+        for name, spec in profile['features'].items():
+            counts = np.zeros(len(spec['counts']), dtype=np.int64)
+            if spec['kind'] == 'numeric':
+                self._numeric.append((name, list(spec['edges']), counts))
+            else:
+                index = {category: i for i, category in enumerate(spec['categories'])}
+                self._categorical.append((name, index, spec['categories'], counts))
+        self.n = 0
+
+    def observe(self, record: dict, default_probability: float):
+        """Count one applicant (a dict of the nine inputs) and its P(bad)."""
+        with self._lock:
+            self.n += 1
+            for name, edges, counts in self._numeric:
+                value = default_probability if name == OUTPUT else record[name]
+                counts[bisect_right(edges, value)] += 1
+            for name, index, _, counts in self._categorical:
+                counts[index.get(record[name], -1)] += 1
+
+    def observe_batch(self, X: pd.DataFrame, default_probability):
+        """Count every row of X with its P(bad) using vectorized binning."""
+        default_probability = np.asarray(default_probability, dtype=np.float64)
+        binned = []
+        for name, edges, counts in self._numeric:
+            values = default_probability if name == OUTPUT else X[name].to_numpy(dtype=np.float64)
+            binned.append((counts, _bin(values, edges)))
+        for name, _, categories, counts in self._categorical:
+            binned.append((counts, _count(X[name], categories)))
+        with self._lock:
+            self.n += len(X)
+            for counts, delta in binned:
+                counts += delta
+
+    def reset(self):
+        with self._lock:
+            self.n = 0
+            for *_, counts in self._numeric + self._categorical:
+                counts[:] = 0
+
+    def report(self) -> dict:
+        """
+        PSI (and KS for numeric features and the output) of the observed traffic
+        against the reference, with a stable/warn/alert status per feature
+        ('insufficient' until MIN_ROWS rows have been observed).
+        """
+        with self._lock:
+            observed = {name: counts.copy() for name, *_, counts in self._numeric + self._categorical}
+            n = self.n
+
+        features = {}
+        for name, counts in observed.items():
+            spec = self.profile['features'][name]
+            value = psi(spec['counts'], counts) if n else 0.0
+            if n < MIN_ROWS:
+                status = 'insufficient'
+            else:
+                status = 'alert' if value > PSI_ALERT else 'warn' if value > PSI_WARN else 'stable'
+            features[name] = {
+                'psi': round(value, 4),
+                'ks': round(ks(spec['counts'], counts), 4) if n and spec['kind'] == 'numeric' else None,
+                'status': status,
+            }
+        return {
+            'n': n,
+            'reference_rows': self.profile['n_rows'],
+            'features': features,
+            'alerts': [name for name, f in features.items() if f['status'] == 'alert'],
+        }
+
+
+def monitor_for(model, current: DriftMonitor = None):
+    """Keep `current` while the model version is unchanged; otherwise start one on the model's profile."""
+    version = getattr(model, 'version', None)
+    if current is not None and current.version == version:
+        return current
+    profile = getattr(model, 'profile', None)
+    return DriftMonitor(profile, version) if profile is not None else None
@@ -0,0 +1,208 @@
+# ABOUTME: Out-of-core training that streams file chunks through the preprocessor into XGBoost external memory.
+# ABOUTME: Run `python -m src.out_of_core history.csv` or call train_out_of_core(); memory stays bounded by chunk size.
+
+import argparse
+import json
+import os
+import tempfile
+
+import numpy as np
+import xgboost as xgb
+from sklearn.metrics import accuracy_score, roc_auc_score
+
+from src import instrument
+from src.data import iter_data_chunks
+from src.fastpath import compile_preprocessor
+from src.features import CATEGORICAL_FEATURES, NUMERIC_FEATURES
+from src.preprocess import build_preprocessor
+from src.train import CLASSIFIER_PARAMS
+
+
+class StreamingSplit:
+    """
+    Deterministic stratified train/test assignment for rows arriving in chunks.
+
+    Within each class, row k (counted across chunks) goes to the test set when
+    floor((k + 1 + offset)·test_size) > floor((k + offset)·test_size). Every
+    class therefore contributes test_size of its rows, and a second pass over
+    the same file reproduces the same split after reset().
+    """
+
+    def __init__(self, test_size: float = 0.2, random_state: int = 42):
+        self.test_size = test_size
+        self.offsets = np.random.default_rng(random_state).random(2) / test_size
+        self.reset()
+
+    def reset(self):
+        self.seen = np.zeros(2, dtype=np.int64)
+
+    def test_mask(self, y: np.ndarray) -> np.ndarray:
+        mask = np.zeros(len(y), dtype=bool)
+        for cls in (0, 1):
+            rows = np.flatnonzero(y == cls)
+            k = self.seen[cls] + np.arange(len(rows)) + self.offsets[cls]
+            mask[rows] = np.floor((k + 1) * self.test_size) > np.floor(k * self.test_size)
+            self.seen[cls] += len(rows)
+        return mask
+
+
+def split_rows(chunk, split: StreamingSplit) -> tuple:
+    """
+    Return (y, train, test) for one chunk: labels as floats and the two row masks.
+
+    Rows without a Risk label are in neither mask; they are never trained or scored on.
+    """
+    y = chunk['Risk'].to_numpy(dtype=np.float64, na_value=np.nan)
+    test = split.test_mask(y)
+    return y, ~np.isnan(y) & ~test, test
+
+
+def fit_streaming_preprocessor(path: str, chunksize: int, split: StreamingSplit):
+    """
+    Fit build_preprocessor() on the training rows in one pass without holding the file in memory.
+
+    Only rows `split` assigns to training count, so the test split does not leak
+    into the scaler. Scaler statistics are accumulated with partial_fit and the
+    one-hot categories are the sorted union of values observed in any chunk,
+    which is what a single fit on the training rows would produce. Returns
+    (preprocessor, training rows).
+    """
+    observed = {feature: set() for feature in CATEGORICAL_FEATURES}
+    first, first_index, rows = None, None, 0
+    split.reset()
+    for i, chunk in enumerate(iter_data_chunks(path, chunksize)):
+        chunk = chunk[split_rows(chunk, split)[1]]
+        if first is None and len(chunk):
+            first, first_index = chunk, i
+        for feature in CATEGORICAL_FEATURES:
+            observed[feature].update(chunk[feature].dropna().unique().tolist())
+        rows += len(chunk)
+    if first is None:
+        raise ValueError(f'{path} has no labeled training rows')
+
+    preprocessor = build_preprocessor()
+    preprocessor.set_params(cat__categories=[sorted(observed[f]) for f in CATEGORICAL_FEATURES])
+    preprocessor.fit(first)
+
+    scaler = preprocessor.named_transformers_['num']
+    split.reset()
+    for i, chunk in enumerate(iter_data_chunks(path, chunksize)):
+        train = split_rows(chunk, split)[1]
+        if i > first_index and train.any():
+            scaler.partial_fit(chunk.loc[train, NUMERIC_FEATURES])
+    return preprocessor, rows
+
+
+class _TrainChunks(xgb.DataIter):
+    """Feeds the training side of each transformed chunk to XGBoost; test rows are skipped."""
+
+    def __init__(self, path: str, chunksize: int, preprocessor, split: StreamingSplit, cache_prefix: str):
+        self.path = path
+        self.chunksize = chunksize
+        self.preprocessor = preprocessor
+        self.split = split
+        self._chunks = None
+        super().__init__(cache_prefix=cache_prefix)
+
+    def next(self, input_data) -> bool:
+        if self._chunks is None:
+            self._chunks = iter_data_chunks(self.path, self.chunksize)
+        for chunk in self._chunks:
+            y, train, _ = split_rows(chunk, self.split)
+            if train.any():
+                X = np.asarray(self.preprocessor.transform(chunk[train]), dtype=np.float32)
+                input_data(data=X, label=y[train])
+                return True
+        return False
+
+    def reset(self):
+        self._chunks = None
+        self.split.reset()
+
+
+def _external_matrix(iterator):
+    # ExtMemQuantileDMatrix (xgboost ≥ 3.0) builds the quantile sketch batch by batch
+    if hasattr(xgb, 'ExtMemQuantileDMatrix'):
+        return xgb.ExtMemQuantileDMatrix(iterator)
+    return xgb.DMatrix(iterator)
+
+
+def train_out_of_core(path: str, chunksize: int = 250_000, test_size: float = 0.2, params: dict = None,
+                      random_state: int = 42, cache_dir: str = None) -> dict:
+    """
+    Train on a CSV/Parquet file of any size in bounded memory.
+
+    Returns a dict with:
+        - model: CompiledModel (preprocessor tables + booster), usable with
+          make_prediction, save_artifact and the registry
+        - metrics: accuracy and roc_auc on the streamed test split
+        - train_rows / test_rows (rows without a Risk label are in neither)
+    """
+    params = {**CLASSIFIER_PARAMS, **(params or {})}
+    n_rounds = params.pop('n_estimators')
+    booster_params = {
+        'objective': 'binary:logistic',
+        'tree_method': 'hist',
+        'eta': params.pop('learning_rate'),
+        'seed': params.pop('random_state'),
+        **params,
+    }
+
+    split = StreamingSplit(test_size, random_state)
+    with instrument.stage('fit_streaming_preprocessor', path=path) as s:
+        preprocessor, rows = fit_streaming_preprocessor(path, chunksize, split)
+        s.set(rows=rows)
+
+    split.reset()
+    with tempfile.TemporaryDirectory(dir=cache_dir) as tmp:
+        with instrument.stage('external_memory_fit', rows=rows, rounds=n_rounds):
+            iterator = _TrainChunks(path, chunksize, preprocessor, split, os.path.join(tmp, 'cache'))
+            booster = xgb.train(booster_params, _external_matrix(iterator), num_boost_round=n_rounds)
+
+    model = compile_preprocessor(preprocessor, booster)
+
+    # Score the held-out rows chunk by chunk; only their labels and probabilities are kept
+    split.reset()
+    y_test, p_test = [], []
+    with instrument.stage('evaluate_streaming', rows=rows):
+        for chunk in iter_data_chunks(path, chunksize):
+            y, _, test = split_rows(chunk, split)
+            if test.any():
+                y_test.append(y[test])
+                p_test.append(model.predict_proba(chunk[test])[:, 1])
+    y_test, p_test = np.concatenate(y_test), np.concatenate(p_test)
+
+    return {
+        'model': model,
+        'metrics': {
+            'accuracy': float(accuracy_score(y_test, p_test > 0.5)),
+            'roc_auc': float(roc_auc_score(y_test, p_test)),
+        },
+        'train_rows': rows,
+        'test_rows': len(y_test),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Train on a file larger than memory.')
+    parser.add_argument('path')
+    parser.add_argument('--chunksize', type=int, default=250_000)
+    parser.add_argument('--params', type=json.loads, default=None, help='XGBClassifier params as JSON')
+    parser.add_argument('--register', action='store_true', help='register and promote the trained model')
+    args = parser.parse_args()
+
+    result = train_out_of_core(args.path, args.chunksize, params=args.params)
+    print(f"Train rows: {result['train_rows']:,}  |  Test rows: {result['test_rows']:,}")
+    print(f"  Accuracy : {result['metrics']['accuracy']:.4f}")
+    print(f"  ROC-AUC  : {result['metrics']['roc_auc']:.4f}")
+
+    if args.register:
+        from src.registry import promote, register
+
+        version = register(result['model'], result['metrics'])
+        promote(version)
+        print(f"Registered and promoted model version {version}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+# ABOUTME: Portfolio scoring for uploaded applicant files: parse, score in one batch and pre-aggregate for charts.
+# ABOUTME: Provides read_portfolio(), score_portfolio(), risk_histogram() and approval_rates() used by the dashboard.
+
+import numpy as np
+import pandas as pd
+
+from src.data import CSV_OPTIONS, _is_parquet, clean_data
+from src.features import INPUT_FEATURES
+from src.monitor import monitor_for
+from src.predict import make_prediction_batch
+
+
+def read_portfolio(buffer, filename: str) -> pd.DataFrame:
+    """Parse an uploaded CSV or Parquet file (path or file-like) with the dataset schema."""
+    df = pd.read_parquet(buffer) if _is_parquet(filename) else pd.read_csv(buffer, **CSV_OPTIONS)
+
+    # Checked before cleaning, which needs the account columns
+    missing = [column for column in INPUT_FEATURES if column not in df.columns]
+    if missing:
+        raise ValueError(f"Missing required columns: {', '.join(missing)}")
+    return clean_data(df)
+
+
+def score_portfolio(model, df: pd.DataFrame, shadow=None) -> dict:
+    """
+    Score every row with one predict_proba call.
+
+    Returns the make_prediction_batch dict, with `predictions` holding the
+    input features alongside the prediction columns, and `drift`: the
+    src.monitor report against the model's reference profile (None without one),
+    and `unknown_categories`: the values clean_data() treated as missing.
+    A src.shadow.ShadowScorer passed as `shadow` re-scores the rows in the background.
+    """
+    features = df[INPUT_FEATURES]
+    monitor = monitor_for(model)
+    result = make_prediction_batch(model, features, monitor=monitor, shadow=shadow)
+    result['drift'] = monitor.report() if monitor is not None else None
+    result['unknown_categories'] = df.attrs.get('unknown_categories', {})
+    result['predictions'] = pd.concat([features, result['predictions']], axis=1)
+    return result
+
+
+def risk_histogram(default_probability, bins: int = 20) -> pd.DataFrame:
+    """Bucket default probabilities (0-100) into `bins` equal-width bars."""
+    counts, edges = np.histogram(default_probability, bins=bins, range=(0, 100))
+    return pd.DataFrame({'bin_start': edges[:-1], 'bin_end': edges[1:], 'count': counts})
+
+
+def approval_rates(scored: pd.DataFrame, column: str) -> pd.DataFrame:
+    """Applicant count and approval rate (% predicted good) per level of `column`."""
+    approved = scored['prediction'].eq(0)
+    grouped = approved.groupby(scored[column], observed=True)
+    return pd.DataFrame({
+        'applicants': grouped.size(),
+        'approval_rate': grouped.mean() * 100,
+    }).reset_index()
@@ -1,31 +1,139 @@
-# ABOUTME: Inference helper that wraps model.predict and returns structured prediction results.
-# ABOUTME: Provides make_prediction() consumed by the Streamlit app.
+# ABOUTME: Inference helpers that wrap model.predict_proba and return structured prediction results.
+# ABOUTME: Provides make_prediction() consumed by the Streamlit app and make_prediction_batch() for portfolios.
 
+import time
+
+import numpy as np
 import pandas as pd
 
+from src.rules import evaluate_indicators
+
+# Cutoff for models without a tuned decision_threshold; matches XGBClassifier.predict,
+# which labels a row bad when P(bad) > 0.5
+DEFAULT_THRESHOLD = 0.5
+
+RISK_LABELS = ['Low Risk (Good)', 'High Risk (Bad)']
+
+
+def resolve_model(model):
+    """
+    The concrete model behind a src.registry.ModelHandle, or `model` itself.
+
+    Scoring functions resolve once per call, so a version promoted mid-call
+    cannot mix one version's probabilities with another's threshold or calibrator.
+    """
+    return getattr(model, 'model', model)
+
+
+def decision_threshold(model) -> float:
+    """The model's P(bad) cutoff (set by src.decision), or DEFAULT_THRESHOLD."""
+    return getattr(model, 'decision_threshold', DEFAULT_THRESHOLD)
+
+
+def calibrate(model, proba) -> np.ndarray:
+    """Apply the model's calibration lookup table (src.calibration), if it has one."""
+    calibrator = getattr(model, 'calibrator', None)
+    return calibrator(proba) if calibrator is not None else proba
 
-def make_prediction(model, input_data: pd.DataFrame) -> dict:
+
+def predict_default_proba(model, X) -> np.ndarray:
+    """Return (calibrated) P(bad) for every row of X from a single predict_proba call."""
+    model = resolve_model(model)
+    return calibrate(model, np.asarray(model.predict_proba(X))[:, 1])
+
+
+def make_prediction(model, input_data: pd.DataFrame, monitor=None) -> dict:
     """
-    Run inference on a single-row DataFrame.
+    Run inference on a single-row DataFrame (or a single applicant dict for a CompiledModel).
+
+    A src.monitor.DriftMonitor passed as `monitor` records the inputs and P(bad).
 
     Returns a dict with:
         - prediction: int (0=good, 1=bad)
         - risk_label: str
         - confidence: float (0–100)
+        - default_probability: float (0–100)
     """
-    prediction = model.predict(input_data)[0]
-    probabilities = model.predict_proba(input_data)[0]
+    model = resolve_model(model)
+    default_prob = float(predict_default_proba(model, input_data)[0])
+    if monitor is not None:
+        if isinstance(input_data, pd.DataFrame):
+            monitor.observe_batch(input_data, [default_prob])
+        else:
+            monitor.observe(input_data, default_prob)
+    prediction = int(default_prob > decision_threshold(model))
+    confidence = default_prob if prediction == 1 else 1.0 - default_prob
+
+    return {
+        'prediction': prediction,
+        'risk_label': RISK_LABELS[prediction],
+        'confidence': round(confidence * 100, 1),
+        'default_probability': round(default_prob * 100, 1),
+    }
+
+
+def _score_frame(model, X: pd.DataFrame, monitor=None, shadow=None) -> pd.DataFrame:
+    """Score one chunk column-wise; mirrors make_prediction without per-row dicts."""
+    model = resolve_model(model)
+    default_prob = predict_default_proba(model, X) if len(X) else np.empty(0, dtype=np.float32)
+    if monitor is not None and len(X):
+        monitor.observe_batch(X, default_prob)
+    prediction = (default_prob > decision_threshold(model)).astype(np.int8)
+    if shadow is not None and len(X):
+        shadow.submit(X, default_prob, prediction)
+    confidence = np.where(prediction == 1, default_prob, 1.0 - default_prob)
+
+    return pd.DataFrame(
+        {
+            'prediction': prediction,
+            'risk_label': pd.Categorical.from_codes(prediction, categories=RISK_LABELS),
+            'confidence': np.round(confidence * 100, 1),
+            'default_probability': np.round(default_prob * 100, 1),
+        },
+        index=X.index,
+    )
+
+
+def _score_chunk(model, chunk: pd.DataFrame, indicators: list = None, monitor=None, shadow=None) -> pd.DataFrame:
+    scored = _score_frame(model, chunk, monitor, shadow)
+    if not indicators:
+        return scored
+    flags = evaluate_indicators(chunk, indicators)
+    return pd.concat([scored, flags], axis=1)
+
+
+def make_prediction_batch(model, data, indicators: list = None, monitor=None, shadow=None) -> dict:
+    """
+    Score a DataFrame, or an iterable of DataFrame chunks, with one predict_proba call per chunk.
+
+    `data` may be a DataFrame, a `pd.read_csv(..., chunksize=...)` reader or the
+    generator returned by `src.data.iter_data_chunks`. Pass `indicators`
+    (e.g. `src.rules.INDICATORS`) to append the dashboard's risk-indicator columns,
+    a src.monitor.DriftMonitor as `monitor` to record the scored traffic, and a
+    src.shadow.ShadowScorer as `shadow` to have a challenger re-score each chunk
+    in the background.
+
+    Returns a dict with:
+        - predictions: DataFrame with prediction, risk_label, confidence, default_probability
+        - n_rows: int
+        - elapsed_s: float
+        - rows_per_sec: float
+    """
+    model = resolve_model(model)
+    chunks = [data] if isinstance(data, pd.DataFrame) else data
+
+    start = time.perf_counter()
+    frames = [_score_chunk(model, chunk, indicators, monitor, shadow) for chunk in chunks]
+    elapsed = time.perf_counter() - start
 
-    if prediction == 1:
-        risk_label = "High Risk (Bad)"
-        confidence = probabilities[1] * 100
-    else:
-        risk_label = "Low Risk (Good)"
-        confidence = probabilities[0] * 100
+    if not frames:
+        frames = [_score_frame(model, pd.DataFrame())]
+    predictions = pd.concat(frames) if len(frames) > 1 else frames[0]
+    n_rows = len(predictions)
 
     return {
-        'prediction': int(prediction),
-        'risk_label': risk_label,
-        'confidence': round(confidence, 1),
-        'default_probability': round(float(probabilities[1]) * 100, 1),
+        'predictions': predictions,
+        'n_rows': n_rows,
+        'elapsed_s': elapsed,
+        'rows_per_sec': n_rows / elapsed if elapsed > 0 else float('inf'),
     }
@@ -0,0 +1,129 @@
+# ABOUTME: In-memory LRU + TTL cache of make_prediction results keyed on normalized applicant features.
+# ABOUTME: Provides PredictionCache, shared by the Streamlit app and the standalone scoring service.
+
+import hashlib
+import json
+import math
+import threading
+import time
+from collections import OrderedDict
+
+import pandas as pd
+
+from src.features import INPUT_FEATURES
+from src.predict import decision_threshold, make_prediction
+
+
+def model_version(model):
+    """Cache namespace for a model: its `version` (or identity) plus its decision threshold."""
+    version = getattr(model, 'version', None)
+    version = version if version is not None else f'id:{id(model)}'
+    return f'{version}@{decision_threshold(model)}'
+
+
+def _normalize(value):
+    """Canonical JSON-safe form so 18, 18.0 and np.int16(18) hash alike."""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return value.strip()
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return str(value).strip()
+    if math.isnan(number):
+        return None
+    return int(number) if number.is_integer() else number
+
+
+def feature_key(record, version) -> str:
+    """Hash the nine input features of a dict or single-row DataFrame together with the model version."""
+    if isinstance(record, pd.DataFrame):
+        record = record.iloc[0].to_dict()
+    values = [_normalize(record.get(feature)) for feature in INPUT_FEATURES]
+    payload = json.dumps([str(version), values], separators=(',', ':'))
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+class PredictionCache:
+    """
+    Thread-safe LRU cache of prediction dicts with a per-entry time-to-live.
+
+    Entries are namespaced by model version; the first lookup under a new
+    version clears everything cached for the previous one.
+    """
+
+    def __init__(self, max_entries: int = 4096, ttl: float = 900.0, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._version = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def _check_version(self, version):
+        if version != self._version:
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+            self._version = version
+
+    def get(self, record, version):
+        """Return a copy of the cached prediction, or None on a miss or expired entry."""
+        key = feature_key(record, version)
+        with self._lock:
+            self._check_version(version)
+            entry = self._entries.get(key)
+            if entry is not None and self._clock() - entry[0] > self.ttl:
+                del self._entries[key]
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return dict(entry[1])
+
+    def put(self, record, version, result: dict):
+        key = feature_key(record, version)
+        with self._lock:
+            self._check_version(version)
+            self._entries[key] = (self._clock(), dict(result))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def predict(self, model, input_data) -> dict:
+        """Cached make_prediction: score only when this applicant and model version are not cached."""
+        version = model_version(model)
+        result = self.get(input_data, version)
+        if result is None:
+            result = make_prediction(model, input_data)
+            self.put(input_data, version, result)
+        return result
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl_s': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'invalidations': self.invalidations,
+            }
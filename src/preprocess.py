@@ -6,8 +6,8 @@ from sklearn.compose import ColumnTransformer
 from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import OneHotEncoder, StandardScaler
 
-NUMERIC_FEATURES = ['Age', 'Credit amount', 'Duration']
-CATEGORICAL_FEATURES = ['Sex', 'Job', 'Housing', 'Saving accounts', 'Checking account', 'Purpose']
+from src import instrument
+from src.features import CATEGORICAL_FEATURES, NUMERIC_FEATURES
 
 
 def build_preprocessor() -> ColumnTransformer:
@@ -22,6 +22,7 @@ def build_preprocessor() -> ColumnTransformer:
 
 def split_data(df: pd.DataFrame, test_size: float = 0.2, random_state: int = 42):
     """Split a cleaned DataFrame into X_train, X_test, y_train, y_test."""
-    y = df['Risk']
-    X = df.drop('Risk', axis=1)
-    return train_test_split(X, y, test_size=test_size, random_state=random_state, stratify=y)
+    with instrument.stage('split_data', rows=len(df), test_size=test_size):
+        y = df['Risk']
+        X = df.drop('Risk', axis=1)
+        return train_test_split(X, y, test_size=test_size, random_state=random_state, stratify=y)
@@ -0,0 +1,187 @@
+# ABOUTME: Local model registry of versioned artifacts with an atomically switched CURRENT pointer.
+# ABOUTME: Provides register()/promote() for training and ModelHandle, which hot-swaps promoted versions.
+
+import argparse
+import os
+import shutil
+import threading
+import uuid
+from datetime import datetime, timezone
+
+from src.artifact import load_artifact, load_manifest, save_artifact
+
+REGISTRY_DIR = os.path.join('models', 'registry')
+CURRENT_FILE = 'CURRENT'
+
+
+def _atomic_write(path: str, text: str):
+    tmp = f'{path}.{uuid.uuid4().hex}.tmp'
+    with open(tmp, 'w') as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def register(model, metrics: dict = None, registry_dir: str = REGISTRY_DIR, version: str = None) -> str:
+    """
+    Save a fitted pipeline (or CompiledModel) as a new registry version and return its name.
+
+    Numeric entries of `metrics` (e.g. evaluate_model's accuracy and roc_auc)
+    are stored in the manifest. The version is not served until promote().
+    """
+    version = version or datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S_%f')
+    target = os.path.join(registry_dir, version)
+    if os.path.exists(target):
+        raise FileExistsError(f"Model version {version!r} already exists in {registry_dir}")
+
+    tmp = os.path.join(registry_dir, f'.tmp-{version}-{uuid.uuid4().hex}')
+    metadata = {'metrics': {k: float(v) for k, v in (metrics or {}).items() if isinstance(v, (int, float))}}
+    save_artifact(model, tmp, version=version, metadata=metadata)
+    os.rename(tmp, target)
+    return version
+
+
+def promote(version: str, registry_dir: str = REGISTRY_DIR):
+    """Point CURRENT at `version`; running ModelHandles pick it up on their next poll."""
+    load_manifest(os.path.join(registry_dir, version))
+    _atomic_write(os.path.join(registry_dir, CURRENT_FILE), version)
+
+
+def current_version(registry_dir: str = REGISTRY_DIR):
+    try:
+        with open(os.path.join(registry_dir, CURRENT_FILE)) as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def list_versions(registry_dir: str = REGISTRY_DIR) -> list:
+    """Return the manifests of every complete version, oldest first."""
+    if not os.path.isdir(registry_dir):
+        return []
+    manifests = []
+    for name in sorted(os.listdir(registry_dir)):
+        path = os.path.join(registry_dir, name)
+        if name.startswith('.') or not os.path.isdir(path):
+            continue
+        try:
+            manifests.append(load_manifest(path))
+        except (FileNotFoundError, ValueError):
+            continue
+    return manifests
+
+
+def remove_version(version: str, registry_dir: str = REGISTRY_DIR):
+    if version == current_version(registry_dir):
+        raise ValueError(f"Cannot remove {version!r} while it is the current version")
+    shutil.rmtree(os.path.join(registry_dir, version))
+
+
+class ModelHandle:
+    """
+    A model reference that follows the registry's CURRENT pointer.
+
+    A background thread polls CURRENT every `poll_interval` seconds. When it
+    changes, the new version is loaded in full while the old model keeps
+    serving, and then the reference is swapped in one assignment. The handle
+    exposes predict_proba, so it can be passed anywhere a model is expected;
+    the src.predict scoring functions read `handle.model` once per call, so a
+    swap mid-call never mixes two versions.
+    `fallback` is an artifact directory used while the registry is empty.
+    """
+
+    def __init__(self, registry_dir: str = REGISTRY_DIR, fallback: str = None, poll_interval: float = 2.0):
+        self.registry_dir = registry_dir
+        self.fallback = fallback
+        self.poll_interval = poll_interval
+        self._model = None
+        self._error = None
+        self._ready = threading.Event()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='model-handle', daemon=True)
+        self._thread.start()
+
+    @property
+    def model(self):
+        """The currently served model; blocks until the first version has loaded."""
+        self._ready.wait()
+        if self._model is None:
+            raise self._error
+        return self._model
+
+    @property
+    def version(self):
+        return self.model.version
+
+    @property
+    def decision_threshold(self):
+        return self.model.decision_threshold
+
+    @property
+    def calibrator(self):
+        return self.model.calibrator
+
+    @property
+    def profile(self):
+        return self.model.profile
+
+    def predict_proba(self, X):
+        return self.model.predict_proba(X)
+
+    def close(self):
+        self._stop.set()
+        self._thread.join()
+
+    def refresh(self) -> bool:
+        """Load CURRENT if it differs from the served version; return True if a swap happened."""
+        version = current_version(self.registry_dir)
+        if version is None:
+            if self._model is not None:
+                return False
+            if self.fallback is None:
+                raise FileNotFoundError(f"No promoted model in '{self.registry_dir}'")
+            path = self.fallback
+        elif self._model is not None and self._model.version == version:
+            return False
+        else:
+            path = os.path.join(self.registry_dir, version)
+
+        self._model = load_artifact(path)
+        return True
+
+    def _run(self):
+        while True:
+            try:
+                self.refresh()
+            except Exception as exc:
+                # Keep serving the previous model; surface the error only if there is none
+                self._error = exc
+            self._ready.set()
+            if self._stop.wait(self.poll_interval):
+                return
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Inspect and promote registered model versions.')
+    parser.add_argument('--registry', default=REGISTRY_DIR)
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('list')
+    promote_cmd = commands.add_parser('promote')
+    promote_cmd.add_argument('version')
+    args = parser.parse_args()
+
+    if args.command == 'promote':
+        promote(args.version, args.registry)
+        print(f"Promoted {args.version}")
+        return
+
+    current = current_version(args.registry)
+    for manifest in list_versions(args.registry):
+        marker = '*' if manifest['model_version'] == current else ' '
+        metrics = ', '.join(f'{k}={v:.4f}' for k, v in manifest['metadata'].get('metrics', {}).items())
+        print(f"{marker} {manifest['model_version']}  {manifest['created_at']}  {metrics}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+# ABOUTME: Vectorized risk-indicator rules shared by the dashboard and batch scoring.
+# ABOUTME: Provides CategoryIndicator, RangeIndicator, INDICATORS and evaluate_indicators() over whole DataFrames.
+
+import numpy as np
+import pandas as pd
+
+
+class CategoryIndicator:
+    """Passes when the column's value is one of `good_values`."""
+
+    def __init__(self, name: str, label: str, column: str, good_values, good_desc: str, bad_desc: str):
+        self.name = name
+        self.label = label
+        self.column = column
+        self.good_values = list(good_values)
+        self.good_desc = good_desc
+        self.bad_desc = bad_desc
+
+    def evaluate(self, df: pd.DataFrame):
+        """Return (ok bool array, description Categorical) for every row."""
+        ok = df[self.column].isin(self.good_values).to_numpy()
+        return ok, pd.Categorical.from_codes(ok.astype(np.int8), categories=[self.bad_desc, self.good_desc])
+
+    def display(self, value) -> str:
+        return str(value).title()
+
+
+class RangeIndicator:
+    """
+    Buckets a numeric column by right-inclusive upper `edges`; bucket i has
+    description `descs[i]` and passes when `goods[i]` is true. There is one
+    more bucket than edges, for values above the last edge. Missing values
+    get `missing_desc` and do not pass.
+    """
+
+    def __init__(self, name: str, label: str, column: str, edges, descs, goods, unit: str = '',
+                 missing_desc: str = 'Not provided'):
+        if len(descs) != len(edges) + 1 or len(goods) != len(descs):
+            raise ValueError(f"{name}: need len(edges) + 1 descs and goods")
+        self.name = name
+        self.label = label
+        self.column = column
+        self.edges = np.asarray(edges)
+        self.descs = list(descs)
+        self.goods = np.asarray(goods, dtype=bool)
+        self.unit = unit
+        self.missing_desc = missing_desc
+
+    def evaluate(self, df: pd.DataFrame):
+        values = df[self.column].to_numpy(dtype=np.float64, na_value=np.nan)
+        missing = np.isnan(values)
+        # searchsorted sorts NaN after every edge, so missing rows are relabelled below
+        bucket = np.searchsorted(self.edges, values, side='left')
+        categories = list(dict.fromkeys(self.descs + [self.missing_desc]))
+        codes = np.array([categories.index(d) for d in self.descs], dtype=np.int8)[bucket]
+        codes[missing] = categories.index(self.missing_desc)
+        return self.goods[bucket] & ~missing, pd.Categorical.from_codes(codes, categories=categories)
+
+    def display(self, value) -> str:
+        if pd.isna(value):
+            return self.missing_desc
+        return f"{value} {self.unit}".strip()
+
+
+def build_indicator(spec: dict):
+    """Create an indicator from a config dict with 'type': 'category' or 'range' plus constructor fields."""
+    spec = dict(spec)
+    kind = spec.pop('type')
+    if kind == 'category':
+        return CategoryIndicator(**spec)
+    if kind == 'range':
+        return RangeIndicator(**spec)
+    raise ValueError(f"Unknown indicator type {kind!r}")
+
+
+INDICATORS = [
+    CategoryIndicator(
+        'savings', 'Savings Account', 'Saving accounts', {'quite rich', 'rich', 'moderate'},
+        'Strong savings buffer', 'Insufficient savings',
+    ),
+    CategoryIndicator(
+        'checking', 'Checking Account', 'Checking account', {'rich', 'moderate'},
+        'Adequate liquidity', 'Low account balance',
+    ),
+    RangeIndicator(
+        'duration', 'Loan Duration', 'Duration', edges=[12, 24],
+        descs=['Short-term loan', 'Medium-term loan', 'Long-term exposure'],
+        goods=[True, True, False], unit='mo',
+    ),
+]
+
+
+def evaluate_indicators(df: pd.DataFrame, indicators: list = None) -> pd.DataFrame:
+    """
+    Evaluate every indicator over all rows at once.
+
+    Returns a DataFrame indexed like `df` with `<name>_ok` (bool) and
+    `<name>_desc` (categorical) columns per indicator.
+    """
+    columns = {}
+    for indicator in indicators or INDICATORS:
+        ok, desc = indicator.evaluate(df)
+        columns[f'{indicator.name}_ok'] = ok
+        columns[f'{indicator.name}_desc'] = desc
+    return pd.DataFrame(columns, index=df.index)
+
+
+def indicator_rows(df: pd.DataFrame, indicators: list = None, row: int = 0) -> list:
+    """Return [{label, value, desc, good}] for one row, ready for the dashboard's indicator panel."""
+    indicators = indicators or INDICATORS
+    flags = evaluate_indicators(df.iloc[[row]], indicators)
+    return [
+        {
+            'label': ind.label,
+            'value': ind.display(df[ind.column].iloc[row]),
+            'desc': flags[f'{ind.name}_desc'].iloc[0],
+            'good': bool(flags[f'{ind.name}_ok'].iloc[0]),
+        }
+        for ind in indicators
+    ]
@@ -0,0 +1,248 @@
+# ABOUTME: Parallel batch scoring of applicant files: chunks fan out to worker processes that each load the model once.
+# ABOUTME: Provides plan_chunks() and score_file(); finished chunks are checkpointed so interrupted runs resume.
+
+import csv
+import io
+import json
+import multiprocessing
+import os
+import shutil
+import signal
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+from src.data import CSV_OPTIONS, _is_parquet, clean_data
+from src.features import INPUT_FEATURES
+from src.predict import make_prediction_batch
+
+PLAN_FILE = 'plan.json'
+SCAN_BYTES = 1 << 24
+
+# Set once per worker process by _init_worker
+_worker = {}
+
+
+def plan_chunks(path: str, chunksize: int) -> dict:
+    """
+    Split an applicant file into independently readable chunks of about `chunksize` rows.
+
+    CSVs are cut at line ends into byte ranges (one record per line, as the
+    dataset's files are), found with one vectorized newline scan; each Parquet
+    row group is cut into equal row-offset slices. Workers read their own
+    ranges, so the parent never parses the file.
+    """
+    if _is_parquet(path):
+        import pyarrow.parquet as pq
+
+        metadata = pq.ParquetFile(path).metadata
+        chunks = []
+        for i in range(metadata.num_row_groups):
+            n_rows = metadata.row_group(i).num_rows
+            bounds = np.linspace(0, n_rows, max(1, -(-n_rows // chunksize)) + 1).round().astype(int)
+            chunks += [{'row_group': i, 'offset': int(a), 'rows': int(b - a)} for a, b in zip(bounds, bounds[1:])]
+        return {'format': 'parquet', 'columns': None, 'chunks': chunks}
+
+    with open(path, 'rb') as f:
+        header = f.readline()
+        start = pos = f.tell()
+        chunks, rows = [], 0
+        while True:
+            block = f.read(SCAN_BYTES)
+            if not block:
+                break
+            ends = np.flatnonzero(np.frombuffer(block, dtype=np.uint8) == 10) + pos + 1
+            cuts = np.arange(chunksize - rows - 1, len(ends), chunksize)
+            for end in ends[cuts]:
+                chunks.append({'start': start, 'end': int(end)})
+                start = int(end)
+            rows = len(ends) - cuts[-1] - 1 if len(cuts) else rows + len(ends)
+            pos += len(block)
+        if pos > start:
+            chunks.append({'start': start, 'end': pos})
+
+    # Match pandas' names for header cells left blank (the dataset's index column)
+    names = next(csv.reader([header.decode('utf-8-sig')]))
+    columns = [name or f'Unnamed: {i}' for i, name in enumerate(names)]
+    return {'format': 'csv', 'columns': columns, 'chunks': chunks}
+
+
+def read_chunk(path: str, plan: dict, chunk: dict) -> pd.DataFrame:
+    """Read and clean one planned chunk with the load_data() schema and cleaning rules."""
+    if plan['format'] == 'parquet':
+        import pyarrow.parquet as pq
+
+        # Parquet has no row-level seek, so the slice is cut from its decoded row group
+        table = pq.ParquetFile(path).read_row_group(chunk['row_group'])
+        return clean_data(table.slice(chunk['offset'], chunk['rows']).to_pandas())
+    with open(path, 'rb') as f:
+        f.seek(chunk['start'])
+        data = f.read(chunk['end'] - chunk['start'])
+    return clean_data(pd.read_csv(io.BytesIO(data), header=None, names=plan['columns'], **CSV_OPTIONS))
+
+
+def _single_threaded(model):
+    # One XGBoost thread per worker; the pool provides the parallelism
+    booster = getattr(model, 'booster', None)
+    if booster is not None:
+        booster.set_param({'nthread': 1})
+    elif hasattr(model, 'named_steps'):
+        model.named_steps['classifier'].set_params(n_jobs=1)
+    return model
+
+
+def _init_worker(model_path: str, input_path: str, plan: dict, parts_dir: str, output_format: str,
+                 indicators: bool):
+    # Ctrl-C is handled by the parent, which cancels queued chunks and lets running ones finish
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    from src.audit import load_model
+    from src.rules import INDICATORS
+
+    _worker.update(
+        model=_single_threaded(load_model(model_path)), input_path=input_path, plan=plan,
+        parts_dir=parts_dir, output_format=output_format, indicators=INDICATORS if indicators else None,
+    )
+
+
+def _part_path(parts_dir: str, index: int, output_format: str) -> str:
+    return os.path.join(parts_dir, f'part-{index:06d}.{output_format}')
+
+
+def _score_chunk(index: int) -> tuple:
+    """Worker task: read, score and write one chunk; the part file appears atomically when done."""
+    start = time.perf_counter()
+    chunk = read_chunk(_worker['input_path'], _worker['plan'], _worker['plan']['chunks'][index])
+    features = chunk[INPUT_FEATURES]
+    scored = make_prediction_batch(_worker['model'], features, indicators=_worker['indicators'])['predictions']
+    result = pd.concat([features, scored], axis=1)
+
+    path = _part_path(_worker['parts_dir'], index, _worker['output_format'])
+    tmp = path + '.tmp'
+    if _worker['output_format'] == 'parquet':
+        result.to_parquet(tmp, index=False, compression='zstd')
+    else:
+        result.to_csv(tmp, index=False)
+    os.replace(tmp, path)
+    return index, len(result), time.perf_counter() - start
+
+
+def _fingerprint(path: str) -> list:
+    if os.path.isdir(path):
+        path = os.path.join(path, 'manifest.json')
+    stat = os.stat(path)
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def _load_plan(input_path: str, model_path: str, parts_dir: str, chunksize: int, output_format: str,
+               indicators: bool) -> dict:
+    """Reuse the checkpointed plan when the run matches it; otherwise start a fresh one."""
+    key = {
+        'input': os.path.abspath(input_path), 'input_fingerprint': _fingerprint(input_path),
+        'model': os.path.abspath(model_path), 'model_fingerprint': _fingerprint(model_path),
+        'chunksize': chunksize, 'output_format': output_format, 'indicators': indicators,
+    }
+    plan_path = os.path.join(parts_dir, PLAN_FILE)
+    if os.path.exists(plan_path):
+        with open(plan_path) as f:
+            plan = json.load(f)
+        if plan['key'] == key:
+            return plan
+        print(f"  Checkpoint in {parts_dir} is for a different input, model or setting; starting over")
+        shutil.rmtree(parts_dir)
+
+    os.makedirs(parts_dir, exist_ok=True)
+    plan = {'key': key, **plan_chunks(input_path, chunksize)}
+    with open(plan_path + '.tmp', 'w') as f:
+        json.dump(plan, f)
+    os.replace(plan_path + '.tmp', plan_path)
+    return plan
+
+
+def merge_parts(parts: list, output_path: str, output_format: str):
+    """Concatenate part files in chunk order into `output_path`."""
+    tmp = output_path + '.tmp'
+    if output_format == 'parquet':
+        import pyarrow.parquet as pq
+
+        writer = None
+        for part in parts:
+            table = pq.read_table(part)
+            if writer is None:
+                writer = pq.ParquetWriter(tmp, table.schema, compression='zstd')
+            writer.write_table(table)
+        if writer is not None:
+            writer.close()
+    else:
+        with open(tmp, 'wb') as out:
+            for i, part in enumerate(parts):
+                with open(part, 'rb') as f:
+                    header = f.readline()
+                    if i == 0:
+                        out.write(header)
+                    shutil.copyfileobj(f, out)
+    os.replace(tmp, output_path)
+
+
+def score_file(input_path: str, output_path: str, model_path: str, chunksize: int = 250_000, workers: int = None,
+               parts_dir: str = None, indicators: bool = False, keep_parts: bool = False, progress: bool = True) -> dict:
+    """
+    Score every applicant in `input_path` and write the results to `output_path` in input order.
+
+    Each chunk is scored by a worker process that loaded the model once, and
+    written as its own part file under `parts_dir` (default `<output>.parts`).
+    Re-running the same command after an interruption skips the parts already
+    written. The parts are merged in chunk order at the end and then removed
+    unless `keep_parts`. Output is Parquet or CSV, by the output extension.
+    `progress` prints a line per finished chunk.
+
+    Returns a dict with rows (scored in this run), chunks, resumed_chunks, elapsed_s,
+    rows_per_sec and workers.
+    """
+    output_format = 'parquet' if _is_parquet(output_path) else 'csv'
+    parts_dir = parts_dir or output_path + '.parts'
+    workers = workers or os.cpu_count() or 1
+    plan = _load_plan(input_path, model_path, parts_dir, chunksize, output_format, indicators)
+
+    n_chunks = len(plan['chunks'])
+    pending = [i for i in range(n_chunks) if not os.path.exists(_part_path(parts_dir, i, output_format))]
+    resumed = n_chunks - len(pending)
+    if resumed:
+        print(f"  Resuming: {resumed} of {n_chunks} chunks already scored")
+
+    rows = 0
+    start = time.perf_counter()
+    if pending:
+        # Spawned workers: forking a parent that already runs threads (XGBoost, pyarrow) can deadlock
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(pending)), mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_worker,
+            initargs=(model_path, input_path, plan, parts_dir, output_format, indicators),
+        ) as pool:
+            futures = [pool.submit(_score_chunk, i) for i in pending]
+            try:
+                for done, future in enumerate(as_completed(futures), 1):
+                    index, n_rows, _ = future.result()
+                    rows += n_rows
+                    if progress:
+                        elapsed = time.perf_counter() - start
+                        print(f"  [{resumed + done}/{n_chunks}] chunk {index}: {n_rows:,} rows · "
+                              f"{rows / elapsed:,.0f} rows/sec")
+            except BaseException:
+                pool.shutdown(wait=True, cancel_futures=True)
+                raise
+
+    merge_parts([_part_path(parts_dir, i, output_format) for i in range(n_chunks)], output_path, output_format)
+    if not keep_parts:
+        shutil.rmtree(parts_dir)
+    elapsed = time.perf_counter() - start
+
+    return {
+        'rows': rows,
+        'chunks': n_chunks,
+        'resumed_chunks': resumed,
+        'elapsed_s': elapsed,
+        'rows_per_sec': rows / elapsed if elapsed > 0 else float('inf'),
+        'workers': workers,
+    }
@@ -0,0 +1,163 @@
+# ABOUTME: Hyperparameter search strategies that reuse cached, preprocessed cross-validation folds.
+# ABOUTME: Provides build_fold_cache(), grid_search() and halving_search() used by train_model().
+
+import itertools
+import math
+import time
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from sklearn.metrics import recall_score
+from sklearn.model_selection import StratifiedKFold
+from xgboost import XGBClassifier
+
+from src import instrument
+from src.preprocess import build_preprocessor
+
+
+def build_fold_cache(X: pd.DataFrame, y: pd.Series, cv: int = 5, random_state: int = 42) -> list:
+    """
+    Fit the preprocessor once per fold and keep the transformed matrices.
+
+    Each entry is a dict with X_train, y_train, X_val, y_val and val_index
+    (positions into X). Training rows are ordered so that every prefix keeps
+    the fold's class ratio, which lets halving_search subsample by slicing.
+    """
+    y_arr = np.asarray(y)
+    rng = np.random.default_rng(random_state)
+    folds = []
+    with instrument.stage('build_fold_cache', rows=len(X), cv=cv):
+        for train_idx, val_idx in StratifiedKFold(n_splits=cv).split(X, y_arr):
+            train_idx = _stratified_order(train_idx, y_arr, rng)
+            preprocessor = build_preprocessor().fit(X.iloc[train_idx])
+            folds.append({
+                'X_train': np.asarray(preprocessor.transform(X.iloc[train_idx]), dtype=np.float32),
+                'y_train': y_arr[train_idx],
+                'X_val': np.asarray(preprocessor.transform(X.iloc[val_idx]), dtype=np.float32),
+                'y_val': y_arr[val_idx],
+                'val_index': val_idx,
+            })
+    return folds
+
+
+def _stratified_order(index: np.ndarray, y: np.ndarray, rng) -> np.ndarray:
+    # Shuffle, then sort by each row's relative position within its class
+    index = rng.permutation(index)
+    position = np.empty(len(index))
+    for cls in np.unique(y[index]):
+        mask = y[index] == cls
+        position[mask] = np.arange(mask.sum()) / mask.sum()
+    return index[np.argsort(position, kind='stable')]
+
+
+def expand_grid(param_grid: dict) -> list:
+    """Turn a {'classifier__name': [values]} grid into a list of XGBClassifier kwargs."""
+    names = [name.removeprefix('classifier__') for name in param_grid]
+    return [dict(zip(names, values)) for values in itertools.product(*param_grid.values())]
+
+
+def _fit_score(fold: dict, params: dict, base_params: dict, n_rows: int, fold_number: int = 0):
+    start = time.perf_counter()
+    classifier = XGBClassifier(**{**base_params, **params, 'n_jobs': 1})
+    classifier.fit(fold['X_train'][:n_rows], fold['y_train'][:n_rows])
+    fitted = time.perf_counter()
+    val_proba = classifier.predict_proba(fold['X_val'])[:, 1]
+    score = recall_score(fold['y_val'], val_proba > 0.5)
+    instrument.emit('cv_candidate', params=params, fold=fold_number, rows=n_rows,
+                    fit_s=round(fitted - start, 6), score_s=round(time.perf_counter() - fitted, 6),
+                    recall=score)
+    return score, val_proba
+
+
+def _evaluate(folds: list, candidates: list, base_params: dict, row_fraction: float, n_jobs: int):
+    """Score every candidate on every fold; return mean scores and the best candidate's out-of-fold probabilities."""
+    n_folds = len(folds)
+    tasks = (
+        delayed(_fit_score)(fold, params, base_params, max(1, int(len(fold['y_train']) * row_fraction)), i)
+        for params in candidates for i, fold in enumerate(folds)
+    )
+    results = Parallel(n_jobs=n_jobs, prefer='threads', return_as='generator')(tasks)
+
+    mean_scores = np.empty(len(candidates))
+    best_oof, current = None, []
+    for i, (score, val_proba) in enumerate(results):
+        current.append((score, val_proba))
+        if len(current) < n_folds:
+            continue
+        c = i // n_folds
+        mean_scores[c] = np.mean([s for s, _ in current])
+        if best_oof is None or mean_scores[c] > mean_scores[:c].max():
+            best_oof = [p for _, p in current]
+        current = []
+    return mean_scores, best_oof
+
+
+def _result(folds, candidates, scores, oof_parts, n_fits, start) -> dict:
+    oof_proba = np.empty(sum(len(f['y_val']) for f in folds), dtype=np.float32)
+    for fold, part in zip(folds, oof_parts):
+        oof_proba[fold['val_index']] = part
+    best = int(np.argmax(scores))
+    return {
+        'best_params': candidates[best],
+        'best_score': float(scores[best]),
+        'n_fits': n_fits,
+        'elapsed_s': time.perf_counter() - start,
+        'oof_proba': oof_proba,
+    }
+
+
+def grid_search(folds: list, param_grid: dict, base_params: dict, n_jobs: int = -1) -> dict:
+    """Exhaustive search over every grid point, scored by mean recall over the cached folds."""
+    start = time.perf_counter()
+    candidates = expand_grid(param_grid)
+    scores, oof_parts = _evaluate(folds, candidates, base_params, 1.0, n_jobs)
+    return _result(folds, candidates, scores, oof_parts, len(candidates) * len(folds), start)
+
+
+def halving_search(folds: list, param_grid: dict, base_params: dict, n_jobs: int = -1,
+                   factor: int = 3, min_rows: int = 100) -> dict:
+    """
+    Successive halving: score all candidates on a small slice of each fold's
+    training rows, keep the best 1/factor, and grow the slice by `factor`
+    until the survivors are compared on the full folds.
+
+    When the folds are too small for enough rungs of at least `min_rows`,
+    candidates are eliminated more aggressively so that only about `factor`
+    of them reach the full-data rung. Early rungs also score on only a
+    matching share of the folds. If the rungs would still take as many fits
+    as the plain grid, this runs grid_search instead.
+    """
+    start = time.perf_counter()
+    candidates = expand_grid(param_grid)
+    full_rows = min(len(f['y_train']) for f in folds)
+    n_rungs = min(
+        max(1, math.ceil(math.log(len(candidates), factor))),
+        1 + max(0, math.floor(math.log(max(full_rows / min_rows, 1), factor))),
+    )
+    elimination = max(factor, (len(candidates) / factor) ** (1 / (n_rungs - 1))) if n_rungs > 1 else factor
+    fractions = [float(factor) ** (rung - n_rungs + 1) for rung in range(n_rungs)]
+    fold_counts = [max(1, math.ceil(len(folds) * fraction)) for fraction in fractions]
+
+    planned, survivors = 0, len(candidates)
+    for n_folds in fold_counts:
+        planned += survivors * n_folds
+        survivors = math.ceil(survivors / elimination)
+    if n_rungs == 1 or planned >= len(candidates) * len(folds):
+        return grid_search(folds, param_grid, base_params, n_jobs)
+
+    n_fits = 0
+    for rung, (row_fraction, n_folds) in enumerate(zip(fractions, fold_counts)):
+        scores, oof_parts = _evaluate(folds[:n_folds], candidates, base_params, row_fraction, n_jobs)
+        n_fits += len(candidates) * n_folds
+        if rung == n_rungs - 1:
+            break
+        keep = np.argsort(-scores, kind='stable')[:math.ceil(len(candidates) / elimination)]
+        candidates = [candidates[i] for i in sorted(keep)]
+
+    return _result(folds, candidates, scores, oof_parts, n_fits, start)
+
+SEARCH_STRATEGIES = {
+    'grid': grid_search,
+    'halving': halving_search,
+}
@@ -0,0 +1,326 @@
+# ABOUTME: Standalone HTTP scoring service that groups concurrent requests into micro-batches.
+# ABOUTME: Run `python -m src.serve` to serve POST /predict, GET /stats, GET /drift and GET /health.
+
+import argparse
+import json
+import os
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from src.predict import make_prediction_batch, resolve_model
+from src.audit import AuditLog
+from src.monitor import monitor_for
+from src.prediction_cache import PredictionCache, model_version
+from src.data import NUMERIC_COLUMNS
+from src.features import INPUT_FEATURES, NUMERIC_FEATURES
+from src.registry import ModelHandle
+from src.shadow import load_shadow
+
+MODEL_PATH = os.path.join('models', 'credit_risk_model_v2.pkl')
+
+_STOP = object()
+
+
+def validate_record(record) -> dict:
+    """
+    Return the applicant's features with numbers coerced, or raise ValueError.
+
+    Numeric inputs (including the Job code) may be JSON numbers or numeric
+    strings, and the other categoricals must be strings. Any feature may be
+    null, which the model scores as missing.
+    """
+    if not isinstance(record, dict):
+        raise ValueError(f'body must be a JSON object of features, not {type(record).__name__}')
+    missing = [f for f in INPUT_FEATURES if f not in record]
+    if missing:
+        raise ValueError(f'missing features: {missing}')
+
+    clean, errors = {}, []
+    for feature in INPUT_FEATURES:
+        value = clean[feature] = record[feature]
+        if value is None:
+            continue
+        if feature not in NUMERIC_COLUMNS:
+            if not isinstance(value, str):
+                errors.append(f'{feature} must be a string, got {value!r}')
+            continue
+        try:
+            number = float(value) if not isinstance(value, bool) else np.nan
+        except (TypeError, ValueError):
+            number = np.nan
+        if not np.isfinite(number):
+            errors.append(f'{feature} must be a number, got {value!r}')
+        elif feature in NUMERIC_FEATURES:
+            clean[feature] = number
+        elif number.is_integer():
+            clean[feature] = int(number)
+        else:
+            errors.append(f'{feature} must be a whole number, got {value!r}')
+    if errors:
+        raise ValueError('; '.join(errors))
+    return clean
+
+
+class MicroBatcher:
+    """
+    Collects single-applicant requests from many threads and scores them together.
+
+    The first request of a batch opens a window of `window_ms`; everything that
+    arrives before it closes (up to `max_batch` rows) shares one predict_proba call.
+    With a PredictionCache, repeat applicants are answered without queueing.
+    With `monitor`, every scored batch feeds a src.monitor.DriftMonitor built
+    from the served model's reference profile. With `audit`, a src.audit.AuditLog,
+    every scored batch is queued for the audit log. With `shadow`, a
+    src.shadow.ShadowScorer, a challenger re-scores each batch on its own pool.
+    """
+
+    def __init__(self, model, window_ms: float = 5.0, max_batch: int = 256, latency_samples: int = 10_000,
+                 cache: PredictionCache = None, monitor: bool = False, audit=None, shadow=None):
+        self.model = model
+        self.audit = audit
+        self.shadow = shadow
+        self.cache = cache
+        self.monitor_enabled = monitor
+        self.monitor = None
+        self.window_s = window_ms / 1000.0
+        self.max_batch = max_batch
+        self._queue = queue.Queue()
+        self._latencies = deque(maxlen=latency_samples)
+        self._lock = threading.Lock()
+        self._n_requests = 0
+        self._n_batches = 0
+        self._worker = threading.Thread(target=self._run, name='micro-batcher', daemon=True)
+        self._worker.start()
+
+    def submit(self, record: dict) -> dict:
+        """
+        Score one applicant and block until its batch has been predicted.
+
+        `record` should have passed validate_record(); a record that still fails
+        to score raises here without failing the rest of its batch.
+        """
+        if self.cache is not None:
+            model = resolve_model(self.model)
+            cached = self.cache.get(record, model_version(model))
+            if cached is not None:
+                if self.audit is not None:
+                    self.audit.record(record, cached, getattr(model, 'version', None), source='service')
+                return cached
+        future = Future()
+        self._queue.put((record, future, time.perf_counter()))
+        return future.result()
+
+    def close(self):
+        self._queue.put(_STOP)
+        self._worker.join()
+        if self.shadow is not None:
+            self.shadow.close()
+        if self.audit is not None:
+            self.audit.close()
+
+    def stats(self) -> dict:
+        with self._lock:
+            latencies = np.array(self._latencies) * 1000.0
+            n_requests, n_batches = self._n_requests, self._n_batches
+        p50, p99 = np.percentile(latencies, [50, 99]) if len(latencies) else (0.0, 0.0)
+        stats = {
+            'requests': n_requests,
+            'batches': n_batches,
+            'mean_batch_size': n_requests / n_batches if n_batches else 0.0,
+            'queue_depth': self._queue.qsize(),
+            'latency_p50_ms': round(float(p50), 3),
+            'latency_p99_ms': round(float(p99), 3),
+        }
+        if self.cache is not None:
+            stats['cache'] = self.cache.stats()
+        if self.shadow is not None:
+            stats['shadow'] = self.shadow.stats()
+        return stats
+
+    def drift(self) -> dict:
+        """Drift report of the traffic scored by the current model version."""
+        if self.monitor is None:
+            return {'error': 'drift monitoring is off or the model has no reference profile'}
+        return self.monitor.report()
+
+    def _collect(self, first) -> list:
+        batch = [first]
+        deadline = time.perf_counter() + self.window_s
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is _STOP:
+                self._queue.put(_STOP)
+                break
+            batch.append(item)
+        return batch
+
+    def _score(self, model, batch: list) -> pd.DataFrame:
+        frame = pd.DataFrame.from_records([record for record, _, _ in batch], columns=INPUT_FEATURES)
+        scored = make_prediction_batch(model, frame, monitor=self.monitor, shadow=self.shadow)['predictions']
+        if self.audit is not None:
+            self.audit.record_batch(frame, scored, getattr(model, 'version', None), source='service')
+        return scored
+
+    def _score_each(self, model, batch: list) -> tuple:
+        """Score each item alone, failing the futures of those that raise; returns the rest and their scores."""
+        ok, scored = [], []
+        for item in batch:
+            try:
+                scored.append(self._score(model, [item]))
+                ok.append(item)
+            except Exception as exc:
+                item[1].set_exception(exc)
+        return ok, pd.concat(scored, ignore_index=True) if scored else None
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is _STOP:
+                return
+            batch = self._collect(first)
+
+            # One model snapshot per batch, even if a new version is promoted meanwhile
+            model = resolve_model(self.model)
+            version = model_version(model)
+            try:
+                if self.monitor_enabled:
+                    self.monitor = monitor_for(model, self.monitor)
+                scored = self._score(model, batch)
+            except Exception:
+                # Re-score one by one so a bad record fails only its own request
+                batch, scored = self._score_each(model, batch)
+                if not batch:
+                    continue
+
+            done = time.perf_counter()
+            columns = zip(scored['prediction'], scored['risk_label'], scored['confidence'], scored['default_probability'])
+            for (record, future, submitted), (prediction, label, confidence, default_prob) in zip(batch, columns):
+                result = {
+                    'prediction': int(prediction),
+                    'risk_label': str(label),
+                    'confidence': round(float(confidence), 1),
+                    'default_probability': round(float(default_prob), 1),
+                }
+                if self.cache is not None:
+                    self.cache.put(record, version, result)
+                future.set_result(result)
+
+            with self._lock:
+                self._latencies.extend(done - submitted for _, _, submitted in batch)
+                self._n_requests += len(batch)
+                self._n_batches += 1
+
+
+class ScoringHandler(BaseHTTPRequestHandler):
+    batcher: MicroBatcher = None
+
+    def do_GET(self):
+        if self.path == '/health':
+            self._send(200, {'status': 'ok'})
+        elif self.path == '/stats':
+            self._send(200, self.batcher.stats())
+        elif self.path == '/drift':
+            self._send(200, self.batcher.drift())
+        else:
+            self._send(404, {'error': f'unknown path {self.path}'})
+
+    def do_POST(self):
+        if self.path != '/predict':
+            self._send(404, {'error': f'unknown path {self.path}'})
+            return
+
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            record = json.loads(self.rfile.read(length))
+        except (ValueError, json.JSONDecodeError) as exc:
+            self._send(400, {'error': f'invalid JSON body: {exc}'})
+            return
+
+        try:
+            record = validate_record(record)
+        except ValueError as exc:
+            self._send(400, {'error': str(exc)})
+            return
+
+        try:
+            self._send(200, self.batcher.submit(record))
+        except Exception as exc:
+            self._send(500, {'error': str(exc)})
+
+    def _send(self, status: int, payload: dict):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class ScoringServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+
+def make_server(model, host: str = '127.0.0.1', port: int = 8000, window_ms: float = 5.0, max_batch: int = 256,
+                cache: PredictionCache = None, monitor: bool = False, audit=None, shadow=None):
+    """Build a ThreadingHTTPServer whose handler shares one MicroBatcher."""
+    handler = type('BoundScoringHandler', (ScoringHandler,), {
+        'batcher': MicroBatcher(model, window_ms=window_ms, max_batch=max_batch, cache=cache, monitor=monitor,
+                                audit=audit, shadow=shadow),
+    })
+    return ScoringServer((host, port), handler)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve credit risk predictions over HTTP.')
+    parser.add_argument('--model', default=MODEL_PATH)
+    parser.add_argument('--registry', help='serve the promoted version of this registry and follow promotions')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--window-ms', type=float, default=5.0, help='micro-batch collection window')
+    parser.add_argument('--max-batch', type=int, default=256)
+    parser.add_argument('--cache-size', type=int, default=0, help='cache this many recent predictions (0 disables)')
+    parser.add_argument('--cache-ttl', type=float, default=900.0, help='seconds a cached prediction stays valid')
+    parser.add_argument('--monitor', action='store_true',
+                        help='track input drift against the model\'s reference profile (GET /drift)')
+    parser.add_argument('--audit-dir', help='append every scored decision to a Parquet audit log here')
+    parser.add_argument('--shadow', metavar='CHALLENGER',
+                        help='artifact directory or pickle of a challenger to score every batch in the background')
+    args = parser.parse_args()
+
+    model = ModelHandle(args.registry) if args.registry else joblib.load(args.model)
+    cache = PredictionCache(args.cache_size, args.cache_ttl) if args.cache_size > 0 else None
+    audit = AuditLog(args.audit_dir) if args.audit_dir else None
+    shadow = load_shadow(args.shadow, audit=audit) if args.shadow else None
+    server = make_server(model, args.host, args.port, args.window_ms, args.max_batch, cache, args.monitor, audit,
+                         shadow)
+    print(f"Serving {args.registry or args.model} on http://{args.host}:{args.port} "
+          f"(window={args.window_ms}ms, max_batch={args.max_batch})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        server.RequestHandlerClass.batcher.close()
+
+
+if __name__ == '__main__':
+    main()
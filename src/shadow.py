@@ -0,0 +1,128 @@
+# ABOUTME: Shadow scoring: a challenger model re-scores champion batches on a thread pool, off the response path.
+# ABOUTME: Provides ShadowScorer, which records disagreement and score deltas for the dashboard and service.
+
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from src.predict import RISK_LABELS, decision_threshold, predict_default_proba
+
+# The dashboard shadows the model at this path (artifact directory or pickle); unset means no challenger
+CHALLENGER_ENV = 'CREDIT_RISK_CHALLENGER'
+
+
+class ShadowScorer:
+    """
+    Scores every champion batch again with a challenger and keeps running comparisons.
+
+    submit() only hands the batch to the pool and returns. When `max_pending`
+    batches are already waiting the new one is dropped (and counted), so a slow
+    challenger can never back up the champion. Decisions use each model's own
+    decision threshold; deltas are challenger minus champion P(bad).
+    """
+
+    def __init__(self, challenger, name: str = None, max_workers: int = 1, max_pending: int = 64,
+                 samples: int = 10_000, audit=None):
+        self.challenger = challenger
+        self.name = name or getattr(challenger, 'version', None) or type(challenger).__name__
+        self.max_pending = max_pending
+        self.audit = audit
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='shadow')
+        self._lock = threading.Lock()
+        self._deltas = deque(maxlen=samples)
+        self._latencies = deque(maxlen=samples)
+        self._pending = 0
+        self.batches = 0
+        self.rows = 0
+        self.disagreements = 0
+        self.delta_sum = 0.0
+        self.dropped_batches = 0
+        self.errors = 0
+
+    def submit(self, X: pd.DataFrame, champion_proba, champion_prediction):
+        """Queue a champion-scored batch for the challenger; never blocks."""
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self.dropped_batches += 1
+                return
+            self._pending += 1
+        self._pool.submit(self._score, X, np.asarray(champion_proba), np.asarray(champion_prediction))
+
+    def _score(self, X: pd.DataFrame, champion_proba: np.ndarray, champion_prediction: np.ndarray):
+        try:
+            start = time.perf_counter()
+            challenger_proba = predict_default_proba(self.challenger, X)
+            elapsed = time.perf_counter() - start
+            challenger_prediction = challenger_proba > decision_threshold(self.challenger)
+            delta = challenger_proba - champion_proba
+            disagreements = int(np.count_nonzero(challenger_prediction != champion_prediction.astype(bool)))
+            with self._lock:
+                self.batches += 1
+                self.rows += len(delta)
+                self.disagreements += disagreements
+                self.delta_sum += float(delta.sum())
+                self._deltas.extend(delta.tolist())
+                self._latencies.append(elapsed)
+            if self.audit is not None:
+                codes = challenger_prediction.astype(np.int8)
+                scored = pd.DataFrame({
+                    'prediction': codes,
+                    'risk_label': pd.Categorical.from_codes(codes, categories=RISK_LABELS),
+                    'default_probability': np.round(challenger_proba * 100, 1),
+                })
+                self.audit.record_batch(X, scored, self.name, source='shadow')
+        except Exception as exc:
+            with self._lock:
+                self.errors += 1
+            print(f"Shadow scoring with {self.name} failed: {exc}")
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            deltas = np.array(self._deltas)
+            latencies = np.array(self._latencies) * 1000.0
+            rows = self.rows
+            stats = {
+                'challenger': self.name,
+                'batches': self.batches,
+                'rows': rows,
+                'pending_batches': self._pending,
+                'dropped_batches': self.dropped_batches,
+                'errors': self.errors,
+                'disagreement_rate': round(self.disagreements / rows, 4) if rows else 0.0,
+                'mean_delta': round(self.delta_sum / rows, 4) if rows else 0.0,
+            }
+        stats['mean_abs_delta'] = round(float(np.abs(deltas).mean()), 4) if len(deltas) else 0.0
+        stats['p95_abs_delta'] = round(float(np.percentile(np.abs(deltas), 95)), 4) if len(deltas) else 0.0
+        stats['latency_p50_ms'] = round(float(np.percentile(latencies, 50)), 3) if len(latencies) else 0.0
+        return stats
+
+    def drain(self):
+        """Block until every submitted batch has been scored."""
+        while True:
+            with self._lock:
+                if self._pending == 0:
+                    return
+            time.sleep(0.005)
+
+    def close(self):
+        self._pool.shutdown(wait=True)
+
+
+def challenger_path() -> str:
+    """The dashboard's challenger from $CREDIT_RISK_CHALLENGER, or None when shadowing is off."""
+    return os.environ.get(CHALLENGER_ENV) or None
+
+
+def load_shadow(path: str, audit=None, **kwargs) -> ShadowScorer:
+    """Load the challenger at `path` once and wrap it in a ShadowScorer named after the file."""
+    from src.audit import load_model
+
+    return ShadowScorer(load_model(path), name=os.path.basename(os.path.normpath(path)), audit=audit, **kwargs)
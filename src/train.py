@@ -1,13 +1,19 @@
-# ABOUTME: Trains the credit risk model using  GridSearchCV.
-# ABOUTME: Provides train_model() which returns the best fitted pipeline and its evaluation metrics.
+# ABOUTME: Trains the credit risk model with a pluggable hyperparameter search over cached CV folds.
+# ABOUTME: Provides train_model() which returns the best fitted pipeline and evaluate_model() for its metrics.
+
+import time
 
 import pandas as pd
 from imblearn.pipeline import Pipeline as ImbPipeline
 from xgboost import XGBClassifier
-from sklearn.metrics import accuracy_score, classification_report, roc_auc_score
-from sklearn.model_selection import GridSearchCV
+from sklearn.metrics import accuracy_score, classification_report, recall_score, roc_auc_score
 
+from src import instrument
+from src.calibration import CALIBRATION_METHODS, fit_calibrator, reliability
+from src.evaluation import bootstrap_ci, repeated_cv
+from src.predict import calibrate, decision_threshold
 from src.preprocess import build_preprocessor
+from src.search import SEARCH_STRATEGIES, build_fold_cache
 
 
 PARAM_GRID = {
@@ -19,36 +25,106 @@ PARAM_GRID = {
     'classifier__colsample_bytree': [0.8, 1.0]
 }
 
+CLASSIFIER_PARAMS = {
+    'n_estimators': 500,
+    'learning_rate': 0.1,
+    'max_depth': 6,
+    'random_state': 42,
+    'eval_metric': "logloss",
+}
+
 
-def train_model(X_train: pd.DataFrame, y_train: pd.Series, cv: int = 5):
-    """Fit a XGBoost pipeline via GridSearchCV. Returns the best estimator."""
-    pipeline = ImbPipeline(steps=[
+def build_pipeline(**classifier_params) -> ImbPipeline:
+    """Return the unfitted preprocessor + XGBoost pipeline."""
+    return ImbPipeline(steps=[
         ('preprocessor', build_preprocessor()),
-        ('classifier', XGBClassifier(
-            n_estimators=500,
-            learning_rate=0.1,
-            max_depth=6,
-            random_state=42,
-            eval_metric="logloss",
-        )),
+        ('classifier', XGBClassifier(**{**CLASSIFIER_PARAMS, **classifier_params})),
     ])
 
-    print("Running GridSearchCV (this may take a few minutes)...")
-    grid_search = GridSearchCV(pipeline, PARAM_GRID, cv=cv, scoring='recall', n_jobs=-1)
-    grid_search.fit(X_train, y_train)
 
-    print(f"Best params: {grid_search.best_params_}")
-    return grid_search.best_estimator_
+def train_model(X_train: pd.DataFrame, y_train: pd.Series, cv: int = 5, search: str = 'halving',
+                n_jobs: int = -1, folds: list = None, calibration: str = None):
+    """
+    Tune an XGBoost pipeline with the given search strategy and refit it on all of X_train.
+
+    `search` is a key of src.search.SEARCH_STRATEGIES ('halving' or 'grid').
+    The preprocessor is fitted once per CV fold and its output is shared by
+    every candidate, so candidates only pay for the XGBoost fit. Pass `folds`
+    (e.g. from src.cache.cached_folds) to skip building them.
+
+    The best candidate's out-of-fold P(bad) for X_train is kept on the returned
+    pipeline as `oof_proba_`, the held-out set src.decision picks thresholds from.
+    With `calibration` ('isotonic' or 'platt') the same out-of-fold predictions
+    fit a src.calibration.Calibrator, stored as the pipeline's `calibrator`.
+    """
+    if search not in SEARCH_STRATEGIES:
+        raise ValueError(f"Unknown search strategy {search!r}; choose from {sorted(SEARCH_STRATEGIES)}")
+    if calibration is not None and calibration not in CALIBRATION_METHODS:
+        raise ValueError(f"Unknown calibration {calibration!r}; choose from {CALIBRATION_METHODS}")
+
+    start = time.perf_counter()
+    if folds is None:
+        folds = build_fold_cache(X_train, y_train, cv=cv)
+    print(f"Running {search} search over {len(folds)} cached folds...")
+    with instrument.stage('search', strategy=search, folds=len(folds)) as s:
+        result = SEARCH_STRATEGIES[search](folds, PARAM_GRID, CLASSIFIER_PARAMS, n_jobs=n_jobs)
+        s.set(n_fits=result['n_fits'], best_params=result['best_params'], best_score=result['best_score'])
+
+    with instrument.stage('refit', rows=len(X_train)):
+        model = build_pipeline(**result['best_params'])
+        model.fit(X_train, y_train)
+    model.oof_proba_ = result['oof_proba']
+    if calibration is not None:
+        with instrument.stage('calibrate', method=calibration):
+            model.calibrator = fit_calibrator(y_train, model.oof_proba_, calibration)
+
+    best_params = {f'classifier__{name}': value for name, value in result['best_params'].items()}
+    print(f"Best params: {best_params}")
+    print(f"  CV recall {result['best_score']:.4f} · {result['n_fits'] + 1} fits "
+          f"· {time.perf_counter() - start:.1f}s wall-clock")
+    if calibration is not None:
+        print(f"  {calibration.title()} calibration fitted on {len(model.oof_proba_)} out-of-fold predictions "
+              f"({len(model.calibrator.x)} knots)")
+    return model
+
 
+def evaluate_model(model, X_test: pd.DataFrame, y_test: pd.Series, n_bootstrap: int = 0,
+                   cv_data: tuple = None, cv_repeats: int = 3, n_jobs: int = -1) -> dict:
+    """
+    Evaluate a fitted model at its decision threshold and return a dict of metrics.
 
-def evaluate_model(model, X_test: pd.DataFrame, y_test: pd.Series) -> dict:
-    """Evaluate a fitted model and return a dict of metrics."""
-    y_pred = model.predict(X_test)
-    y_prob = model.predict_proba(X_test)[:, 1]
+    Reliability of the served P(bad) is reported as brier, log_loss and ece,
+    with per-bin detail under 'reliability'; calibrated models also get
+    'reliability_uncalibrated' for the raw booster scores. With `n_bootstrap`,
+    the test predictions are resampled to add confidence intervals under
+    'bootstrap'. With `cv_data=(X_train, y_train)`, an unfitted copy of the
+    model is scored by repeated stratified 5-fold CV under 'cv', recalibrated
+    in each fold when the model is calibrated.
+    """
+    threshold = decision_threshold(model)
+    with instrument.stage('evaluate_model', rows=len(X_test)):
+        raw_prob = model.predict_proba(X_test)[:, 1]
+        y_prob = calibrate(model, raw_prob)
+        y_pred = (y_prob > threshold).astype(int)
+    calibration = reliability(y_test, y_prob)
 
     metrics = {
         'accuracy': accuracy_score(y_test, y_pred),
         'roc_auc': roc_auc_score(y_test, y_prob),
+        'recall': recall_score(y_test, y_pred),
+        'brier': calibration['brier'],
+        'log_loss': calibration['log_loss'],
+        'ece': calibration['ece'],
+        'reliability': calibration,
         'report': classification_report(y_test, y_pred),
     }
+    if getattr(model, 'calibrator', None) is not None:
+        metrics['reliability_uncalibrated'] = reliability(y_test, raw_prob)
+    if n_bootstrap:
+        with instrument.stage('bootstrap_ci', resamples=n_bootstrap):
+            metrics['bootstrap'] = bootstrap_ci(y_test, y_prob, n_resamples=n_bootstrap, threshold=threshold)
+    if cv_data is not None:
+        method = getattr(getattr(model, 'calibrator', None), 'method', None)
+        metrics['cv'] = repeated_cv(model, *cv_data, n_repeats=cv_repeats, n_jobs=n_jobs, threshold=threshold,
+                                    calibration=method)
     return metrics
@@ -0,0 +1,63 @@
+# ABOUTME: What-if sensitivity analysis: scores grids of perturbed copies of one applicant in a single call.
+# ABOUTME: Provides perturb() and what_if(), which returns per-feature curves and an optional 2-D surface.
+
+import numpy as np
+import pandas as pd
+
+from src.features import INPUT_FEATURES
+from src.predict import predict_default_proba
+
+
+def perturb(record: dict, grid: dict) -> pd.DataFrame:
+    """
+    Copies of `record` over the cartesian product of `grid` ({feature: values}).
+
+    Features not in `grid` keep the applicant's value on every row.
+    """
+    names = list(grid)
+    mesh = np.meshgrid(*(np.asarray(grid[name]) for name in names), indexing='ij')
+    n_rows = mesh[0].size if mesh else 1
+    columns = {}
+    for feature in INPUT_FEATURES:
+        if feature in grid:
+            columns[feature] = mesh[names.index(feature)].ravel()
+        else:
+            columns[feature] = np.full(n_rows, record[feature], dtype=object if isinstance(record[feature], str) else None)
+    return pd.DataFrame(columns)
+
+
+def what_if(model, record: dict, ranges: dict, surface: tuple = None) -> dict:
+    """
+    Default probability as each feature in `ranges` varies with the rest of the applicant held fixed.
+
+    All curves, plus the `surface=(x_feature, y_feature)` grid over the same
+    ranges when given, are scored in one predict_proba call.
+
+    Returns a dict with:
+        - curves: {feature: DataFrame(value, default_probability)}
+        - surface: DataFrame of probabilities indexed by y values with x values as columns, or None
+        - n_points: int
+    """
+    frames = [perturb(record, {feature: values}) for feature, values in ranges.items()]
+    if surface is not None:
+        x, y = surface
+        frames.append(perturb(record, {y: ranges[y], x: ranges[x]}))
+
+    grid = pd.concat(frames, ignore_index=True)
+    default_prob = predict_default_proba(model, grid) * 100
+
+    curves, offset = {}, 0
+    for feature, values in ranges.items():
+        n = len(values)
+        curves[feature] = pd.DataFrame({'value': np.asarray(values), 'default_probability': default_prob[offset:offset + n]})
+        offset += n
+
+    result_surface = None
+    if surface is not None:
+        x, y = surface
+        result_surface = pd.DataFrame(
+            default_prob[offset:].reshape(len(ranges[y]), len(ranges[x])),
+            index=pd.Index(np.asarray(ranges[y]), name=y),
+            columns=pd.Index(np.asarray(ranges[x]), name=x),
+        )
+    return {'curves': curves, 'surface': result_surface, 'n_points': len(grid)}
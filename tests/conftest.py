@@ -0,0 +1,59 @@
+# ABOUTME: Shared pytest fixtures: the shipped pipeline, its compiled form and the German credit applicants.
+# ABOUTME: Paths are resolved from the repository root, so the suite runs from any working directory.
+
+import json
+import os
+import subprocess
+import sys
+import warnings
+
+import joblib
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src.data import load_data  # noqa: E402
+from src.fastpath import compile_pipeline  # noqa: E402
+from src.features import INPUT_FEATURES  # noqa: E402
+
+DATA_PATH = os.path.join(ROOT, 'data', 'german_credit_data.csv')
+MODEL_PATH = os.path.join(ROOT, 'models', 'credit_risk_model_v2.pkl')
+ARTIFACT_PATH = os.path.join(ROOT, 'models', 'credit_risk_model_v2')
+
+
+@pytest.fixture(scope='session')
+def dataset():
+    return load_data(DATA_PATH)
+
+
+@pytest.fixture(scope='session')
+def applicants(dataset):
+    return dataset[INPUT_FEATURES]
+
+
+@pytest.fixture(scope='session')
+def pipeline():
+    with warnings.catch_warnings():
+        # The pickle was written by older sklearn/XGBoost releases
+        warnings.simplefilter('ignore')
+        return joblib.load(MODEL_PATH)
+
+
+@pytest.fixture(scope='session')
+def compiled(pipeline):
+    return compile_pipeline(pipeline)
+
+
+@pytest.fixture
+def applicant(applicants):
+    """One applicant as the plain dict the service and dashboard pass around."""
+    record = applicants.iloc[0].to_dict()
+    return {f: v.item() if hasattr(v, 'item') else v for f, v in record.items()}
+
+
+def imported_modules(module: str) -> set:
+    """Top-level packages loaded by importing `module` in a fresh interpreter."""
+    code = f'import json, sys, {module}; print(json.dumps(sorted(sys.modules)))'
+    out = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True).stdout
+    return {name.split('.')[0] for name in json.loads(out)}
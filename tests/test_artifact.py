@@ -0,0 +1,35 @@
+# ABOUTME: Tests for the native model artifact in src.artifact: save/load parity and manifest checks.
+# ABOUTME: Artifacts are written to tmp_path; the shipped artifact is only read.
+
+import json
+
+import numpy as np
+import pytest
+
+from src.artifact import MANIFEST_FILE, load_artifact, load_manifest, save_artifact
+from tests.conftest import ARTIFACT_PATH
+
+
+def test_artifact_round_trip(compiled, applicants, tmp_path):
+    directory = save_artifact(compiled, str(tmp_path / 'artifact'), version='test')
+    loaded = load_artifact(directory)
+    assert loaded.version == 'test'
+    assert loaded.score_table is None
+    np.testing.assert_allclose(loaded.predict_proba(applicants), compiled.predict_proba(applicants), atol=1e-6)
+
+
+def test_shipped_artifact_matches_the_pipeline(pipeline, applicants):
+    model = load_artifact(ARTIFACT_PATH)
+    np.testing.assert_allclose(model.predict_proba(applicants), pipeline.predict_proba(applicants), atol=1e-6)
+
+
+def test_manifest_checks_format_and_version(compiled, tmp_path):
+    directory = save_artifact(compiled, str(tmp_path / 'artifact'))
+    path = tmp_path / 'artifact' / MANIFEST_FILE
+    manifest = json.loads(path.read_text())
+    path.write_text(json.dumps({**manifest, 'format_version': manifest['format_version'] + 1}))
+    with pytest.raises(ValueError, match='newer'):
+        load_manifest(directory)
+    path.write_text(json.dumps({**manifest, 'format': 'something-else'}))
+    with pytest.raises(ValueError, match='not a'):
+        load_manifest(directory)
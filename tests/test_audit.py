@@ -0,0 +1,24 @@
+# ABOUTME: Tests for src.audit: writing decisions as Parquet segments, reading them back and replaying them.
+# ABOUTME: Segments are written to tmp_path.
+
+from src.audit import AuditLog, read_log, replay
+from src.predict import make_prediction, make_prediction_batch
+
+
+def test_audit_log_excludes_shadow_rows_by_default(compiled, applicants, applicant, tmp_path):
+    log = AuditLog(str(tmp_path), flush_interval=60.0)
+    rows = applicants.iloc[:20]
+    log.record(applicant, make_prediction(compiled, applicant), 'v1')
+    log.record_batch(rows, make_prediction_batch(compiled, rows)['predictions'], 'v1', source='service')
+    log.record_batch(rows, make_prediction_batch(compiled, rows)['predictions'], 'challenger', source='shadow')
+    log.close()
+
+    assert log.stats()['rows_written'] == 41
+    assert set(read_log(str(tmp_path))['source']) == {'dashboard', 'service'}
+    assert len(read_log(str(tmp_path), include_shadow=True)) == 41
+    assert len(read_log(str(tmp_path), source='shadow')) == 20
+
+    summary = replay(compiled, read_log(str(tmp_path)))['summary']
+    assert summary['n'] == 21
+    assert summary['flip_rate'] == 0.0
+    assert summary['max_abs_change'] <= 0.1
@@ -0,0 +1,52 @@
+# ABOUTME: Tests for src.data: schema dtypes, numeric range checks and unknown-category reporting.
+# ABOUTME: Parses small in-memory CSVs rather than touching the shipped dataset.
+
+import io
+
+import pandas as pd
+import pytest
+
+from src.data import CSV_OPTIONS, SCHEMA, clean_data
+
+CSV = """,Age,Sex,Job,Housing,Saving accounts,Checking account,Credit amount,Duration,Purpose,Risk
+0,67,male,2,own,,little,1169,6,radio/TV,good
+1,22,female,2,own,little,moderate,5951,48,radio/TV,bad
+2,49,male,1,own,little,,2096,12,education,good
+"""
+
+
+def _read(text: str) -> pd.DataFrame:
+    return clean_data(pd.read_csv(io.StringIO(text), **CSV_OPTIONS))
+
+
+def test_schema_dtypes_and_cleaning():
+    df = _read(CSV)
+    for column, dtype in SCHEMA.items():
+        assert df[column].dtype == dtype
+    assert df['Saving accounts'].iloc[0] == 'unknown'
+    assert df['Checking account'].iloc[2] == 'unknown'
+    assert df['Risk'].tolist() == [0, 1, 0]
+
+
+def test_missing_numbers_stay_missing():
+    df = _read(CSV.replace(',67,', ',,'))
+    assert pd.isna(df['Age'].iloc[0])
+    assert df['Age'].dtype == 'UInt8'
+
+
+@pytest.mark.parametrize('age', ['300', '-1', '12.5', 'abc'])
+def test_invalid_numbers_raise_naming_the_column(age):
+    with pytest.raises(ValueError, match='Age'):
+        _read(CSV.replace(',67,', f',{age},'))
+
+
+def test_unknown_categories_are_reported():
+    with pytest.warns(UserWarning, match='Purpose'):
+        df = _read(CSV.replace('education', 'spaceship'))
+    assert pd.isna(df['Purpose'].iloc[2])
+    assert df.attrs['unknown_categories'] == {'Purpose': {'spaceship': 1}}
+
+
+def test_unlabelled_rows_keep_a_missing_risk():
+    df = _read(CSV.replace(',bad\n', ',\n'))
+    assert df['Risk'].isna().tolist() == [False, True, False]
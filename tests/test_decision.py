@@ -0,0 +1,33 @@
+# ABOUTME: Tests for src.decision: the cost/recall curve and threshold choice.
+# ABOUTME: Uses small synthetic scores so every count is exact.
+
+import numpy as np
+import pytest
+
+from src.decision import choose_threshold, decision_curve
+
+
+@pytest.fixture
+def scores():
+    rng = np.random.default_rng(0)
+    y = rng.random(2000) < 0.3
+    proba = np.clip(0.3 + 0.4 * (y - 0.3) + rng.normal(0, 0.15, len(y)), 0, 1) ** 2
+    return y.astype(int), proba
+
+
+def test_decision_curve_counts():
+    curve = decision_curve([1, 1, 0, 0], [0.9, 0.4, 0.6, 0.1], cost_fn=5, cost_fp=1).set_index('threshold')
+    assert curve.loc[0.4, ['tp', 'fp', 'fn']].tolist() == [1, 1, 1]
+    assert curve.loc[0.4, 'cost'] == pytest.approx((5 * 1 + 1 * 1) / 4)
+    assert curve.loc[0.0, 'recall'] == 1.0
+
+
+def test_choose_threshold_by_cost_and_by_recall(scores):
+    y, proba = scores
+    cheap = choose_threshold(y, proba, cost_fn=5, cost_fp=1)
+    curve = decision_curve(y, proba, 5, 1)
+    assert cheap['cost'] == pytest.approx(curve['cost'].min())
+
+    strict = choose_threshold(y, proba, min_recall=0.9)
+    assert strict['recall'] >= 0.9
+    assert curve.loc[curve['threshold'] > strict['threshold'], 'recall'].max() < 0.9
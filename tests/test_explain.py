@@ -0,0 +1,36 @@
+# ABOUTME: Tests for src.explain: TreeSHAP attributions summed back to the nine input features.
+# ABOUTME: Checked against the booster's own margin output.
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.explain import BIAS, explain, explain_one
+from src.features import INPUT_FEATURES
+from tests.conftest import imported_modules
+
+
+def test_attributions_add_up_to_the_margin(compiled, pipeline, applicants):
+    rows = applicants.iloc[:50]
+    attributions = explain(pipeline, rows)
+    assert list(attributions.columns) == INPUT_FEATURES + [BIAS]
+    margin = compiled.booster.inplace_predict(compiled.transform(rows), iteration_range=compiled.iteration_range,
+                                              predict_type='margin')
+    np.testing.assert_allclose(attributions.sum(axis=1), margin, atol=1e-4)
+
+
+def test_explain_one_sorts_by_contribution(compiled, applicant):
+    drivers = explain_one(compiled, applicant, top=5)
+    assert len(drivers) == 5
+    sizes = [abs(d['contribution']) for d in drivers]
+    assert sizes == sorted(sizes, reverse=True)
+    assert all(d['value'] == applicant[d['feature']] for d in drivers)
+
+
+def test_explain_rejects_other_models():
+    with pytest.raises(TypeError):
+        explain(object(), pd.DataFrame())
+
+
+def test_importing_explain_defers_xgboost_and_sklearn():
+    assert not {'xgboost', 'sklearn'} & imported_modules('src.explain')
@@ -0,0 +1,44 @@
+# ABOUTME: Parity tests for src.fastpath.CompiledModel against the full sklearn pipeline it was compiled from.
+# ABOUTME: Covers DataFrames, lists of dicts, single dicts and unseen or missing categories.
+
+import numpy as np
+import pandas as pd
+
+from src.predict import make_prediction
+
+TOLERANCE = 1e-6
+
+
+def test_dataframe_matches_pipeline(pipeline, compiled, applicants):
+    expected = pipeline.predict_proba(applicants)[:, 1]
+    assert np.abs(compiled.predict_proba(applicants)[:, 1] - expected).max() < TOLERANCE
+
+
+def test_list_of_dicts_matches_pipeline(pipeline, compiled, applicants):
+    expected = pipeline.predict_proba(applicants)[:, 1]
+    records = applicants.to_dict('records')
+    assert np.abs(compiled.predict_proba(records)[:, 1] - expected).max() < TOLERANCE
+
+
+def test_single_dict_matches_pipeline(pipeline, compiled, applicants):
+    rows = applicants.iloc[:50]
+    expected = pipeline.predict_proba(rows)[:, 1]
+    for record, p in zip(rows.to_dict('records'), expected):
+        assert abs(compiled.predict_proba(record)[0, 1] - p) < TOLERANCE
+
+
+def test_unseen_and_missing_categories_match_pipeline(pipeline, compiled, applicant):
+    records = [
+        {**applicant, 'Purpose': 'spaceship'},
+        {**applicant, 'Housing': 'castle', 'Job': 7},
+        {**applicant, 'Saving accounts': None},
+    ]
+    expected = pipeline.predict_proba(pd.DataFrame(records))[:, 1]
+    assert np.abs(compiled.predict_proba(records)[:, 1] - expected).max() < TOLERANCE
+    for record, p in zip(records, expected):
+        assert abs(compiled.predict_proba(record)[0, 1] - p) < TOLERANCE
+
+
+def test_make_prediction_agrees(pipeline, compiled, applicants, applicant):
+    assert make_prediction(compiled, applicant) == make_prediction(pipeline, applicants.iloc[[0]])
+
@@ -0,0 +1,56 @@
+# ABOUTME: Tests for src.incremental: drift checks and warm-start updates of the shipped pipeline.
+# ABOUTME: Deltas are slices of the shipped dataset.
+
+from src.calibration import fit_calibrator
+from src.decision import choose_threshold
+from src.incremental import check_drift, incremental_update
+from src.monitor import build_profile
+from src.predict import predict_default_proba
+
+
+def test_training_rows_do_not_drift(pipeline, dataset):
+    drift = check_drift(pipeline, dataset.drop('Risk', axis=1))
+    assert drift['reasons'] == []
+
+
+def test_shifted_delta_asks_for_a_full_retrain(pipeline, dataset):
+    delta = dataset.iloc[:200]
+    X = delta.drop('Risk', axis=1).assign(Duration=lambda d: d['Duration'] * 3)
+    result = incremental_update(pipeline, X, delta['Risk'])
+    assert result['action'] == 'full_retrain'
+    assert result['model'] is pipeline
+    assert any('Duration' in reason for reason in result['drift']['reasons'])
+
+
+def test_update_refits_state_fitted_to_the_old_scores(pipeline, dataset):
+    delta, reference = dataset.iloc[:300], dataset.iloc[800:]
+    X, y = delta.drop('Risk', axis=1), delta['Risk']
+    X_ref, y_ref = reference.drop('Risk', axis=1), reference['Risk']
+    pipeline.calibrator = fit_calibrator(y, pipeline.predict_proba(X)[:, 1], 'platt')
+    pipeline.decision_threshold = 0.3
+    pipeline.profile = build_profile(X, pipeline.predict_proba(X)[:, 1])
+    pipeline.training_settings = {'calibration': 'platt', 'cost': [5.0, 1.0], 'min_recall': None, 'score_table': False}
+    try:
+        result = incremental_update(pipeline, X, y, n_rounds=5, X_ref=X_ref, y_ref=y_ref)
+    finally:
+        del pipeline.calibrator, pipeline.decision_threshold, pipeline.profile, pipeline.training_settings
+    updated = result['model']
+    assert result['action'] == 'updated'
+    assert len(result['X_holdout']) == 60
+    assert updated is not pipeline
+    assert updated.calibrator.method == 'platt'
+    expected = choose_threshold(y_ref, predict_default_proba(updated, X_ref), 5.0, 1.0)['threshold']
+    assert updated.decision_threshold == expected
+    assert updated.profile['n_rows'] == len(X_ref) + len(X)
+    assert any('200 rows' in change for change in result['refitted'])
+
+
+def test_update_keeps_a_hand_set_threshold(pipeline, dataset):
+    delta = dataset.iloc[:300]
+    pipeline.decision_threshold = 0.3
+    try:
+        result = incremental_update(pipeline, delta.drop('Risk', axis=1), delta['Risk'], n_rounds=5)
+    finally:
+        del pipeline.decision_threshold
+    assert result['model'].decision_threshold == 0.3
+    assert result['refitted'] == []
@@ -0,0 +1,38 @@
+# ABOUTME: Tests for src.instrument: switching the JSON-lines sink on and off and the stage events it writes.
+# ABOUTME: Every test leaves instrumentation disabled again.
+
+import json
+
+import pytest
+
+from src import instrument
+
+
+@pytest.fixture(autouse=True)
+def off():
+    yield
+    instrument.disable()
+
+
+@pytest.mark.parametrize('value', ['', '0', 'false', 'OFF', ' no '])
+def test_off_values_disable(value):
+    instrument.enable(value)
+    assert not instrument.enabled()
+    assert instrument.stage('noop') is instrument._NULL_STAGE
+
+
+def test_stage_events_are_written(tmp_path):
+    path = tmp_path / 'events.jsonl'
+    instrument.enable(str(path))
+    with instrument.stage('load', path='x.csv') as s:
+        s.set(rows=3)
+    with pytest.raises(RuntimeError):
+        with instrument.stage('fail'):
+            raise RuntimeError
+    instrument.emit('done', n=1)
+    instrument.disable()
+
+    events = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [e.get('name', e['event']) for e in events] == ['load', 'fail', 'done']
+    assert events[0]['rows'] == 3 and events[0]['ok'] is True and events[0]['seconds'] >= 0
+    assert events[1]['ok'] is False
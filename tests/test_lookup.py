@@ -0,0 +1,128 @@
+# ABOUTME: Tests for the src.lookup score table on small grids built from the shipped model.
+# ABOUTME: Checks step lookups against the booster, probed cell trust, misses, persistence and the accuracy gate.
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.fastpath import _as_columns
+from src.features import CATEGORICAL_FEATURES
+from src.lookup import (
+    GRID_CELLS, QUANT_SCALE, ScoreTable, accuracy_violations, build_score_table, grid_from_model, table_accuracy,
+)
+from src.predict import calibrate, predict_default_proba
+from src.whatif import perturb
+
+QUANT_ERROR = 0.5 / QUANT_SCALE + 1e-6
+
+
+@pytest.fixture(scope='module')
+def small(compiled, applicants):
+    # Only the probed categorical values, so the default numeric grid builds in a moment
+    _, edges, combos = grid_from_model(compiled, applicants, n_combos=4)
+    categories = [sorted({c[f] for c in combos}) for f in CATEGORICAL_FEATURES]
+    return build_score_table(compiled, categories, edges, combos), combos
+
+
+def _raw(compiled, X) -> np.ndarray:
+    return compiled.booster.inplace_predict(compiled.transform(X), iteration_range=compiled.iteration_range)
+
+
+def test_every_split_kept_makes_the_table_exact(compiled, applicant):
+    # One categorical combination, so the full split grid stays small
+    categories = [[applicant[f]] for f in CATEGORICAL_FEATURES]
+    _, edges, _ = grid_from_model(compiled, pd.DataFrame([applicant]), {f: 10_000 for f in GRID_CELLS})
+    table = build_score_table(compiled, categories, edges)
+    grid = perturb(applicant, {'Age': np.arange(19, 80, 3), 'Credit amount': np.arange(250, 19_000, 977),
+                               'Duration': np.arange(2, 72, 5)})
+    default_prob, hit = table.lookup(_as_columns(grid, table.categorical_features + table.numeric_features))
+    assert hit.all()
+    np.testing.assert_allclose(default_prob, _raw(compiled, grid), atol=QUANT_ERROR)
+
+
+def test_grid_edges_are_split_points_within_the_widget_bounds(small):
+    table, _ = small
+    for edges, cells in zip(table.edges, GRID_CELLS.values()):
+        assert np.all(np.diff(edges) > 0)
+        assert len(edges) - 1 <= cells
+    assert table.values.shape == (np.prod([len(c) for c in table.categories]),) + table.trusted.shape
+
+
+def test_trusted_cells_stay_within_max_error_for_probed_combinations(small, compiled, applicants):
+    table, combos = small
+    keys = {tuple(c[f] for f in CATEGORICAL_FEATURES) for c in combos}
+    rows = applicants[[tuple(r) in keys for r in applicants[CATEGORICAL_FEATURES].itertuples(index=False)]]
+    default_prob, hit = table.lookup(_as_columns(rows, table.categorical_features + table.numeric_features))
+    assert hit.any() and not hit.all()
+    exact = calibrate(compiled, _raw(compiled, rows))
+    assert np.abs(calibrate(compiled, default_prob) - exact)[hit].max() <= table.max_error + QUANT_ERROR
+
+
+def test_lookup_one_agrees_with_lookup(small, compiled, applicants):
+    table, _ = small
+    rows = applicants.iloc[:200]
+    threshold, calibrator = compiled.decision_threshold, compiled.calibrator
+    default_prob, hit = table.lookup(_as_columns(rows, table.categorical_features + table.numeric_features),
+                                     threshold, calibrator)
+    for record, p, h in zip(rows.to_dict('records'), default_prob, hit):
+        one = table.lookup_one(record, threshold, calibrator)
+        assert (one is not None) == h
+        if h:
+            assert one == pytest.approx(p)
+
+
+def test_unseen_missing_and_out_of_range_rows_miss(small, applicants):
+    table, _ = small
+    applicant = next(r for r in applicants.to_dict('records') if table.lookup_one(r) is not None)
+    for record in ({**applicant, 'Purpose': 'spaceship'}, {**applicant, 'Housing': None},
+                   {**applicant, 'Age': 95}, {**applicant, 'Credit amount': 50},
+                   {**applicant, 'Age': None}, {**applicant, 'Duration': float('nan')}):
+        assert table.lookup_one(record) is None
+        assert not table.lookup(_as_columns([record], table.categorical_features + table.numeric_features))[1][0]
+
+
+def test_close_calls_go_to_the_booster(small, applicants):
+    table, _ = small
+    columns = _as_columns(applicants, table.categorical_features + table.numeric_features)
+    default_prob, hit = table.lookup(columns)
+    _, decided = table.lookup(columns, threshold=0.5)
+    assert not decided[hit & (np.abs(default_prob - 0.5) < table.margin)].any()
+    assert decided.sum() <= hit.sum()
+
+
+def test_save_and_load(small, tmp_path):
+    table, _ = small
+    path = str(tmp_path / 'table.npz')
+    table.save(path)
+    loaded = ScoreTable.load(path)
+    np.testing.assert_array_equal(loaded.values, table.values)
+    np.testing.assert_array_equal(loaded.trusted, table.trusted)
+    assert (loaded.margin, loaded.max_error) == (table.margin, table.max_error)
+    assert loaded.categories == table.categories
+
+
+def test_compiled_model_serves_hits_from_the_table(small, compiled, applicants):
+    table, _ = small
+    exact = predict_default_proba(compiled, applicants)
+    compiled.score_table = table
+    try:
+        served = predict_default_proba(compiled, applicants)
+        single = predict_default_proba(compiled, applicants.iloc[0].to_dict())
+    finally:
+        compiled.score_table = None
+    accuracy = table_accuracy(table, compiled, applicants)
+    _, hit = table.lookup(_as_columns(applicants, table.categorical_features + table.numeric_features),
+                          compiled.decision_threshold, compiled.calibrator)
+    np.testing.assert_allclose(served[~hit], exact[~hit], atol=1e-6)
+    assert accuracy['hit_rate'] == pytest.approx(hit.mean(), abs=1e-4)
+    assert single.shape == (1,)
+
+
+def test_accuracy_gate():
+    passing = {'hits': 40, 'hit_rate': 0.2, 'p99_abs_error': 0.01, 'decision_agreement': 1.0}
+    assert accuracy_violations(passing) == []
+    reasons = accuracy_violations({**passing, 'p99_abs_error': 0.2, 'decision_agreement': 0.9})
+    assert len(reasons) == 2 and 'p99' in reasons[0]
+    sparse = accuracy_violations({**passing, 'hits': 1, 'hit_rate': 0.005, 'p99_abs_error': 0.0})
+    assert len(sparse) == 2 and 'hit rate' in sparse[0] and 'only 1' in sparse[1]
+    assert accuracy_violations({**passing, 'hits': 0, 'hit_rate': 0.0, 'p99_abs_error': None})
@@ -0,0 +1,49 @@
+# ABOUTME: Tests for src.monitor: PSI, streaming histograms and the per-version monitor lifecycle.
+# ABOUTME: The reference profile is built from the shipped dataset and the compiled model.
+
+import pytest
+
+from src.monitor import DriftMonitor, build_profile, monitor_for, psi
+from src.predict import predict_default_proba
+
+
+@pytest.fixture(scope='module')
+def profile(compiled, applicants):
+    return build_profile(applicants, predict_default_proba(compiled, applicants))
+
+
+def test_psi_is_zero_for_identical_histograms():
+    assert psi([10, 20, 30], [1, 2, 3]) == pytest.approx(0.0)
+    assert psi([10, 20, 30], [30, 20, 10]) > 0.25
+
+
+def test_observe_and_observe_batch_agree(profile, compiled, applicants):
+    rows = applicants.iloc[:150]
+    proba = predict_default_proba(compiled, rows)
+    one, batch = DriftMonitor(profile), DriftMonitor(profile)
+    for record, p in zip(rows.to_dict('records'), proba):
+        one.observe(record, p)
+    batch.observe_batch(rows, proba)
+    assert one.report() == batch.report()
+
+
+def test_training_traffic_is_stable_and_shifted_traffic_alerts(profile, compiled, applicants):
+    monitor = DriftMonitor(profile)
+    monitor.observe_batch(applicants, predict_default_proba(compiled, applicants))
+    assert monitor.report()['alerts'] == []
+
+    shifted = applicants.assign(Age=applicants['Age'] + 30)
+    monitor.reset()
+    monitor.observe_batch(shifted, predict_default_proba(compiled, shifted))
+    assert 'Age' in monitor.report()['alerts']
+
+
+def test_monitor_for_follows_the_model_version(compiled, profile):
+    compiled.profile, compiled.version = profile, 'v1'
+    try:
+        first = monitor_for(compiled)
+        assert monitor_for(compiled, first) is first
+        compiled.version = 'v2'
+        assert monitor_for(compiled, first) is not first
+    finally:
+        compiled.profile, compiled.version = None, None
@@ -0,0 +1,26 @@
+# ABOUTME: Tests for src.out_of_core's streamed train/test assignment.
+# ABOUTME: Labels are synthetic arrays, so no file is read.
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.out_of_core import StreamingSplit, split_rows
+
+
+def test_streaming_split_is_stratified_and_repeatable():
+    y = np.tile([0, 0, 0, 1, 1], 200).astype(np.float64)
+    split = StreamingSplit(test_size=0.2)
+    first = np.concatenate([split.test_mask(chunk) for chunk in np.array_split(y, 7)])
+    split.reset()
+    assert np.array_equal(split.test_mask(y), first)
+    assert first[y == 0].mean() == pytest.approx(0.2, abs=0.01)
+    assert first[y == 1].mean() == pytest.approx(0.2, abs=0.01)
+
+
+def test_split_rows_leaves_out_unlabelled_rows():
+    chunk = pd.DataFrame({'Risk': pd.array([0, 1, None, 0, None, 1] * 10, dtype='Int8')})
+    y, train, test = split_rows(chunk, StreamingSplit(test_size=0.25))
+    labelled = ~np.isnan(y)
+    assert not (train & test).any()
+    assert np.array_equal(train | test, labelled)
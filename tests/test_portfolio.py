@@ -0,0 +1,35 @@
+# ABOUTME: Tests for src.portfolio: parsing uploads, scoring them in one pass and the chart aggregates.
+# ABOUTME: Uploads are in-memory copies of the shipped dataset.
+
+import io
+
+import pytest
+
+from src.portfolio import approval_rates, read_portfolio, risk_histogram, score_portfolio
+from src.predict import make_prediction_batch
+from tests.conftest import DATA_PATH
+
+
+def test_read_portfolio_reports_unknown_categories(compiled, dataset):
+    with open(DATA_PATH) as f:
+        text = f.read().replace('radio/TV', 'hovercraft', 1)
+    with pytest.warns(UserWarning):
+        df = read_portfolio(io.StringIO(text), 'upload.csv')
+    result = score_portfolio(compiled, df)
+    assert result['unknown_categories'] == {'Purpose': {'hovercraft': 1}}
+    assert len(result['predictions']) == len(dataset)
+    assert result['drift'] is None
+
+
+def test_read_portfolio_needs_every_input():
+    with pytest.raises(ValueError, match='Purpose'):
+        read_portfolio(io.StringIO('Age,Sex\n30,male\n'), 'upload.csv')
+
+
+def test_portfolio_aggregates(compiled, applicants):
+    scored = make_prediction_batch(compiled, applicants)['predictions'].join(applicants)
+    histogram = risk_histogram(scored['default_probability'])
+    assert histogram['count'].sum() == len(scored)
+    rates = approval_rates(scored, 'Housing')
+    assert rates['applicants'].sum() == len(scored)
+    assert rates['approval_rate'].between(0, 100).all()
@@ -0,0 +1,40 @@
+# ABOUTME: Tests for src.predict batch scoring over DataFrames and streamed CSV/Parquet chunks.
+# ABOUTME: Parquet copies of the dataset are written to tmp_path.
+
+import pandas as pd
+
+from src.data import iter_data_chunks, load_data
+from src.predict import make_prediction, make_prediction_batch
+from src.rules import INDICATORS
+from tests.conftest import DATA_PATH
+
+
+def test_parquet_chunks_continue_the_index(dataset, tmp_path):
+    path = str(tmp_path / 'applicants.parquet')
+    dataset.iloc[:250].to_parquet(path, index=False)
+    chunks = list(iter_data_chunks(path, chunksize=100))
+    assert [len(c) for c in chunks] == [100, 100, 50]
+    assert pd.concat(chunks).index.tolist() == list(range(250))
+    pd.testing.assert_frame_equal(load_data(path), dataset.iloc[:250], check_dtype=False)
+
+
+def test_chunked_scoring_matches_one_frame(compiled, applicants):
+    whole = make_prediction_batch(compiled, applicants)
+    chunked = make_prediction_batch(compiled, (c.drop('Risk', axis=1) for c in iter_data_chunks(DATA_PATH, 300)))
+    assert whole['n_rows'] == chunked['n_rows'] == len(applicants)
+    pd.testing.assert_frame_equal(chunked['predictions'], whole['predictions'])
+
+
+def test_batch_rows_match_make_prediction(compiled, applicants):
+    rows = applicants.iloc[:20]
+    scored = make_prediction_batch(compiled, rows, indicators=INDICATORS)['predictions']
+    assert [f'{i.name}_ok' in scored.columns for i in INDICATORS] == [True] * len(INDICATORS)
+    for i, record in enumerate(rows.to_dict('records')):
+        single = make_prediction(compiled, record)
+        assert scored['prediction'].iloc[i] == single['prediction']
+        assert scored['default_probability'].iloc[i] == single['default_probability']
+
+
+def test_empty_input_scores_nothing(compiled, applicants):
+    assert make_prediction_batch(compiled, iter([]))['n_rows'] == 0
+    assert make_prediction_batch(compiled, applicants.iloc[:0])['n_rows'] == 0
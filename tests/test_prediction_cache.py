@@ -0,0 +1,67 @@
+# ABOUTME: Tests for src.prediction_cache: key normalization, LRU eviction, TTL expiry and version invalidation.
+# ABOUTME: Uses a fake clock so expiry is checked without sleeping.
+
+from src.prediction_cache import PredictionCache, feature_key, model_version
+from tests.conftest import imported_modules
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_equivalent_records_share_a_key(applicant, applicants):
+    variant = {**applicant, 'Age': float(applicant['Age']), 'Purpose': f" {applicant['Purpose']} "}
+    assert feature_key(variant, 'v1') == feature_key(applicant, 'v1')
+    assert feature_key(applicants.iloc[[0]], 'v1') == feature_key(applicant, 'v1')
+    assert feature_key(applicant, 'v2') != feature_key(applicant, 'v1')
+
+
+def test_model_version_includes_the_threshold(compiled):
+    assert model_version(compiled).endswith(f'@{compiled.decision_threshold}')
+
+
+def test_hits_misses_and_expiry(applicant):
+    clock = FakeClock()
+    cache = PredictionCache(ttl=10.0, clock=clock)
+    assert cache.get(applicant, 'v1') is None
+    cache.put(applicant, 'v1', {'prediction': 1})
+    assert cache.get(applicant, 'v1') == {'prediction': 1}
+    clock.now = 11.0
+    assert cache.get(applicant, 'v1') is None
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['expirations']) == (1, 2, 1)
+
+
+def test_least_recently_used_entry_is_evicted(applicant):
+    cache = PredictionCache(max_entries=2)
+    records = [{**applicant, 'Age': age} for age in (20, 30, 40)]
+    cache.put(records[0], 'v1', {'prediction': 0})
+    cache.put(records[1], 'v1', {'prediction': 1})
+    cache.get(records[0], 'v1')
+    cache.put(records[2], 'v1', {'prediction': 0})
+    assert cache.get(records[1], 'v1') is None
+    assert cache.get(records[0], 'v1') is not None
+    assert cache.stats()['evictions'] == 1
+
+
+def test_new_model_version_clears_the_cache(applicant):
+    cache = PredictionCache()
+    cache.put(applicant, 'v1', {'prediction': 0})
+    assert cache.get(applicant, 'v2') is None
+    assert cache.get(applicant, 'v1') is None
+    assert cache.stats()['invalidations'] == 1
+
+
+def test_predict_scores_once(compiled, applicant):
+    cache = PredictionCache()
+    first = cache.predict(compiled, applicant)
+    assert cache.predict(compiled, applicant) == first
+    assert cache.stats()['hits'] == 1
+
+
+def test_importing_the_cache_does_not_load_sklearn():
+    assert 'sklearn' not in imported_modules('src.prediction_cache')
@@ -0,0 +1,57 @@
+# ABOUTME: Tests for src.registry: registering and promoting versions and the hot-swapping ModelHandle.
+# ABOUTME: Registries live in tmp_path.
+
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from src.predict import make_prediction, make_prediction_batch
+from src.registry import ModelHandle, current_version, list_versions, promote, register
+
+
+def test_registry_promotes_and_hands_over_versions(compiled, applicants, tmp_path):
+    registry = str(tmp_path / 'registry')
+    register(compiled, {'roc_auc': 0.8, 'note': 'ignored'}, registry, version='v1')
+    assert current_version(registry) is None
+    promote('v1', registry)
+    handle = ModelHandle(registry, poll_interval=60.0)
+    try:
+        assert handle.version == 'v1'
+        register(compiled, registry_dir=registry, version='v2')
+        promote('v2', registry)
+        assert handle.refresh() is True
+        assert handle.version == 'v2'
+        np.testing.assert_allclose(handle.predict_proba(applicants), compiled.predict_proba(applicants), atol=1e-6)
+    finally:
+        handle.close()
+    assert [m['model_version'] for m in list_versions(registry)] == ['v1', 'v2']
+    assert list_versions(registry)[0]['metadata']['metrics'] == {'roc_auc': 0.8}
+    with pytest.raises(FileExistsError):
+        register(compiled, registry_dir=registry, version='v1')
+
+
+def test_default_versions_are_unique_and_ordered(compiled, tmp_path):
+    registry = str(tmp_path / 'registry')
+    versions = [register(compiled, registry_dir=registry) for _ in range(3)]
+    assert len(set(versions)) == 3
+    assert [m['model_version'] for m in list_versions(registry)] == versions
+
+
+class _SwappingHandle:
+    """Promotes `next_model` right after the first read of `model`."""
+
+    def __init__(self, first, next_model):
+        self._models = [first, next_model]
+
+    @property
+    def model(self):
+        return self._models.pop(0) if len(self._models) > 1 else self._models[0]
+
+
+def test_scoring_uses_one_model_snapshot(compiled, applicants, applicant):
+    never_bad = SimpleNamespace(decision_threshold=1.0, calibrator=None, predict_proba=compiled.predict_proba)
+    expected = make_prediction(compiled, applicant)
+    assert make_prediction(_SwappingHandle(compiled, never_bad), applicant) == expected
+    batch = make_prediction_batch(_SwappingHandle(compiled, never_bad), applicants)['predictions']
+    assert batch['prediction'].tolist() == make_prediction_batch(compiled, applicants)['predictions']['prediction'].tolist()
@@ -0,0 +1,52 @@
+# ABOUTME: Tests for the vectorized risk indicators in src.rules.
+# ABOUTME: Checks bucket edges, category matching, config construction and the dashboard's row view.
+
+import pandas as pd
+import pytest
+
+from src.rules import INDICATORS, RangeIndicator, build_indicator, evaluate_indicators, indicator_rows
+
+
+def test_range_indicator_edges_are_right_inclusive():
+    indicator = RangeIndicator('duration', 'Loan Duration', 'Duration', edges=[12, 24],
+                               descs=['short', 'medium', 'long'], goods=[True, True, False])
+    ok, desc = indicator.evaluate(pd.DataFrame({'Duration': [6, 12, 13, 24, 25]}))
+    assert ok.tolist() == [True, True, True, True, False]
+    assert list(desc) == ['short', 'short', 'medium', 'medium', 'long']
+
+
+def test_missing_values_get_their_own_outcome():
+    indicator = INDICATORS[2]
+    for column in ([6, None, 48], [6.0, float('nan'), 48.0]):
+        ok, desc = indicator.evaluate(pd.DataFrame({'Duration': column}))
+        assert ok.tolist() == [True, False, False]
+        assert list(desc) == ['Short-term loan', 'Not provided', 'Long-term exposure']
+    assert indicator.display(None) == 'Not provided'
+
+
+def test_range_indicator_needs_one_more_desc_than_edges():
+    with pytest.raises(ValueError):
+        RangeIndicator('x', 'X', 'Age', edges=[30], descs=['young'], goods=[True])
+
+
+def test_build_indicator_from_config():
+    indicator = build_indicator({'type': 'category', 'name': 'own', 'label': 'Housing', 'column': 'Housing',
+                                 'good_values': ['own'], 'good_desc': 'Owner', 'bad_desc': 'Not owner'})
+    ok, desc = indicator.evaluate(pd.DataFrame({'Housing': ['own', 'rent']}))
+    assert ok.tolist() == [True, False]
+    assert list(desc) == ['Owner', 'Not owner']
+    with pytest.raises(ValueError):
+        build_indicator({'type': 'nope'})
+
+
+def test_evaluate_indicators_keeps_the_index(applicants):
+    rows = applicants.iloc[10:20]
+    flags = evaluate_indicators(rows)
+    assert flags.index.equals(rows.index)
+    assert list(flags.columns) == [f'{i.name}_{part}' for i in INDICATORS for part in ('ok', 'desc')]
+
+
+def test_indicator_rows_for_the_dashboard(applicants):
+    rows = indicator_rows(applicants, row=0)
+    assert [r['label'] for r in rows] == [i.label for i in INDICATORS]
+    assert all(isinstance(r['good'], bool) for r in rows)
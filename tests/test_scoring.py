@@ -0,0 +1,42 @@
+# ABOUTME: Tests for src.scoring: chunk planning and resumable multi-process file scoring.
+# ABOUTME: Output files are written to tmp_path and scored with the shipped artifact on one worker.
+
+import numpy as np
+import pandas as pd
+
+from src.predict import make_prediction_batch
+from src.scoring import plan_chunks, read_chunk, score_file
+from tests.conftest import ARTIFACT_PATH, DATA_PATH
+
+
+def test_plan_chunks_cover_every_row(tmp_path, dataset):
+    plan = plan_chunks(DATA_PATH, chunksize=300)
+    assert len(plan['chunks']) == 4
+    chunks = [read_chunk(DATA_PATH, plan, chunk) for chunk in plan['chunks']]
+    assert [len(c) for c in chunks] == [300, 300, 300, 100]
+    combined = pd.concat(chunks, ignore_index=True)
+    pd.testing.assert_frame_equal(combined, dataset, check_dtype=False)
+
+
+def test_parquet_row_groups_are_sliced_to_the_chunksize(tmp_path, dataset):
+    path = str(tmp_path / 'applicants.parquet')
+    dataset.to_parquet(path, index=False, row_group_size=400)
+    plan = plan_chunks(path, chunksize=150)
+    assert [c['rows'] for c in plan['chunks']] == [133, 134, 133, 133, 134, 133, 100, 100]
+    combined = pd.concat([read_chunk(path, plan, chunk) for chunk in plan['chunks']], ignore_index=True)
+    pd.testing.assert_frame_equal(combined, dataset, check_dtype=False)
+
+
+def test_score_file_matches_batch_scoring_and_resumes(tmp_path, compiled, applicants):
+    output = str(tmp_path / 'scores.csv')
+    first = score_file(DATA_PATH, output, ARTIFACT_PATH, chunksize=400, workers=1, keep_parts=True, progress=False)
+    assert (first['rows'], first['chunks'], first['resumed_chunks']) == (1000, 3, 0)
+
+    scores = pd.read_csv(output)
+    expected = make_prediction_batch(compiled, applicants)['predictions']
+    np.testing.assert_allclose(scores['default_probability'], expected['default_probability'], atol=0.05)
+    assert scores['Age'].tolist() == applicants['Age'].tolist()
+
+    again = score_file(DATA_PATH, output, ARTIFACT_PATH, chunksize=400, workers=1, progress=False)
+    assert (again['rows'], again['resumed_chunks']) == (0, 3)
+    pd.testing.assert_frame_equal(pd.read_csv(output), scores)
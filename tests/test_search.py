@@ -0,0 +1,35 @@
+# ABOUTME: Tests for src.search: cached folds and the fit budget of successive halving against the plain grid.
+# ABOUTME: Uses the shipped dataset with tiny boosters so every search runs in a few seconds.
+
+import numpy as np
+import pytest
+from sklearn.model_selection import train_test_split
+
+from src.search import build_fold_cache, expand_grid, grid_search, halving_search
+from src.train import CLASSIFIER_PARAMS, PARAM_GRID
+
+SMALL_TREES = {**PARAM_GRID, 'classifier__n_estimators': [5, 10]}
+
+
+@pytest.fixture(scope='module')
+def folds(dataset):
+    X, y = dataset.drop('Risk', axis=1), dataset['Risk']
+    X_train, _, y_train, _ = train_test_split(X, y, test_size=0.2, random_state=42, stratify=y)
+    return build_fold_cache(X_train, y_train)
+
+
+def test_halving_fits_fewer_models_than_the_grid(folds):
+    result = halving_search(folds, SMALL_TREES, CLASSIFIER_PARAMS, n_jobs=1)
+    grid_fits = len(expand_grid(SMALL_TREES)) * len(folds)
+    assert result['n_fits'] < grid_fits
+    assert result['best_params'] in expand_grid(SMALL_TREES)
+    assert len(result['oof_proba']) == sum(len(f['y_val']) for f in folds)
+    assert np.isfinite(result['oof_proba']).all()
+
+
+def test_tiny_grid_falls_back_to_the_plain_grid(folds):
+    grid = {'classifier__n_estimators': [5], 'classifier__max_depth': [2, 3]}
+    halving = halving_search(folds, grid, CLASSIFIER_PARAMS, n_jobs=1)
+    plain = grid_search(folds, grid, CLASSIFIER_PARAMS, n_jobs=1)
+    assert halving['n_fits'] == plain['n_fits'] == 2 * len(folds)
+    assert halving['best_params'] == plain['best_params']
@@ -0,0 +1,78 @@
+# ABOUTME: Tests for src.serve: request validation and the MicroBatcher's per-request results and failures.
+# ABOUTME: The batcher runs in-process against the compiled model; no HTTP server is started.
+
+import pytest
+
+from src.predict import make_prediction
+from src.prediction_cache import PredictionCache
+from src.serve import MicroBatcher, validate_record
+
+
+def test_validate_record_coerces_numbers(applicant):
+    clean = validate_record({**applicant, 'Age': '35', 'Job': 2.0, 'Credit amount': 1200})
+    assert clean['Age'] == 35.0
+    assert clean['Job'] == 2 and isinstance(clean['Job'], int)
+    assert clean['Credit amount'] == 1200.0
+
+
+def test_validate_record_allows_nulls(applicant):
+    assert validate_record({**applicant, 'Saving accounts': None})['Saving accounts'] is None
+
+
+@pytest.mark.parametrize('body', [None, 42, 'Age', [1, 2]])
+def test_validate_record_rejects_non_objects(body):
+    with pytest.raises(ValueError, match='JSON object'):
+        validate_record(body)
+
+
+def test_validate_record_reports_every_problem(applicant):
+    record = {**applicant, 'Age': 'old', 'Job': 1.5, 'Housing': 3, 'Duration': True}
+    with pytest.raises(ValueError) as info:
+        validate_record(record)
+    message = str(info.value)
+    for feature in ('Age', 'Job', 'Housing', 'Duration'):
+        assert feature in message
+
+
+def test_validate_record_lists_missing_features(applicant):
+    record = dict(applicant)
+    del record['Purpose']
+    with pytest.raises(ValueError, match='Purpose'):
+        validate_record(record)
+
+
+def test_micro_batcher_matches_make_prediction(compiled, applicants):
+    records = applicants.iloc[:5].to_dict('records')
+    batcher = MicroBatcher(compiled, window_ms=1.0)
+    try:
+        for record in records:
+            expected = make_prediction(compiled, record)
+            assert batcher.submit(validate_record(record)) == expected
+    finally:
+        batcher.close()
+    assert batcher.stats()['requests'] == len(records)
+
+
+def test_bad_record_fails_only_its_own_request(compiled, applicant):
+    from concurrent.futures import ThreadPoolExecutor
+
+    batcher = MicroBatcher(compiled, window_ms=50.0)
+    try:
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            good = pool.submit(batcher.submit, applicant)
+            bad = pool.submit(batcher.submit, {**applicant, 'Age': 'not a number'})
+            assert good.result()['risk_label'] == make_prediction(compiled, applicant)['risk_label']
+            with pytest.raises(Exception):
+                bad.result()
+    finally:
+        batcher.close()
+
+
+def test_micro_batcher_answers_repeats_from_the_cache(compiled, applicant):
+    batcher = MicroBatcher(compiled, window_ms=1.0, cache=PredictionCache())
+    try:
+        first = batcher.submit(applicant)
+        assert batcher.submit(applicant) == first
+    finally:
+        batcher.close()
+    assert batcher.stats()['cache']['hits'] == 1
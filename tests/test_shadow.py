@@ -0,0 +1,51 @@
+# ABOUTME: Tests for src.shadow: challenger comparisons, back-pressure and audited shadow rows.
+# ABOUTME: The champion doubles as the challenger, so every delta is known.
+
+import numpy as np
+import pandas as pd
+
+from src.audit import AuditLog, read_log
+from src.predict import predict_default_proba
+from src.shadow import CHALLENGER_ENV, ShadowScorer, challenger_path, load_shadow
+from tests.conftest import ARTIFACT_PATH
+
+
+def test_shadow_scorer_compares_with_the_champion(compiled, applicants):
+    rows = applicants.iloc[:100]
+    proba = predict_default_proba(compiled, rows)
+    shadow = ShadowScorer(compiled, name='same')
+    shadow.submit(rows, proba, proba > compiled.decision_threshold)
+    shadow.drain()
+    shadow.close()
+    stats = shadow.stats()
+    assert (stats['rows'], stats['disagreement_rate'], stats['mean_abs_delta']) == (100, 0.0, 0.0)
+
+
+def test_shadow_scorer_drops_batches_instead_of_blocking(compiled, applicants):
+    shadow = ShadowScorer(compiled, max_pending=0)
+    shadow.submit(applicants.iloc[:5], np.zeros(5), np.zeros(5))
+    shadow.close()
+    assert shadow.stats()['dropped_batches'] == 1
+
+
+def test_challenger_comes_from_the_environment(monkeypatch):
+    monkeypatch.delenv(CHALLENGER_ENV, raising=False)
+    assert challenger_path() is None
+    monkeypatch.setenv(CHALLENGER_ENV, ARTIFACT_PATH)
+    assert challenger_path() == ARTIFACT_PATH
+    shadow = load_shadow(challenger_path())
+    assert shadow.name == 'credit_risk_model_v2'
+    shadow.close()
+
+
+def test_shadow_rows_are_audited_as_shadow(compiled, applicants, tmp_path):
+    log = AuditLog(str(tmp_path), flush_interval=60.0)
+    shadow = ShadowScorer(compiled, name='challenger', audit=log)
+    rows = applicants.iloc[:10]
+    proba = predict_default_proba(compiled, rows)
+    shadow.submit(rows, proba, proba > compiled.decision_threshold)
+    shadow.drain()
+    log.close()
+    logged = read_log(str(tmp_path), source='shadow')
+    assert logged['model_version'].unique().tolist() == ['challenger']
+    assert pd.api.types.is_float_dtype(logged['default_probability'])
@@ -0,0 +1,29 @@
+# ABOUTME: Tests for src.whatif: perturbed applicant grids and the batched sensitivity curves.
+# ABOUTME: Curves are checked against scoring the same rows directly.
+
+import numpy as np
+import pytest
+
+from src.predict import predict_default_proba
+from src.whatif import perturb, what_if
+
+
+def test_perturb_holds_other_features(applicant):
+    grid = perturb(applicant, {'Age': [20, 30], 'Duration': [6, 12, 24]})
+    assert len(grid) == 6
+    assert grid['Purpose'].eq(applicant['Purpose']).all()
+    assert sorted(set(zip(grid['Age'], grid['Duration']))) == [(a, d) for a in (20, 30) for d in (6, 12, 24)]
+
+
+def test_what_if_curves_and_surface_match_direct_scores(compiled, applicant):
+    ranges = {'Credit amount': np.arange(500, 10_000, 1500), 'Duration': np.arange(6, 60, 12)}
+    result = what_if(compiled, applicant, ranges, surface=('Credit amount', 'Duration'))
+    assert result['n_points'] == 7 + 5 + 7 * 5
+
+    direct = predict_default_proba(compiled, perturb(applicant, {'Duration': ranges['Duration']})) * 100
+    np.testing.assert_allclose(result['curves']['Duration']['default_probability'], direct, rtol=1e-6)
+
+    surface = result['surface']
+    assert surface.shape == (5, 7)
+    corner = predict_default_proba(compiled, {**applicant, 'Credit amount': 500, 'Duration': 54})[0] * 100
+    assert surface.loc[54, 500] == pytest.approx(corner, rel=1e-6)